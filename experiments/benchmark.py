@@ -6,7 +6,9 @@ import statistics as stats
 import time
 
 from neurocourier.tsp.instances import generate_uniform_points
+from neurocourier.tsp.cache import DistanceCache
 from neurocourier.tsp.distance import euclidean_distance_matrix
+from neurocourier.evaluation import gap, held_karp_bound
 from neurocourier.solvers import (
     SAParams,
     simulated_annealing_tsp,
@@ -31,7 +33,10 @@ def main():
     ap.add_argument("--sa_seconds", type=float, default=0.3, help="SA time budget per run (seconds)")
     ap.add_argument("--aco_iters", type=int, default=60, help="ACO iterations per run")
     ap.add_argument("--out", default="results/benchmark.csv", help="CSV output path")
+    ap.add_argument("--cache", default=None, help="Distance-matrix cache directory (memory-mapped .npy files)")
+    ap.add_argument("--gap", action="store_true", help="Report the gap to the Held-Karp lower bound (percent)")
     args = ap.parse_args()
+    cache = DistanceCache(args.cache) if args.cache else None
 
     sizes = [int(x.strip()) for x in args.sizes.split(",") if x.strip()]
 
@@ -42,11 +47,12 @@ def main():
     for n in sizes:
         sa_costs, sa_times = [], []
         aco_costs, aco_times = [], []
+        sa_gaps, aco_gaps = [], []
 
         for r in range(args.runs):
             seed = 1000 + r
             pts = generate_uniform_points(n, seed=seed)
-            dist = euclidean_distance_matrix(pts)
+            dist = cache.distance_array(pts, dtype="float64") if cache else euclidean_distance_matrix(pts)
 
             t0 = time.perf_counter()
             sa = simulated_annealing_tsp(dist, SAParams(seed=seed, max_seconds=args.sa_seconds))
@@ -58,6 +64,11 @@ def main():
             aco_times.append(time.perf_counter() - t0)
             aco_costs.append(aco.best_cost)
 
+            if args.gap:
+                bound = held_karp_bound(dist, upper=min(sa.best_cost, aco.best_cost)).value
+                sa_gaps.append(100.0 * gap(sa.best_cost, bound))
+                aco_gaps.append(100.0 * gap(aco.best_cost, bound))
+
         sa_s = summarize(sa_costs)
         aco_s = summarize(aco_costs)
 
@@ -75,12 +86,16 @@ def main():
             "aco_stdev": aco_s["stdev"],
             "aco_time_mean_s": stats.mean(aco_times),
         }
+        if args.gap:
+            row["sa_gap_mean_pct"] = stats.mean(sa_gaps)
+            row["aco_gap_mean_pct"] = stats.mean(aco_gaps)
         rows.append(row)
 
         print(
             f"n={n:>3} | "
             f"SA mean={row['sa_mean']:.2f} (best={row['sa_best']:.2f}) time={row['sa_time_mean_s']:.3f}s | "
             f"ACO mean={row['aco_mean']:.2f} (best={row['aco_best']:.2f}) time={row['aco_time_mean_s']:.3f}s"
+            + (f" | gap SA={row['sa_gap_mean_pct']:.2f}% ACO={row['aco_gap_mean_pct']:.2f}%" if args.gap else "")
         )
 
     with open(args.out, "w", newline="") as f:
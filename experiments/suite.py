@@ -0,0 +1,281 @@
+"""Benchmark suite: solver quality and time-to-target on several instance families,
+ns/move microbenchmarks, and regression checks against a stored baseline.
+
+    python experiments/suite.py --sizes 100,1000,10000 --workers 4 --out results/suite.json
+    python experiments/suite.py --quick --save-baseline results/baseline.json
+    python experiments/suite.py --quick --baseline results/baseline.json   # exit 1 on regressions
+
+Every (solver, family, size, seed) configuration runs in its own worker process. Runs
+are time-budgeted, so use at most one worker per physical core or they slow each other
+down. Quality is measured as the gap to the Held-Karp lower bound of the instance;
+time-to-target is the wall time until the incumbent first got within each of
+``TARGETS`` of that bound.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import json
+import os
+import platform
+import random
+import statistics as stats
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from neurocourier.tsp.distance import euclidean_distance_array, row_view
+from neurocourier.tsp.instances import generate_clustered_points, generate_uniform_points
+from neurocourier.tsp.moves import delta_2opt
+from neurocourier.tsp.neighbors import candidate_lists
+from neurocourier.tsp.oracle import DistanceOracle
+from neurocourier.tsp.tour import tour_length
+from neurocourier.tsp.tsplib import read_tsplib, write_tsplib
+from neurocourier.evaluation import gap, held_karp_bound
+from neurocourier.solvers import (
+    ACOParams,
+    LKParams,
+    SAParams,
+    StopCriteria,
+    run_anytime,
+)
+from neurocourier.solvers.aco.vectorized import ant_uniforms, construct_tours
+
+FAMILIES = ("uniform", "clustered", "tsplib")
+TARGETS = (0.20, 0.10, 0.05, 0.02, 0.01)
+DENSE_LIMIT = 2000       # larger instances use a DistanceOracle
+ACO_MAX_N = 2000         # the numpy ACO engine needs a dense matrix
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def make_instance(family: str, n: int, seed: int):
+    """Distance backend for one instance of a family (dense up to DENSE_LIMIT cities)."""
+    if family.startswith("file:"):
+        return read_tsplib(family[5:]).distances(dense_limit=DENSE_LIMIT)
+    if family == "uniform":
+        pts = generate_uniform_points(n, seed=seed)
+    elif family == "clustered":
+        pts = generate_clustered_points(n, seed=seed, k_clusters=max(4, n // 100))
+    elif family == "tsplib":
+        # TSPLIB-style: integer coordinates and the rounded EUC_2D metric, via a real file.
+        rng = random.Random(seed)
+        side = int(10 * n ** 0.5) + 10
+        pts = [(rng.randrange(side), rng.randrange(side)) for _ in range(n)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / f"synthetic{n}.tsp"
+            write_tsplib(path, pts, comment=f"seed {seed}")
+            return read_tsplib(path).distances(dense_limit=DENSE_LIMIT)
+    else:
+        raise ValueError(f"unknown instance family {family!r}")
+    return euclidean_distance_array(pts) if n <= DENSE_LIMIT else DistanceOracle(pts)
+
+
+def run_config(cfg: dict) -> dict:
+    """One solver run; returns a flat result row."""
+    dist = make_instance(cfg["family"], cfg["n"], cfg["seed"])
+    n = len(dist)
+    bound = held_karp_bound(dist, iterations=cfg["bound_iterations"]).value
+    seed, seconds = cfg["seed"], cfg["seconds"]
+    trace = []   # (elapsed, cost) of every improvement
+
+    t0 = time.perf_counter()
+    if cfg["solver"] == "lk":
+        # Kicks until the deadline; an incumbent after every improving kick.
+        p = LKParams(seed=seed, max_seconds=seconds)
+    elif cfg["solver"] == "sa":
+        p = SAParams(seed=seed, neighbors=8, moves=(("2opt", 1.0), ("oropt", 1.0)), polish=True)
+    else:
+        p = ACOParams(seed=seed, engine="numpy", variant="mmas", neighbors=10, ants=min(n, 50), iterations=10 ** 9, polish=True)
+    res = run_anytime(
+        dist, p, StopCriteria(max_seconds=seconds), on_improve=lambda inc: trace.append((inc.elapsed, inc.cost))
+    )
+    cost = res.best_cost
+    elapsed = time.perf_counter() - t0
+
+    row = {k: cfg[k] for k in ("solver", "family", "n", "seed", "seconds")}
+    row.update(n=n, cost=cost, bound=bound, gap_pct=100.0 * gap(cost, bound), elapsed=elapsed)
+    for g in TARGETS:
+        hit = next((t for t, c in trace if c <= bound * (1.0 + g)), None)
+        row[f"ttt_{g:g}"] = hit
+    return row
+
+
+def _best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def microbenchmarks(repeats: int = 5, n: int = 1000) -> dict:
+    """Nanoseconds per unit of work for the innermost solver kernels (best of ``repeats``)."""
+    pts = generate_uniform_points(n, seed=0)
+    d = euclidean_distance_array(pts)
+    rows = row_view(d)
+    lists = d.tolist()
+    rng = random.Random(0)
+    tour = list(range(n))
+    rng.shuffle(tour)
+    pairs = [tuple(sorted(rng.sample(range(n), 2))) for _ in range(20000)]
+    out = {}
+
+    def deltas():
+        for i, k in pairs:
+            delta_2opt(tour, i, k, rows)
+
+    out["delta_2opt_ns"] = 1e9 * _best_of(deltas, repeats) / len(pairs)
+    out["tour_length_list_ns_per_edge"] = 1e9 * _best_of(lambda: tour_length(tour, lists), repeats) / n
+    out["tour_length_array_ns_per_edge"] = 1e9 * _best_of(lambda: tour_length(tour, d), repeats) / n
+
+    # Python engine: per construction step, setup excluded by differencing 1 and 3 iterations.
+    m, ants = 200, 20
+    dm = d[:m, :m].copy()
+    run = lambda it: _best_of(  # noqa: E731
+        lambda: run_anytime(dm, ACOParams(seed=0, ants=ants, iterations=it, neighbors=10)), max(1, repeats // 2)
+    )
+    out["aco_build_tour_python_ns_per_step"] = 1e9 * max(run(3) - run(1), 0.0) / (2 * ants * m)
+
+    ants = 64
+    cand = candidate_lists(d, 10)
+    weights = (1.0 / (d + 1e-10)) ** 5
+    u = ant_uniforms(0, 0, 0, ants, n)
+    out["aco_construct_numpy_ns_per_step"] = 1e9 * _best_of(lambda: construct_tours(weights, u, cand), repeats) / (ants * n)
+    return out
+
+
+def summarize(rows: list) -> dict:
+    """Mean gap and time-to-target per (solver, family, n, time budget)."""
+    groups = {}
+    for r in rows:
+        groups.setdefault(f"{r['solver']}/{r['family']}/{r['n']}/{r['seconds']:g}s", []).append(r)
+    out = {}
+    for key, rs in sorted(groups.items()):
+        s = {"runs": len(rs), "gap_pct_mean": stats.mean(r["gap_pct"] for r in rs)}
+        for g in TARGETS:
+            hits = [r[f"ttt_{g:g}"] for r in rs if r[f"ttt_{g:g}"] is not None]
+            s[f"ttt_{g:g}_median"] = stats.median(hits) if hits else None
+            s[f"ttt_{g:g}_hit_rate"] = len(hits) / len(rs)
+        out[key] = s
+    return out
+
+
+def regressions(current: dict, baseline: dict, micro_tol: float, gap_tol: float) -> list:
+    """Microbenchmarks slower by more than ``micro_tol`` (relative) and mean gaps worse by
+    more than ``gap_tol`` percentage points than in ``baseline``."""
+    found = []
+    for name, base in baseline.get("micro", {}).items():
+        cur = current["micro"].get(name)
+        if cur is not None and base > 0 and cur > base * (1.0 + micro_tol):
+            found.append(f"{name}: {cur:.1f} vs baseline {base:.1f} (+{100.0 * (cur / base - 1.0):.0f}%)")
+    for key, base in baseline.get("summary", {}).items():
+        cur = current["summary"].get(key)
+        if cur is not None and cur["gap_pct_mean"] > base["gap_pct_mean"] + gap_tol:
+            found.append(f"{key}: gap {cur['gap_pct_mean']:.2f}% vs baseline {base['gap_pct_mean']:.2f}%")
+    return found
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark suite with time-to-target curves and regression checks.")
+    ap.add_argument("--sizes", default="100,1000,10000", help="Comma-separated instance sizes")
+    ap.add_argument("--families", default=",".join(FAMILIES), help="Comma-separated: uniform, clustered, tsplib")
+    ap.add_argument("--tsplib", default="", help="Comma-separated TSPLIB files to add as instances")
+    ap.add_argument("--solvers", default="sa,aco,lk", help="Comma-separated: sa, aco, lk")
+    ap.add_argument("--runs", type=int, default=3, help="Seeds per configuration")
+    ap.add_argument("--seconds", type=float, default=5.0, help="Time budget per run")
+    ap.add_argument("--bound_iterations", type=int, default=300, help="Held-Karp subgradient steps per instance")
+    ap.add_argument("--workers", type=int, default=1, help="Configurations run in parallel")
+    ap.add_argument("--quick", action="store_true", help="Small sizes and budgets for a smoke run")
+    ap.add_argument("--no_micro", action="store_true", help="Skip the microbenchmarks")
+    ap.add_argument("--out", default="results/suite.json", help="JSON output path (a CSV of runs goes next to it)")
+    ap.add_argument("--baseline", default=None, help="Baseline JSON to check for regressions")
+    ap.add_argument("--save-baseline", dest="save_baseline", default=None, help="Also write the results here as a baseline")
+    ap.add_argument("--micro_tol", type=float, default=0.15, help="Allowed relative microbenchmark slowdown")
+    ap.add_argument("--gap_tol", type=float, default=1.0, help="Allowed mean gap increase (percentage points)")
+    args = ap.parse_args()
+    if args.quick:
+        args.sizes, args.runs, args.seconds = "50,200", min(args.runs, 2), min(args.seconds, 0.5)
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    families = [f.strip() for f in args.families.split(",") if f.strip()]
+    solvers = [s.strip() for s in args.solvers.split(",") if s.strip()]
+    configs = []
+    for solver in solvers:
+        for family in families:
+            for n in sizes:
+                if solver == "aco" and n > ACO_MAX_N:
+                    continue
+                for r in range(args.runs):
+                    configs.append({"solver": solver, "family": family, "n": n, "seed": 1000 + r})
+        for path in filter(None, (s.strip() for s in args.tsplib.split(","))):
+            for r in range(args.runs):
+                configs.append({"solver": solver, "family": f"file:{path}", "n": 0, "seed": 1000 + r})
+    for cfg in configs:
+        cfg.update(seconds=args.seconds, bound_iterations=args.bound_iterations)
+
+    print(f"\nBenchmark suite: {len(configs)} runs, {args.workers} worker(s), {args.seconds}s each\n")
+    rows = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for row in pool.map(run_config, configs):
+            rows.append(row)
+            print(
+                f"{row['solver']:>3} {row['family']:>10} n={row['n']:>5} seed={row['seed']} | "
+                f"cost={row['cost']:.1f} gap={row['gap_pct']:.2f}% ttt(5%)={row['ttt_0.05']}"
+            )
+
+    result = {"environment": environment(), "config": vars(args), "runs": rows, "summary": summarize(rows), "micro": {}}
+    if not args.no_micro:
+        result["micro"] = microbenchmarks()
+        for name, ns in result["micro"].items():
+            print(f"{name:>36}: {ns:10.1f} ns")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2))
+    if rows:
+        with open(out.with_suffix(".csv"), "w", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            w.writeheader()
+            w.writerows(rows)
+    print(f"\nSaved: {out}")
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(result, indent=2))
+        print(f"Baseline: {args.save_baseline}")
+
+    if args.baseline:
+        found = regressions(result, json.loads(Path(args.baseline).read_text()), args.micro_tol, args.gap_tol)
+        for line in found:
+            print(f"REGRESSION {line}")
+        if found:
+            sys.exit(1)
+        print("No regressions against", args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""``neurocourier`` console script.
+
+    neurocourier run -c pipeline.toml data/*.tsp > results.jsonl
+    find data -name '*.json' | neurocourier run -c pipeline.toml --workers 8 -
+    neurocourier config -c pipeline.toml      # the resolved config, defaults included
+
+``run`` writes one JSON line per input, in input order, as soon as it is solved, and
+exits with status 1 if any input failed. Only the standard library is imported up
+front; NumPy and the solvers load when the first input is solved.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from functools import partial
+from typing import Iterator, List, Optional, Sequence
+
+from neurocourier.config import RunConfig, config_to_dict, load_config
+
+
+def _inputs(paths: Sequence[str]) -> Iterator[str]:
+    for path in paths:
+        if path == "-":
+            for line in sys.stdin:
+                line = line.strip()
+                if line:
+                    yield line
+        else:
+            yield path
+
+
+def _config(args: argparse.Namespace) -> RunConfig:
+    cfg = load_config(args.config) if args.config else RunConfig()
+    if getattr(args, "workers", None) is not None:
+        cfg = replace(cfg, workers=args.workers)
+    if getattr(args, "max_seconds", None) is not None:
+        cfg = replace(cfg, max_seconds=args.max_seconds)
+    if getattr(args, "no_tour", False):
+        cfg = replace(cfg, tour=False)
+    return cfg
+
+
+def _run(args: argparse.Namespace) -> int:
+    from .pipeline import check_pipeline, solve_file
+
+    cfg = _config(args)
+    check_pipeline(cfg)
+    out = open(args.out, "w") if args.out else sys.stdout
+    failed = 0
+    try:
+        solve = partial(solve_file, cfg=cfg)
+        if cfg.workers > 1:
+            with ProcessPoolExecutor(max_workers=cfg.workers) as pool:
+                records = pool.map(solve, _inputs(args.inputs))
+                for rec in records:
+                    failed += rec["status"] != "ok"
+                    out.write(json.dumps(rec) + "\n")
+                    out.flush()
+        else:
+            for rec in map(solve, _inputs(args.inputs)):
+                failed += rec["status"] != "ok"
+                out.write(json.dumps(rec) + "\n")
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+def _show_config(args: argparse.Namespace) -> int:
+    print(json.dumps(config_to_dict(_config(args)), indent=2))
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="neurocourier", description="Solve TSP instances with a configured pipeline.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="solve input files, one JSON line per input")
+    run.add_argument("inputs", nargs="+", help="TSPLIB .tsp or JSON point files; '-' reads paths from stdin")
+    run.add_argument("-c", "--config", help="TOML or JSON run configuration (default: built-in pipeline)")
+    run.add_argument("-o", "--out", help="write JSON lines here instead of stdout")
+    run.add_argument("--workers", type=int, help="input files solved in parallel (overrides the config)")
+    run.add_argument("--max-seconds", type=float, help="time budget per input (overrides the config)")
+    run.add_argument("--no-tour", action="store_true", help="leave tours out of the output")
+    run.set_defaults(func=_run)
+
+    show = sub.add_parser("config", help="print the resolved configuration as JSON")
+    show.add_argument("-c", "--config", help="TOML or JSON run configuration")
+    show.set_defaults(func=_show_config)
+
+    args = ap.parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as exc:
+        print(f"neurocourier: {exc}", file=sys.stderr)
+        return 2
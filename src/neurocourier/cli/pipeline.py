@@ -0,0 +1,212 @@
+"""Running a :class:`RunConfig` pipeline on one input file.
+
+Solver modules are imported when a step first needs them, so the CLI starts without
+loading NumPy or the solvers and a pipeline only pays for the steps it uses.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+from neurocourier.config import RunConfig, StepConfig
+from neurocourier.config.schema import TIMED_STEPS, _typed
+
+
+def _field_value(where: str, key: str, value: Any, hint: Any) -> Any:
+    """``value`` checked against a params field type, numeric strings coerced as in the config."""
+    if get_origin(hint) is Union:    # Optional[X]
+        if value is None:
+            return None
+        hint = next(a for a in get_args(hint) if a is not type(None))
+    if get_origin(hint) is tuple:
+        args = get_args(hint)
+        items = args[:1] * len(value) if len(args) == 2 and args[1] is Ellipsis else args
+        if not isinstance(value, tuple) or len(items) != len(value):
+            raise ValueError(f"{where}: {key} must be a list of {len(items)} items, got {value!r}")
+        return tuple(_field_value(where, f"{key}[{i}]", v, h) for i, (v, h) in enumerate(zip(value, items)))
+    return _typed(where, key, value, hint)
+
+
+def step_params(step: StepConfig, seed: int) -> Any:
+    """Params dataclass of a solver step (``dict`` of keyword arguments for construct).
+
+    Values are checked against the dataclass field types (numeric strings are coerced)
+    and then by the solver's own checks of names and ranges, so a bad value fails here
+    and not on every input.
+    """
+    kwargs = dict(step.params)
+    if step.step == "construct":
+        from neurocourier.tsp.construct import CONSTRUCTIONS
+
+        method = kwargs.get("method", "nearest")
+        if method not in CONSTRUCTIONS:
+            raise ValueError(f"unknown construction {method!r}; expected one of {CONSTRUCTIONS}")
+        return kwargs
+    if step.step == "sa":
+        from neurocourier.solvers.sa import SAParams as cls
+    elif step.step == "aco":
+        from neurocourier.solvers.aco import ACOParams as cls
+    elif step.step == "lk":
+        from neurocourier.solvers.lk import LKParams as cls
+    else:
+        from neurocourier.solvers.local_search import TwoOptParams as cls
+    if "seed" in cls.__dataclass_fields__:
+        kwargs.setdefault("seed", seed)
+    hints = get_type_hints(cls)
+    unknown = sorted(set(kwargs) - set(hints))
+    if unknown:
+        raise ValueError(f"invalid params for step {step.step!r}: unknown fields {unknown}")
+    p = cls(**{k: _field_value(f"step {step.step!r}", k, v, hints[k]) for k, v in kwargs.items()})
+    if step.step == "sa":
+        from neurocourier.solvers.sa.sa_solver import check_params
+
+        check_params(p)
+    elif step.step == "aco":
+        from neurocourier.solvers.aco.pheromone import check_params
+
+        check_params(p)
+    else:
+        from neurocourier.tsp.construct import CONSTRUCTIONS
+
+        if p.construction not in CONSTRUCTIONS:
+            raise ValueError(f"unknown construction {p.construction!r}; expected one of {CONSTRUCTIONS}")
+        if step.step == "2opt" and p.mode not in ("first", "best"):
+            raise ValueError(f"unknown improvement mode: {p.mode!r}")
+    return p
+
+
+def check_pipeline(cfg: RunConfig) -> None:
+    """Raise ValueError for a step whose params do not fit its solver."""
+    for step in cfg.pipeline:
+        step_params(step, cfg.seed)
+
+
+def _run_step(step: StepConfig, p: Any, dist, tour: Optional[List[int]]) -> Tuple[List[int], float]:
+    if step.step == "construct":
+        from neurocourier.tsp.construct import construct
+        from neurocourier.tsp.tour import tour_length
+
+        tour = construct(dist, p.get("method", "nearest"), p.get("start", 0))
+        return tour, tour_length(tour, dist)
+    if step.step == "2opt":
+        from neurocourier.solvers.local_search import solve_2opt, two_opt
+
+        res = two_opt(dist, tour, p) if tour is not None else solve_2opt(dist, p)
+        return res.best_tour, res.best_cost
+    if tour is not None and step.step in ("sa", "lk") and p.initial_tour is None:
+        p = replace(p, initial_tour=tuple(tour))
+    if step.runs > 1:
+        from neurocourier.solvers.parallel import ParallelParams, parallel_solve
+
+        res = parallel_solve(dist, p, ParallelParams(workers=step.runs, runs=step.runs))
+    else:
+        from neurocourier.solvers.parallel import _solver_for
+
+        res = _solver_for(p)(dist, p)
+    return list(res.best_tour), float(res.best_cost)
+
+
+def run_pipeline(dist, cfg: RunConfig) -> Tuple[List[int], float, List[Dict[str, Any]]]:
+    """Best tour and cost after all steps, plus per-step ``{"step", "cost", "seconds"}``.
+
+    Each step starts from the incumbent tour (ACO builds its own and only replaces the
+    incumbent when it is shorter). With ``cfg.max_seconds`` a timed step gets the time
+    left times its share of the shares of the timed steps still to run, capped by its
+    own ``max_seconds``. The budget is best effort: a construction, an LK descent or
+    an ACO iteration is not interrupted, so a step can overrun its share. Timed steps
+    that start after the deadline are skipped (reported as ``{"step", "skipped": true}``).
+    """
+    from neurocourier.tsp.tour import tour_length
+
+    n = len(dist)
+    deadline = time.perf_counter() + cfg.max_seconds if cfg.max_seconds else None
+    tour: Optional[List[int]] = None
+    cost = float("inf")
+    report: List[Dict[str, Any]] = []
+    if n < 4:
+        tour = list(range(n))
+        return tour, tour_length(tour, dist), report
+    for at, step in enumerate(cfg.pipeline):
+        t0 = time.perf_counter()
+        p = step_params(step, cfg.seed)
+        if deadline is not None and step.step in TIMED_STEPS:
+            if t0 >= deadline and tour is not None:
+                report.append({"step": step.step, "skipped": True})
+                continue
+            shares = sum(s.share for s in cfg.pipeline[at:] if s.step in TIMED_STEPS)
+            budget = max(deadline - t0, 0.0) * (step.share / shares if shares else 0.0)
+            p = replace(p, max_seconds=min(p.max_seconds or budget, budget) or 1e-9)
+        new_tour, new_cost = _run_step(step, p, dist, tour)
+        if new_cost < cost:
+            tour, cost = new_tour, new_cost
+        report.append({"step": step.step, "cost": new_cost, "seconds": time.perf_counter() - t0})
+    return tour, cost, report
+
+
+def _read_points(path: Path) -> Tuple[str, List[Tuple[float, float]]]:
+    import json
+
+    data = json.loads(path.read_text())
+    name = path.stem
+    if isinstance(data, dict):
+        name = data.get("name", name)
+        data = data.get("points")
+    if not isinstance(data, list):
+        raise ValueError("a JSON input is a list of [x, y] pairs or an object with 'points'")
+    try:
+        return name, [(float(x), float(y)) for x, y in data]
+    except (TypeError, ValueError):
+        raise ValueError("'points' must be a list of [x, y] pairs") from None
+
+
+def solve_file(path: str, cfg: RunConfig) -> Dict[str, Any]:
+    """Run the pipeline on a TSPLIB ``.tsp`` or JSON points file; one output record.
+
+    TSPLIB instances use their own metric (costs and gaps match published optima);
+    point lists are Euclidean, with the dense matrix taken from the configured cache.
+    Failures become ``{"status": "error"}`` records so one bad file does not end a batch.
+    """
+    t0 = time.perf_counter()
+    out: Dict[str, Any] = {"input": path}
+    try:
+        src = Path(path)
+        if src.suffix.lower() == ".tsp":
+            from neurocourier.tsp.tsplib import read_tsplib
+
+            prob = read_tsplib(src)
+            name, n = prob.name or src.stem, prob.dimension
+            dist = prob.distances(dense_limit=cfg.dense_limit)
+        else:
+            name, points = _read_points(src)
+            n = len(points)
+            if n > cfg.dense_limit:
+                from neurocourier.tsp.oracle import DistanceOracle
+
+                dist = DistanceOracle(points)
+            elif cfg.cache is not None and n >= 4:
+                from neurocourier.tsp.cache import DistanceCache
+
+                c = cfg.cache
+                dist = DistanceCache(c.dir, max_bytes=c.max_bytes, max_age=c.max_age).distance_array(points, "float64")
+            else:
+                from neurocourier.tsp.distance import euclidean_distance_array
+
+                dist = euclidean_distance_array(points)
+        out.update(name=name, n=n)
+        tour, cost, steps = run_pipeline(dist, cfg)
+        if src.suffix.lower() == ".tsp":
+            cost = prob.tour_cost(tour)
+            gap = prob.gap(cost)
+            if gap is not None:
+                out["gap"] = gap
+        seconds = time.perf_counter() - t0
+        out.update(status="ok", cost=cost, seconds=seconds, steps=steps)
+        if cfg.max_seconds and seconds > cfg.max_seconds:
+            out["overrun"] = seconds - cfg.max_seconds
+        if cfg.tour:
+            out["tour"] = tour
+    except Exception as exc:  # reported per input, the batch goes on
+        out.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    return out
@@ -0,0 +1,3 @@
+from .schema import STEPS, CacheConfig, RunConfig, StepConfig, config_from_dict, config_to_dict, load_config
+
+__all__ = ["STEPS", "CacheConfig", "RunConfig", "StepConfig", "config_from_dict", "config_to_dict", "load_config"]
@@ -0,0 +1,199 @@
+"""Declarative run configuration: a pipeline of steps plus budget, parallelism and cache.
+
+A config is a TOML or JSON document::
+
+    max_seconds = 10          # per input, shared out over the timed steps
+    workers = 4               # input files solved in parallel
+
+    [cache]
+    dir = "/tmp/neurocourier"
+
+    [[pipeline]]
+    step = "construct"
+    method = "greedy"
+
+    [[pipeline]]
+    step = "sa"
+    schedule = "adaptive"
+    runs = 4                  # independent seeded runs in a process pool, best kept
+
+    [[pipeline]]
+    step = "2opt"
+
+Every pipeline entry names a step from ``STEPS``; ``runs`` and ``share`` are step
+options, every other key is a field of the step's params dataclass (``method`` and
+``start`` for ``construct``). This module only parses and checks the structure, so
+loading a config imports neither NumPy nor the solvers.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+STEPS = ("construct", "sa", "aco", "lk", "2opt")
+# Steps that take a time budget (every step but the construction).
+TIMED_STEPS = ("sa", "aco", "lk", "2opt")
+
+
+@dataclass(frozen=True)
+class StepConfig:
+    step: str                        # one of STEPS
+    params: Tuple[Tuple[str, Any], ...] = ()   # (field, value) pairs for the step's params
+    runs: int = 1                    # sa/aco/lk: seeded runs in a process pool, best one kept
+    share: float = 1.0               # weight of the step in the input's time budget
+
+
+@dataclass(frozen=True)
+class CacheConfig:
+    dir: Optional[str] = None        # if None -> $NEUROCOURIER_CACHE or ~/.cache/neurocourier
+    max_bytes: int = 4 * 1024 ** 3
+    max_age: Optional[float] = None  # seconds an unused entry is kept
+
+
+def _default_pipeline() -> Tuple[StepConfig, ...]:
+    return (
+        StepConfig("construct", (("method", "greedy"),)),
+        StepConfig("sa", (("schedule", "adaptive"), ("neighbors", 10), ("moves", (("2opt", 1.0), ("oropt", 1.0))))),
+        StepConfig("2opt"),
+    )
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    pipeline: Tuple[StepConfig, ...] = field(default_factory=_default_pipeline)
+    max_seconds: Optional[float] = None   # best-effort budget per input; steps share it by ``share``
+    workers: int = 1                 # input files solved in parallel processes
+    dense_limit: int = 2000          # above: distances come from a DistanceOracle
+    cache: Optional[CacheConfig] = None   # memory-mapped matrices of point-list inputs
+    seed: int = 0                    # seed of every step that does not set its own
+    tour: bool = True                # include the tour in every output line
+
+
+def _freeze(value: Any) -> Any:
+    # Arrays become tuples so they fit the frozen params dataclasses.
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _typed(where: str, key: str, value: Any, kind: type, optional: bool = False) -> Any:
+    """``value`` as an int, float, str or bool (numeric strings count as numbers); ValueError otherwise."""
+    if value is None and optional:
+        return None
+    if kind in (bool, str):
+        if isinstance(value, kind):
+            return value
+    elif not isinstance(value, bool):
+        try:
+            out = kind(value)
+        except (TypeError, ValueError):
+            out = None
+        if kind is int and out is not None and isinstance(value, float) and out != value:
+            out = None
+        if out is not None:
+            return out
+    raise ValueError(f"{where}: {key} must be {'an' if kind is int else 'a'} {kind.__name__}, got {value!r}")
+
+
+# Scalar fields and their types: (type, None allowed).
+_RUN_FIELDS = {"max_seconds": (float, True), "workers": (int, False), "dense_limit": (int, False), "seed": (int, False), "tour": (bool, False)}
+_CACHE_FIELDS = {"dir": (str, True), "max_bytes": (int, False), "max_age": (float, True)}
+
+
+def _check_keys(where: str, data: Dict[str, Any], allowed) -> None:
+    unknown = sorted(set(data) - set(allowed))
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {unknown}; expected some of {sorted(allowed)}")
+
+
+def _step_from_dict(data: Dict[str, Any], at: int) -> StepConfig:
+    if not isinstance(data, dict):
+        raise ValueError(f"pipeline[{at}] must be a table")
+    data = dict(data)
+    step = data.pop("step", None)
+    if step not in STEPS:
+        raise ValueError(f"pipeline[{at}]: unknown step {step!r}; expected one of {STEPS}")
+    runs = _typed(f"pipeline[{at}]", "runs", data.pop("runs", 1), int)
+    share = _typed(f"pipeline[{at}]", "share", data.pop("share", 1.0), float)
+    if runs < 1 or share < 0:
+        raise ValueError(f"pipeline[{at}]: runs must be >= 1 and share >= 0")
+    if runs > 1 and step not in ("sa", "aco", "lk"):
+        raise ValueError(f"pipeline[{at}]: runs > 1 needs an sa, aco or lk step")
+    if step == "construct":
+        _check_keys(f"pipeline[{at}]", data, ("method", "start"))
+        if "method" in data:
+            data["method"] = _typed(f"pipeline[{at}]", "method", data["method"], str)
+        if "start" in data:
+            data["start"] = _typed(f"pipeline[{at}]", "start", data["start"], int)
+    return StepConfig(step=step, params=tuple((k, _freeze(v)) for k, v in data.items()), runs=runs, share=share)
+
+
+def config_from_dict(data: Dict[str, Any]) -> RunConfig:
+    """:class:`RunConfig` from a parsed TOML/JSON document; ValueError on unknown keys."""
+    _check_keys("config", data, [f.name for f in fields(RunConfig)])
+    kwargs = {k: _typed("config", k, v, *_RUN_FIELDS[k]) for k, v in data.items() if k in _RUN_FIELDS}
+    if "pipeline" in data:
+        if not isinstance(data["pipeline"], list) or not data["pipeline"]:
+            raise ValueError("config: 'pipeline' must be a non-empty list of steps")
+        kwargs["pipeline"] = tuple(_step_from_dict(s, at) for at, s in enumerate(data["pipeline"]))
+    if data.get("cache") is not None:
+        cache = data["cache"]
+        if cache is True:
+            cache = {}
+        if not isinstance(cache, dict):
+            raise ValueError("config: 'cache' must be a table (or true)")
+        _check_keys("cache", cache, [f.name for f in fields(CacheConfig)])
+        kwargs["cache"] = CacheConfig(**{k: _typed("cache", k, v, *_CACHE_FIELDS[k]) for k, v in cache.items()})
+    cfg = RunConfig(**kwargs)
+    if cfg.workers < 1 or cfg.dense_limit < 0:
+        raise ValueError("config: workers must be >= 1 and dense_limit >= 0")
+    if cfg.max_seconds is not None and cfg.max_seconds <= 0:
+        raise ValueError("config: max_seconds must be > 0")
+    return cfg
+
+
+def config_to_dict(cfg: RunConfig) -> Dict[str, Any]:
+    """Plain dict form of ``cfg`` (the inverse of :func:`config_from_dict`)."""
+    out: Dict[str, Any] = {f.name: getattr(cfg, f.name) for f in fields(RunConfig) if f.name not in ("pipeline", "cache")}
+    if cfg.cache is not None:
+        out["cache"] = {f.name: getattr(cfg.cache, f.name) for f in fields(CacheConfig)}
+    steps = []
+    for s in cfg.pipeline:
+        entry: Dict[str, Any] = {"step": s.step}
+        entry.update((k, _thaw(v)) for k, v in s.params)
+        if s.runs != 1:
+            entry["runs"] = s.runs
+        if s.share != 1.0:
+            entry["share"] = s.share
+        steps.append(entry)
+    out["pipeline"] = steps
+    return out
+
+
+def _load_toml(text: str) -> Dict[str, Any]:
+    try:
+        import tomllib
+    except ImportError:              # Python < 3.11
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ValueError("reading TOML configs on Python < 3.11 needs the 'tomli' package") from None
+    return tomllib.loads(text)
+
+
+def load_config(path: Union[str, Path]) -> RunConfig:
+    """Read a ``.toml`` or ``.json`` config file."""
+    path = Path(path)
+    text = path.read_text()
+    data = _load_toml(text) if path.suffix.lower() == ".toml" else json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: a config must be a table / JSON object")
+    return config_from_dict(data)
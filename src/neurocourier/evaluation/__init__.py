@@ -0,0 +1,3 @@
+from .bounds import LowerBound, gap, held_karp_bound, minimum_spanning_tree, mst_bound, one_tree, prim_mst
+
+__all__ = ["LowerBound", "gap", "held_karp_bound", "minimum_spanning_tree", "mst_bound", "one_tree", "prim_mst"]
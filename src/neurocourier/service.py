@@ -0,0 +1,332 @@
+"""Asyncio front end that solves JSON jobs in a process pool.
+
+A job is a JSON object::
+
+    {"id": "r1", "points": [[x, y], ...], "solver": "sa", "params": {"seed": 1}, "deadline": 0.5}
+
+``solver`` is one of ``SOLVERS`` and ``params`` holds fields of its params dataclass.
+``deadline`` (seconds after submission) becomes the solver's time budget: SA and ACO
+run through the anytime API and return the best tour found when it expires. Small jobs
+are grouped into batches so one worker round trip serves many of them.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Deque, Dict, List, Optional
+
+from neurocourier.tsp.distance import euclidean_distance_array
+from neurocourier.tsp.tour import tour_length
+from neurocourier.solvers.aco import ACOParams
+from neurocourier.solvers.anytime import StopCriteria, run_anytime
+from neurocourier.solvers.lk import LKParams, chained_lin_kernighan
+from neurocourier.solvers.sa import SAParams
+
+SOLVERS = {"sa": SAParams, "aco": ACOParams, "lk": LKParams}
+
+
+@dataclass(frozen=True)
+class ServiceConfig:
+    workers: int = 0                 # worker processes; if 0 -> os.cpu_count()
+    max_pending: int = 1024          # queued + running jobs before submissions are rejected
+    batch_size: int = 16             # jobs per worker round trip
+    batch_points: int = 2000         # total cities per batch; larger jobs run alone
+    batch_window: float = 0.002      # seconds to wait for more jobs before dispatching
+    default_deadline: Optional[float] = None
+    deadline_grace: float = 1.0      # extra seconds before an overdue job is reported as timed out
+    latency_window: int = 1024       # completed jobs kept for the latency percentiles
+
+
+class ServiceBusy(RuntimeError):
+    """Raised by :meth:`SolveService.submit` when ``max_pending`` jobs are outstanding."""
+
+
+def _freeze(value: Any) -> Any:
+    # JSON arrays become tuples so they fit the frozen params dataclasses.
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _parse_job(job: Dict[str, Any], default_deadline: Optional[float]) -> Dict[str, Any]:
+    points = job.get("points")
+    if not isinstance(points, list) or not points:
+        raise ValueError("job needs a non-empty 'points' list")
+    try:
+        pts = [(float(x), float(y)) for x, y in points]
+    except (TypeError, ValueError):
+        raise ValueError("'points' must be a list of [x, y] pairs") from None
+    solver = job.get("solver", "sa")
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}; expected one of {sorted(SOLVERS)}")
+    params = job.get("params") or {}
+    if not isinstance(params, dict):
+        raise ValueError("'params' must be an object")
+    params = {k: _freeze(v) for k, v in params.items()}
+    if "trace_path" in params:
+        raise ValueError("'trace_path' cannot be set through the service")
+    try:
+        SOLVERS[solver](**params)
+    except TypeError as exc:
+        raise ValueError(f"invalid params for {solver}: {exc}") from None
+    deadline = job.get("deadline", default_deadline)
+    if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))):
+        raise ValueError(f"'deadline' must be a number of seconds, got {deadline!r}")
+    return {
+        "id": job.get("id"),
+        "points": pts,
+        "solver": solver,
+        "params": params,
+        "deadline_at": time.time() + float(deadline) if deadline is not None else None,
+    }
+
+
+def _solve_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    t0 = time.time()
+    pts = job["points"]
+    n = len(pts)
+    budget = job["deadline_at"] - t0 if job["deadline_at"] is not None else None
+    if budget is not None and budget <= 0:
+        return {"id": job["id"], "status": "expired"}
+    dist = euclidean_distance_array(pts)
+    if n < 4:
+        tour, cost, stopped = list(range(n)), tour_length(list(range(n)), dist), "completed"
+    else:
+        p = SOLVERS[job["solver"]](**job["params"])
+        if isinstance(p, LKParams):
+            if budget is not None:
+                p = replace(p, max_seconds=min(p.max_seconds or budget, budget))
+            res = chained_lin_kernighan(dist, p)
+            tour, cost, stopped = res.best_tour, res.best_cost, "completed"
+        else:
+            res = run_anytime(dist, p, StopCriteria(max_seconds=budget))
+            tour, cost, stopped = res.best_tour, res.best_cost, res.stopped
+    return {
+        "id": job["id"],
+        "status": "ok",
+        "tour": tour,
+        "cost": cost,
+        "stopped": stopped,
+        "solve_seconds": time.time() - t0,
+    }
+
+
+def _solve_batch(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    out = []
+    for job in jobs:
+        try:
+            out.append(_solve_job(job))
+        except Exception as exc:  # one bad job must not fail its batch
+            out.append({"id": job["id"], "status": "error", "error": f"{type(exc).__name__}: {exc}"})
+    return out
+
+
+class _Pending:
+    __slots__ = ("job", "future", "submitted")
+
+    def __init__(self, job: Dict[str, Any], future: "asyncio.Future[Dict[str, Any]]"):
+        self.job = job
+        self.future = future
+        self.submitted = time.time()
+
+
+class SolveService:
+    """Queue of solve jobs feeding a process pool in batches.
+
+    Use as ``async with SolveService(cfg) as svc: result = await svc.submit(job)``.
+    At most ``workers`` batches run at once; jobs wait in the queue meanwhile, which is
+    what lets later small jobs share a batch.
+    """
+
+    def __init__(self, config: ServiceConfig = ServiceConfig()):
+        self.config = config
+        self.workers = config.workers or os.cpu_count() or 1
+        self._queue: Optional["asyncio.Queue[_Pending]"] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+        self._batches: "set[asyncio.Task[None]]" = set()
+        self._pending = 0
+        self._in_flight = 0
+        self._counts = {"submitted": 0, "completed": 0, "rejected": 0, "failed": 0, "timed_out": 0, "batches": 0}
+        self._batched_jobs = 0
+        self._latencies: Deque[float] = deque(maxlen=config.latency_window)
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if not item.future.done():
+                    item.future.cancel()
+        if self._pool is not None:
+            # Waiting for the workers to exit blocks, so it runs off the event loop.
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(None, pool.shutdown)
+
+    async def __aenter__(self) -> "SolveService":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def submit(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Solve one job (a decoded JSON object) and return its result object.
+
+        Raises :class:`ServiceBusy` when the service is at ``max_pending`` and
+        ``ValueError`` for a malformed job.
+        """
+        if self._queue is None:
+            raise RuntimeError("service is not running; use start() or 'async with'")
+        if self._pending >= self.config.max_pending:
+            self._counts["rejected"] += 1
+            raise ServiceBusy(f"{self._pending} jobs pending")
+        parsed = _parse_job(job, self.config.default_deadline)
+        item = _Pending(parsed, asyncio.get_running_loop().create_future())
+        # A job counts as pending until its future resolves, not until the caller gives
+        # up: a timed-out job keeps its queue slot or worker until it is solved (queued
+        # jobs past their deadline come back as "expired" without solving).
+        self._pending += 1
+        item.future.add_done_callback(self._job_done)
+        self._counts["submitted"] += 1
+        self._queue.put_nowait(item)
+        timeout = None
+        if parsed["deadline_at"] is not None:
+            timeout = max(parsed["deadline_at"] - time.time(), 0.0) + self.config.deadline_grace
+        try:
+            result = dict(await asyncio.wait_for(asyncio.shield(item.future), timeout))
+        except asyncio.TimeoutError:
+            self._counts["timed_out"] += 1
+            result = {"id": parsed["id"], "status": "timeout"}
+        result["latency"] = time.time() - item.submitted
+        if result["status"] == "ok":
+            self._counts["completed"] += 1
+            self._latencies.append(result["latency"])
+        elif result["status"] in ("error", "expired"):
+            self._counts["failed"] += 1
+        return result
+
+    def _job_done(self, future: "asyncio.Future[Dict[str, Any]]") -> None:
+        self._pending -= 1
+
+    async def handle_json(self, text: str) -> str:
+        """JSON in, JSON out; errors and rejections are reported in the result object."""
+        job_id = None
+        try:
+            job = json.loads(text)
+            if not isinstance(job, dict):
+                raise ValueError("job must be a JSON object")
+            job_id = job.get("id")
+            result = await self.submit(job)
+        except ServiceBusy as exc:
+            result = {"id": job_id, "status": "rejected", "error": str(exc)}
+        except ValueError as exc:
+            self._counts["failed"] += 1
+            result = {"id": job_id, "status": "error", "error": str(exc)}
+        return json.dumps(result)
+
+    def metrics(self) -> Dict[str, float]:
+        """Counters, queue depth and latency percentiles of recently completed jobs."""
+        lat = sorted(self._latencies)
+
+        def pct(q: float) -> float:
+            return lat[min(len(lat) - 1, int(q * len(lat)))] if lat else 0.0
+
+        batches = self._counts["batches"]
+        out: Dict[str, float] = {k: float(v) for k, v in self._counts.items()}
+        out.update(
+            queue_depth=float(self._queue.qsize() if self._queue is not None else 0),
+            in_flight=float(self._in_flight),
+            pending=float(self._pending),
+            mean_batch_size=self._batched_jobs / batches if batches else 0.0,
+            latency_p50=pct(0.50),
+            latency_p95=pct(0.95),
+            latency_max=lat[-1] if lat else 0.0,
+        )
+        return out
+
+    async def _dispatch(self) -> None:
+        queue, cfg = self._queue, self.config
+        loop = asyncio.get_running_loop()
+        carry: Optional[_Pending] = None
+        while True:
+            first = carry if carry is not None else await queue.get()
+            carry = None
+            # Waiting for a free worker lets more jobs queue up behind the first one.
+            await self._slots.acquire()
+            if cfg.batch_window > 0 and queue.empty():
+                await asyncio.sleep(cfg.batch_window)
+            batch = [first]
+            points = len(first.job["points"])
+            while len(batch) < cfg.batch_size and points < cfg.batch_points and not queue.empty():
+                nxt = queue.get_nowait()
+                if points + len(nxt.job["points"]) > cfg.batch_points:
+                    carry = nxt  # starts the next batch
+                    break
+                batch.append(nxt)
+                points += len(nxt.job["points"])
+            batch = [item for item in batch if not item.future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = loop.create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[_Pending]) -> None:
+        self._counts["batches"] += 1
+        self._batched_jobs += len(batch)
+        self._in_flight += len(batch)
+        try:
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self._pool, _solve_batch, [item.job for item in batch])
+        except Exception as exc:
+            results = [{"id": item.job["id"], "status": "error", "error": f"{type(exc).__name__}: {exc}"} for item in batch]
+        finally:
+            self._in_flight -= len(batch)
+            self._slots.release()
+        for item, result in zip(batch, results):
+            if not item.future.done():
+                item.future.set_result(result)
+
+
+class LocalClient:
+    """In-process client speaking the service's JSON protocol, for scripts and tests."""
+
+    def __init__(self, service: SolveService):
+        self.service = service
+
+    async def solve(
+        self,
+        points: List[List[float]],
+        solver: str = "sa",
+        params: Optional[Dict[str, Any]] = None,
+        deadline: Optional[float] = None,
+        job_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        job: Dict[str, Any] = {"id": job_id, "points": [list(p) for p in points], "solver": solver}
+        if params:
+            job["params"] = params
+        if deadline is not None:
+            job["deadline"] = deadline
+        return json.loads(await self.service.handle_json(json.dumps(job)))
@@ -1,5 +1,13 @@
 from neurocourier.solvers.sa import SAParams, SAResult, simulated_annealing_tsp
 from neurocourier.solvers.aco import ACOParams, ACOResult, ant_colony_optimize
+from neurocourier.solvers.lk import LKParams, LKResult, chained_lin_kernighan, lin_kernighan
+from neurocourier.solvers.local_search import LocalSearchResult, TwoOptParams, solve_2opt, two_opt
+from neurocourier.solvers.anytime import AnytimeResult, CancelToken, Incumbent, StopCriteria, run_anytime, solve_anytime
+from neurocourier.solvers.incremental import IncrementalParams, IncrementalResult, reoptimize
+from neurocourier.solvers.exact import BranchBoundParams, ExactResult, HeldKarpParams, branch_and_bound, held_karp
+from neurocourier.solvers.batch import BatchParams, solve_batch
+from neurocourier.solvers.decompose import DecomposeParams, DecomposeResult, solve_decomposed
+from neurocourier.solvers.parallel import ParallelParams, ParallelResult, WorkerStats, parallel_solve
 
 __all__ = [
     "SAParams",
@@ -8,4 +16,35 @@ __all__ = [
     "ACOParams",
     "ACOResult",
     "ant_colony_optimize",
+    "LKParams",
+    "LKResult",
+    "chained_lin_kernighan",
+    "lin_kernighan",
+    "TwoOptParams",
+    "LocalSearchResult",
+    "two_opt",
+    "solve_2opt",
+    "StopCriteria",
+    "CancelToken",
+    "Incumbent",
+    "AnytimeResult",
+    "solve_anytime",
+    "run_anytime",
+    "IncrementalParams",
+    "IncrementalResult",
+    "reoptimize",
+    "ParallelParams",
+    "ParallelResult",
+    "WorkerStats",
+    "parallel_solve",
+    "HeldKarpParams",
+    "BranchBoundParams",
+    "ExactResult",
+    "held_karp",
+    "branch_and_bound",
+    "BatchParams",
+    "solve_batch",
+    "DecomposeParams",
+    "DecomposeResult",
+    "solve_decomposed",
 ]
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 import random
+import time
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
+
+from neurocourier.tsp.distance import DistanceMatrix, row_view
+from neurocourier.tsp.construct import construct
+from neurocourier.tsp.neighbors import candidate_rows
 from neurocourier.tsp.tour import tour_length
 from neurocourier.tsp.types import Tour
+from neurocourier.solvers.local_search import TwoOptParams, two_opt
+from neurocourier.solvers.profiling import Profiler, edge_diversity
 
 from .params import ACOParams
+from .pheromone import check_params, initial_tau, mmas_bounds, uses_best_so_far
+from .vectorized import vectorized_iterations
 
 
 @dataclass
@@ -17,25 +27,84 @@ class ACOResult:
     meta: Dict[str, float]
 
 
-def ant_colony_optimize(dist: List[List[float]], p: ACOParams) -> ACOResult:
+def ant_colony_optimize(dist: DistanceMatrix, p: ACOParams) -> ACOResult:
     """Ant Colony Optimization (ACO) for TSP.
 
     The solver takes a precomputed distance matrix (from the shared TSP core) and returns
     the best permutation tour found.
     """
-
+    prof = Profiler() if p.profile or p.trace_path else None
+    best_tour: Tour = []
+    best_cost = float("inf")
+    iterations = 0
+    for iterations, best_tour, best_cost in colony_iterations(dist, p, prof=prof):
+        pass
+    meta = {"iterations": float(iterations), "ants": float(p.ants or len(dist))}
+    if prof is not None:
+        meta.update(prof.meta())
+        if p.trace_path:
+            prof.write_trace(p.trace_path)
+    return ACOResult(best_tour=best_tour, best_cost=best_cost, meta=meta)
+
+
+def colony_iterations(
+    dist: DistanceMatrix,
+    p: ACOParams,
+    stop: Optional[Callable[[], bool]] = None,
+    prof: Optional[Profiler] = None,
+) -> Iterator[Tuple[int, Tour, float]]:
+    """ACO as a generator of ``(iterations done, best tour, best cost)``.
+
+    Yields after every iteration and once more after the optional polish. ``stop`` is
+    polled between iterations; once it returns True the run ends and the polish is
+    skipped. A ``prof`` receives phase times and per-iteration costs and diversity.
+    """
+    check_params(p)
+    if p.engine == "numpy":
+        steps = vectorized_iterations(dist, p, stop, prof)
+    else:
+        steps = _python_iterations(dist, p, stop, prof)
+
+    it, best_tour, best_cost = 0, [], float("inf")
+    for it, best_tour, best_cost in steps:
+        yield it, best_tour, best_cost
+
+    if p.polish and not (stop is not None and stop()):
+        t = time.perf_counter()
+        ls = two_opt(dist, best_tour, TwoOptParams(neighbors=p.neighbors or TwoOptParams.neighbors))
+        if prof is not None:
+            prof.lap("polish", t)
+        if ls.best_cost < best_cost:
+            yield it, ls.best_tour, ls.best_cost
+
+
+def _python_iterations(
+    dist: DistanceMatrix,
+    p: ACOParams,
+    stop: Optional[Callable[[], bool]],
+    prof: Optional[Profiler] = None,
+) -> Iterator[Tuple[int, Tour, float]]:
+    t_setup = time.perf_counter()
     n = len(dist)
     rng = random.Random(p.seed)
     ants = p.ants or n
 
     # Heuristic visibility: eta = 1 / (d + eps)
+    d = row_view(dist)
     eta = [[0.0] * n for _ in range(n)]
     for i in range(n):
         for j in range(n):
             if i != j:
-                eta[i][j] = 1.0 / (dist[i][j] + p.epsilon)
+                eta[i][j] = 1.0 / (d[i][j] + p.epsilon)
 
-    tau = [[1.0] * n for _ in range(n)]
+    tau0 = 1.0
+    if p.variant != "as":
+        tau0 = initial_tau(p, n, tour_length(construct(dist, p.construction), dist))
+    tau = [[tau0] * n for _ in range(n)]
+    cand = candidate_rows(dist, p.neighbors) if p.neighbors else None
+    acs = p.variant == "acs"
+    best_so_far = uses_best_so_far(p)
+    ls_params = TwoOptParams(neighbors=p.neighbors or TwoOptParams.neighbors)
 
     best_tour: Tour = list(range(n))
     best_cost = float("inf")
@@ -47,41 +116,106 @@ def ant_colony_optimize(dist: List[List[float]], p: ACOParams) -> ACOResult:
         unvisited.remove(start)
         cur = start
         while unvisited:
-            candidates = list(unvisited)
+            candidates = None
+            if cand is not None:
+                candidates = [j for j in cand[cur] if j in unvisited]
+            from_cand = bool(candidates)
+            if not from_cand:
+                candidates = list(unvisited)
             weights = []
             for j in candidates:
                 weights.append((tau[cur][j] ** p.alpha) * (eta[cur][j] ** p.beta))
-            nxt = rng.choices(candidates, weights=weights, k=1)[0]
+            if acs and rng.random() < p.q0:
+                nxt = candidates[max(range(len(candidates)), key=weights.__getitem__)]
+            else:
+                nxt = rng.choices(candidates, weights=weights, k=1)[0]
+            if acs and (cand is None or from_cand):
+                # ACS local update, limited to candidate edges when lists are in use.
+                tau[cur][nxt] = tau[nxt][cur] = (1.0 - p.xi) * tau[cur][nxt] + p.xi * tau0
             tour.append(nxt)
             unvisited.remove(nxt)
             cur = nxt
         return tour
 
+    deadline = time.time() + p.max_seconds if p.max_seconds else None
+    if prof is not None:
+        prof.lap("setup", t_setup)
     for it in range(p.iterations):
+        if it and ((deadline is not None and time.time() >= deadline) or (stop is not None and stop())):
+            break
+        t_it = lap_t = time.perf_counter()
         colony: List[Tuple[Tour, float]] = []
+        it_tour: Tour = []
+        it_cost = float("inf")
         for _ in range(ants):
             t = build_tour()
             c = tour_length(t, dist)
             colony.append((t, c))
-            if c < best_cost:
-                best_cost, best_tour = c, t
-
-        # Evaporation
-        evap = 1.0 - p.rho
-        for i in range(n):
-            row = tau[i]
-            for j in range(n):
-                row[j] *= evap
-
-        # Deposit pheromones for each ant
-        for t, c in colony:
-            if c <= 0:
-                continue
-            deposit = p.q / c
+            if c < it_cost:
+                it_tour, it_cost = t, c
+        if prof is not None:
+            lap_t = prof.lap("construct", lap_t)
+        if p.local_search and p.variant != "as":
+            ls = two_opt(dist, it_tour, ls_params)
+            if ls.best_cost < it_cost:
+                it_tour, it_cost = ls.best_tour, ls.best_cost
+            if prof is not None:
+                lap_t = prof.lap("local_search", lap_t)
+        if it_cost < best_cost:
+            best_cost, best_tour = it_cost, it_tour
+        if prof is not None:
+            costs = [c for _, c in colony]
+            prof.record(
+                "iteration",
+                t_it,
+                lap_t,
+                best=best_cost,
+                iteration_best=it_cost,
+                mean=sum(costs) / len(costs),
+                diversity=edge_diversity(np.array([t for t, _ in colony])),
+            )
+        yield it + 1, best_tour, best_cost
+        lap_t = time.perf_counter()
+
+        if p.variant == "as":
+            # Evaporation
+            evap = 1.0 - p.rho
             for i in range(n):
-                u = t[i]
-                v = t[(i + 1) % n]
-                tau[u][v] += deposit
-                tau[v][u] += deposit
-
-    return ACOResult(best_tour=best_tour, best_cost=best_cost, meta={"iterations": float(p.iterations), "ants": float(ants)})
+                row = tau[i]
+                for j in range(n):
+                    row[j] *= evap
+
+            # Deposit pheromones for each ant
+            for t, c in colony:
+                if c <= 0:
+                    continue
+                deposit = p.q / c
+                for i in range(n):
+                    u = t[i]
+                    v = t[(i + 1) % n]
+                    tau[u][v] += deposit
+                    tau[v][u] += deposit
+        else:
+            elite, elite_cost = (best_tour, best_cost) if best_so_far else (it_tour, it_cost)
+            if p.variant == "mmas":
+                evap = 1.0 - p.rho
+                for i in range(n):
+                    tau[i] = [x * evap for x in tau[i]]
+                deposit = p.q / elite_cost
+                for i in range(n):
+                    u = elite[i]
+                    v = elite[(i + 1) % n]
+                    tau[u][v] += deposit
+                    tau[v][u] += deposit
+                lo, hi = mmas_bounds(p, n, best_cost)
+                for i in range(n):
+                    tau[i] = [min(max(x, lo), hi) for x in tau[i]]
+            else:
+                # ACS global update touches the elite tour's edges only.
+                deposit = p.rho * p.q / elite_cost
+                for i in range(n):
+                    u = elite[i]
+                    v = elite[(i + 1) % n]
+                    tau[u][v] = tau[v][u] = (1.0 - p.rho) * tau[u][v] + deposit
+        if prof is not None:
+            prof.lap("update", lap_t)
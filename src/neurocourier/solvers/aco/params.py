@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass(frozen=True)
@@ -21,8 +22,60 @@ class ACOParams:
     iterations: int = 50
     ants: int = 0  # if 0, use n
 
+    # Wall-clock budget, checked between iterations (at least one iteration runs)
+    max_seconds: Optional[float] = None
+
+    # Candidate lists: if > 0, transitions only score the k nearest unvisited cities
+    # (falling back to every unvisited city once all k are visited)
+    neighbors: int = 0
+
+    # "python": reference per-ant loops; "numpy": colony built in lock-step with array
+    # roulette selection and array pheromone updates (needs a dense matrix)
+    engine: str = "python"
+
+    # Worker processes building each colony ("numpy" engine). Every ant draws from its
+    # own stream derived from seed, so results do not depend on the worker count.
+    workers: int = 1
+
+    # Run 2-opt local search on the final best tour
+    polish: bool = False
+
+    # Construction heuristic (neurocourier.tsp.construct) whose tour length sets the
+    # initial pheromone level of mmas/acs
+    construction: str = "nearest"
+
+    # Pheromone model:
+    #   "as"   Ant System: every ant deposits, the whole matrix evaporates
+    #   "mmas" Max-Min Ant System: one elite tour deposits, tau kept in [tau_min, tau_max]
+    #   "acs"  Ant Colony System: pseudo-random-proportional choice, local updates on the
+    #          edges ants take (candidate-list edges only, with neighbors > 0) and an
+    #          update of the elite tour's edges only
+    variant: str = "as"
+
+    # Elite tour of mmas/acs: "iteration" best, "best" so far, or "auto"
+    # (mmas: iteration best, acs: best so far)
+    elite: str = "auto"
+
+    # MMAS bounds; 0 -> derived from the best cost (tau_max = q / (rho * C_best), tau_min
+    # from p_best, the chance of rebuilding the best tour once the trails have converged)
+    tau_min: float = 0.0
+    tau_max: float = 0.0
+    p_best: float = 0.05
+
+    # ACS: probability of taking the highest-scored city outright, local evaporation rate
+    q0: float = 0.9
+    xi: float = 0.1
+
+    # mmas/acs: 2-opt the iteration-best tour before it competes for the elite deposit
+    local_search: bool = False
+
     # Numerics
     epsilon: float = 1e-10
 
     # Reproducibility
     seed: int = 0
+
+    # Instrumentation: phase timers, per-iteration cost and diversity in ACOResult.meta;
+    # trace_path also writes a Chrome trace-event file (and implies profile)
+    profile: bool = False
+    trace_path: Optional[str] = None
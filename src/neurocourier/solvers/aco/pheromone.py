@@ -0,0 +1,52 @@
+"""Pheromone rules of the ACO variants, shared by the Python and NumPy engines."""
+from __future__ import annotations
+
+from typing import Tuple
+
+from neurocourier.tsp.construct import CONSTRUCTIONS
+
+from .params import ACOParams
+
+VARIANTS = ("as", "mmas", "acs")
+ENGINES = ("python", "numpy")
+ELITES = ("auto", "iteration", "best")
+
+
+def check_params(p: ACOParams) -> None:
+    if p.variant not in VARIANTS:
+        raise ValueError(f"unknown ACO variant {p.variant!r}; expected one of {VARIANTS}")
+    if p.elite not in ELITES:
+        raise ValueError(f"unknown ACO elite {p.elite!r}; expected one of {ELITES}")
+    if p.engine not in ENGINES:
+        raise ValueError(f"unknown ACO engine: {p.engine!r}")
+    if p.engine == "python" and p.workers > 1:
+        raise ValueError("ACOParams.workers > 1 needs engine='numpy'")
+    if p.construction not in CONSTRUCTIONS:
+        raise ValueError(f"unknown construction {p.construction!r}; expected one of {CONSTRUCTIONS}")
+    if p.variant == "acs" and p.workers > 1:
+        # Local updates make every ant depend on the steps of all others.
+        raise ValueError("the acs variant builds ants sequentially; use workers=1")
+
+
+def uses_best_so_far(p: ACOParams) -> bool:
+    if p.elite == "auto":
+        return p.variant == "acs"
+    return p.elite == "best"
+
+
+def initial_tau(p: ACOParams, n: int, nn_cost: float) -> float:
+    """Starting trail level, from the cost of a nearest-neighbour tour."""
+    if p.variant == "mmas":
+        return p.tau_max or p.q / (p.rho * nn_cost)
+    if p.variant == "acs":
+        return p.q / (n * nn_cost)
+    return 1.0
+
+
+def mmas_bounds(p: ACOParams, n: int, best_cost: float) -> Tuple[float, float]:
+    tau_max = p.tau_max or p.q / (p.rho * best_cost)
+    if p.tau_min:
+        return p.tau_min, tau_max
+    root = p.p_best ** (1.0 / n)
+    avg = max(n / 2.0 - 1.0, 1.0)
+    return min(tau_max * (1.0 - root) / (avg * root), tau_max), tau_max
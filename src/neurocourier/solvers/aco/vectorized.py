@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from neurocourier.tsp.distance import DistanceMatrix, as_distance_array
+from neurocourier.tsp.construct import construct
+from neurocourier.tsp.neighbors import candidate_lists
+from neurocourier.tsp.shared import SharedArray, SharedSpec
+from neurocourier.tsp.tour import tour_length
+from neurocourier.tsp.types import Tour
+from neurocourier.solvers.local_search import TwoOptParams, two_opt
+from neurocourier.solvers.profiling import Profiler, edge_diversity
+
+from .params import ACOParams
+from .pheromone import initial_tau, mmas_bounds, uses_best_so_far
+
+
+def ant_uniforms(seed: int, iteration: int, first_ant: int, ants: int, n: int) -> np.ndarray:
+    """Random draws of ants ``first_ant .. first_ant + ants - 1`` in one iteration.
+
+    Every ant owns a fixed block of ``n`` doubles of the iteration's PCG64 stream
+    (start city, then one roulette draw per step), so any slice of the colony can be
+    reproduced on its own by advancing the stream.
+    """
+    bitgen = np.random.PCG64(np.random.SeedSequence([seed, iteration]))
+    bitgen.advance(first_ant * n)
+    return np.random.Generator(bitgen).random((ants, n))
+
+
+def _roulette(w: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Column picked per row of ``w`` with probability proportional to its weight.
+
+    Rows without any positive weight get -1.
+    """
+    cs = np.cumsum(w, axis=1)
+    tot = cs[:, -1]
+    r = u * tot
+    pick = (cs > r[:, None]).argmax(axis=1)
+    bad = np.flatnonzero(r >= tot)
+    if len(bad):
+        # The draw rounded up to the row total, or the row has no weight at all.
+        last = w.shape[1] - 1 - (w[bad, ::-1] > 0).argmax(axis=1)
+        pick[bad] = np.where(tot[bad] > 0, last, -1)
+    return pick
+
+
+def _choose(w: np.ndarray, u: np.ndarray, q0: float) -> np.ndarray:
+    """ACS pseudo-random-proportional choice: u < q0 takes the best column, else roulette.
+
+    The roulette reuses the draw rescaled to [0, 1), so each step still costs one uniform.
+    """
+    if q0 <= 0.0:
+        return _roulette(w, u)
+    pick = np.empty(len(u), dtype=np.intp)
+    greedy = u < q0
+    rest = np.flatnonzero(~greedy)
+    if len(rest):
+        pick[rest] = _roulette(w[rest], (u[rest] - q0) / (1.0 - q0))
+    greedy = np.flatnonzero(greedy)
+    if len(greedy):
+        wg = w[greedy]
+        best = wg.argmax(axis=1)
+        pick[greedy] = np.where(wg[np.arange(len(greedy)), best] > 0, best, -1)
+    return pick
+
+
+def construct_tours(
+    weights: np.ndarray,
+    uniforms: np.ndarray,
+    cand: Optional[np.ndarray] = None,
+    q0: float = 0.0,
+    local: Optional[Callable[[np.ndarray, np.ndarray], None]] = None,
+) -> np.ndarray:
+    """Build one tour per row of ``uniforms`` with all ants moving in lock-step.
+
+    ``weights`` is the combined choice matrix tau^alpha * eta^beta. With candidate lists
+    an ant only scores its unvisited candidates and falls back to the full row once
+    they are all visited. ``q0`` > 0 switches to the ACS choice rule; ``local(u, v)``
+    is called after every step with the edges just taken (candidate edges only, when
+    ``cand`` is given) and may update ``weights`` in place.
+    """
+    m, n = uniforms.shape
+    ar = np.arange(m)
+    tours = np.empty((m, n), dtype=np.int32)
+    visited = np.zeros((m, n), dtype=bool)
+    flat_visited = visited.reshape(-1)
+    row_base = (ar * n)[:, None]
+    cur = np.minimum((uniforms[:, 0] * n).astype(np.intp), n - 1)
+    tours[:, 0] = cur
+    visited[ar, cur] = True
+    if cand is not None:
+        cand = cand.astype(np.intp)
+        # Weights that change during construction have to be read fresh every step.
+        cand_w = np.take_along_axis(weights, cand, axis=1) if local is None else None
+
+    for step in range(1, n):
+        u = uniforms[:, step]
+        if cand is not None:
+            cc = cand[cur]
+            w = cand_w[cur] if cand_w is not None else weights[cur[:, None], cc]
+            pick = _choose(w * ~flat_visited[row_base + cc], u, q0)
+            nxt = cc[ar, pick]
+            full = np.flatnonzero(pick < 0)
+        else:
+            nxt = np.empty(m, dtype=np.intp)
+            full = ar
+        if len(full):
+            w = weights[cur[full]] * ~visited[full]
+            pick = _choose(w, u[full], q0)
+            dead = np.flatnonzero(pick < 0)
+            if len(dead):
+                # Every remaining weight underflowed: choose uniformly among unvisited.
+                pick[dead] = _roulette(~visited[full[dead]] * 1.0, u[full[dead]])
+            nxt[full] = pick
+        tours[:, step] = nxt
+        visited[ar, nxt] = True
+        if local is not None:
+            if cand is None:
+                local(cur, nxt)
+            elif len(full) < m:
+                kept = np.ones(m, dtype=bool)
+                kept[full] = False
+                local(cur[kept], nxt[kept])
+        cur = nxt
+    return tours
+
+
+def tour_costs(tours: np.ndarray, d: np.ndarray) -> np.ndarray:
+    return d[tours, np.roll(tours, -1, axis=1)].sum(axis=1, dtype=np.float64)
+
+
+def deposit(tau: np.ndarray, tours: np.ndarray, amounts: np.ndarray) -> None:
+    """Add ``amounts[a]`` to both directions of every edge of tour ``a``."""
+    u = tours.ravel()
+    v = np.roll(tours, -1, axis=1).ravel()
+    dep = np.repeat(amounts, tours.shape[1])
+    np.add.at(tau, (u, v), dep)
+    np.add.at(tau, (v, u), dep)
+
+
+# Shared colony inputs of a construction worker, set once by the pool initializer.
+_WORKER: dict = {}
+
+
+def _attach_colony(weights: SharedSpec, cand: Optional[SharedSpec], seed: int) -> None:
+    _WORKER["weights"] = SharedArray.attach(weights)
+    _WORKER["cand"] = SharedArray.attach(cand) if cand is not None else None
+    _WORKER["seed"] = seed
+
+
+def _construct_slice(iteration: int, first_ant: int, ants: int) -> np.ndarray:
+    weights = _WORKER["weights"].array
+    cand = _WORKER["cand"]
+    u = ant_uniforms(_WORKER["seed"], iteration, first_ant, ants, len(weights))
+    return construct_tours(weights, u, None if cand is None else cand.array)
+
+
+class _ColonyPool:
+    """Process pool building slices of a colony from shared weight and candidate arrays."""
+
+    def __init__(self, n: int, cand: Optional[np.ndarray], seed: int, workers: int):
+        self.weights = SharedArray.copy_of(np.zeros((n, n), dtype=np.float64))
+        self.cand = SharedArray.copy_of(cand) if cand is not None else None
+        self.seed = seed
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach_colony,
+            initargs=(self.weights.spec, self.cand.spec if self.cand is not None else None, seed),
+        )
+
+    def construct(self, weights: np.ndarray, iteration: int, ants: int) -> np.ndarray:
+        self.weights.array[...] = weights
+        bounds = np.linspace(0, ants, min(self.workers, ants) + 1).astype(int)
+        futures = [
+            self.pool.submit(_construct_slice, iteration, int(a), int(b - a))
+            for a, b in zip(bounds[:-1], bounds[1:])
+        ]
+        return np.concatenate([f.result() for f in futures])
+
+    def close(self) -> None:
+        self.pool.shutdown()
+        self.weights.close()
+        if self.cand is not None:
+            self.cand.close()
+
+
+def ant_colony_vectorized(dist: DistanceMatrix, p: ACOParams) -> Tuple[Tour, float, int]:
+    best_tour: Tour = []
+    best_cost = float("inf")
+    for _, best_tour, best_cost in vectorized_iterations(dist, p):
+        pass
+    return best_tour, best_cost, p.ants or len(dist)
+
+
+def vectorized_iterations(
+    dist: DistanceMatrix,
+    p: ACOParams,
+    stop: Optional[Callable[[], bool]] = None,
+    prof: Optional[Profiler] = None,
+) -> Iterator[Tuple[int, Tour, float]]:
+    """Array-based ACO: same model as the Python engine, built colony-at-once.
+
+    Yields ``(iterations done, best tour, best cost)`` after every iteration; the run
+    ends early once ``p.max_seconds`` has passed or ``stop()`` returns True.
+
+    With ``p.workers > 1`` the ants of an iteration are split into contiguous slices
+    built by worker processes that read the choice weights and candidate lists from
+    shared memory; evaporation and deposit stay a single step in this process. ACS
+    local updates are applied after every lock-step move; an edge taken by several
+    ants in the same step decays once.
+    """
+    t_setup = time.perf_counter()
+    d = as_distance_array(dist, dtype=np.float64)
+    n = len(d)
+    ants = p.ants or n
+
+    with np.errstate(divide="ignore"):
+        eta_beta = (1.0 / (d + p.epsilon)) ** p.beta
+    np.fill_diagonal(eta_beta, 0.0)
+    cand = candidate_lists(d, p.neighbors) if p.neighbors else None
+    tau0 = 1.0
+    if p.variant != "as":
+        tau0 = initial_tau(p, n, tour_length(construct(d, p.construction), d))
+    tau = np.full((n, n), tau0, dtype=np.float64)
+    best_so_far = uses_best_so_far(p)
+    ls_params = TwoOptParams(neighbors=p.neighbors or TwoOptParams.neighbors)
+    colony = _ColonyPool(n, cand, p.seed, p.workers) if p.workers > 1 else None
+
+    def acs_local(u: np.ndarray, v: np.ndarray) -> None:
+        t = (1.0 - p.xi) * tau[u, v] + p.xi * tau0
+        tau[u, v] = tau[v, u] = t
+        w = (t if p.alpha == 1.0 else t ** p.alpha) * eta_beta[u, v]
+        weights[u, v] = weights[v, u] = w
+
+    best_tour: Tour = list(range(n))
+    best_cost = float("inf")
+    deadline = time.time() + p.max_seconds if p.max_seconds else None
+
+    if prof is not None:
+        prof.lap("setup", t_setup)
+    try:
+        for it in range(p.iterations):
+            if it and ((deadline is not None and time.time() >= deadline) or (stop is not None and stop())):
+                break
+            t_it = lap_t = time.perf_counter()
+            weights = (tau if p.alpha == 1.0 else tau ** p.alpha) * eta_beta
+            if prof is not None:
+                lap_t = prof.lap("weights", lap_t)
+            if colony is not None:
+                tours = colony.construct(weights, it, ants)
+            elif p.variant == "acs":
+                tours = construct_tours(weights, ant_uniforms(p.seed, it, 0, ants, n), cand, p.q0, acs_local)
+            else:
+                tours = construct_tours(weights, ant_uniforms(p.seed, it, 0, ants, n), cand)
+            if prof is not None:
+                lap_t = prof.lap("construct", lap_t)
+            costs = tour_costs(tours, d)
+            a = int(costs.argmin())
+            it_tour, it_cost = tours[a], float(costs[a])
+            if prof is not None:
+                lap_t = prof.lap("costs", lap_t)
+            if p.local_search and p.variant != "as":
+                ls = two_opt(d, it_tour.tolist(), ls_params)
+                if ls.best_cost < it_cost:
+                    it_tour, it_cost = np.array(ls.best_tour, dtype=np.intp), ls.best_cost
+                if prof is not None:
+                    lap_t = prof.lap("local_search", lap_t)
+            if it_cost < best_cost:
+                best_cost, best_tour = it_cost, it_tour.tolist()
+            if prof is not None:
+                prof.record(
+                    "iteration",
+                    t_it,
+                    lap_t,
+                    best=best_cost,
+                    iteration_best=it_cost,
+                    mean=float(costs.mean()),
+                    diversity=edge_diversity(tours),
+                )
+            yield it + 1, best_tour, best_cost
+            lap_t = time.perf_counter()
+
+            if p.variant == "as":
+                tau *= 1.0 - p.rho
+                valid = costs > 0
+                deposit(tau, tours[valid], p.q / costs[valid])
+            else:
+                elite = np.array(best_tour, dtype=np.intp) if best_so_far else it_tour
+                elite_cost = best_cost if best_so_far else it_cost
+                if p.variant == "mmas":
+                    tau *= 1.0 - p.rho
+                    deposit(tau, elite[None, :], np.array([p.q / elite_cost]))
+                    lo, hi = mmas_bounds(p, n, best_cost)
+                    np.clip(tau, lo, hi, out=tau)
+                else:
+                    # ACS global update touches the elite tour's edges only.
+                    u, v = elite, np.roll(elite, -1)
+                    tau[u, v] = tau[v, u] = (1.0 - p.rho) * tau[u, v] + p.rho * p.q / elite_cost
+            if prof is not None:
+                prof.lap("update", lap_t)
+    finally:
+        if colony is not None:
+            colony.close()
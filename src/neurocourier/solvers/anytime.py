@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+
+from neurocourier.tsp.distance import DistanceMatrix
+from neurocourier.tsp.types import Tour
+from neurocourier.evaluation.bounds import gap, held_karp_bound
+from neurocourier.solvers.aco import ACOParams
+from neurocourier.solvers.aco.aco_solver import colony_iterations
+from neurocourier.solvers.lk import LKParams
+from neurocourier.solvers.lk.lk_solver import kick_iterations
+from neurocourier.solvers.sa import SAParams
+from neurocourier.solvers.sa.sa_solver import anneal_stages
+from neurocourier.solvers.profiling import Profiler
+
+AnytimeParams = Union[SAParams, ACOParams, LKParams]
+
+
+@dataclass(frozen=True)
+class StopCriteria:
+    max_seconds: Optional[float] = None      # wall clock, including solver setup
+    max_iterations: Optional[int] = None     # SA temperature stages / ACO iterations / LK kicks
+    target_cost: Optional[float] = None      # stop once the incumbent is at most this long
+    max_gap: Optional[float] = None          # stop once (cost - bound) / bound is at most this (0.01 = 1%)
+    lower_bound: Optional[float] = None      # bound for max_gap; if None -> Held-Karp bound computed at start
+
+
+class CancelToken:
+    """Thread-safe flag for stopping an anytime run from outside (another thread,
+    a signal handler or an event loop callback)."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass
+class Incumbent:
+    tour: Tour
+    cost: float
+    iteration: int       # SA stages / ACO iterations / LK kicks done when it was found
+    elapsed: float       # seconds since the run started
+
+
+@dataclass
+class AnytimeResult:
+    best_tour: Tour
+    best_cost: float
+    iterations: int
+    elapsed: float
+    stopped: str         # "completed", "max_seconds", "max_iterations", "target_cost", "max_gap" or "cancelled"
+    lower_bound: Optional[float] = None      # the bound max_gap was measured against
+    meta: Dict[str, float] = field(default_factory=dict)   # profiler stats when params set profile
+
+
+class _Run:
+    def __init__(self, stop: StopCriteria, cancel: Optional[CancelToken]):
+        self.stop = stop
+        self.cancel = cancel
+        self.t0 = time.time()
+        self.deadline = self.t0 + stop.max_seconds if stop.max_seconds is not None else None
+        self.iterations = 0
+        self.stopped = "completed"
+        self.lower_bound = stop.lower_bound
+        self.prof: Optional[Profiler] = None
+
+    def interrupted(self) -> bool:
+        """Polled by the solver inside its loops: deadline or cancellation."""
+        if self.cancel is not None and self.cancel.cancelled:
+            self.stopped = "cancelled"
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            self.stopped = "max_seconds"
+            return True
+        return False
+
+    def done(self, best: float) -> bool:
+        if self.interrupted():
+            return True
+        if self.stop.target_cost is not None and best <= self.stop.target_cost:
+            self.stopped = "target_cost"
+            return True
+        if self.stop.max_gap is not None and gap(best, self.lower_bound) <= self.stop.max_gap:
+            self.stopped = "max_gap"
+            return True
+        if self.stop.max_iterations is not None and self.iterations >= self.stop.max_iterations:
+            self.stopped = "max_iterations"
+            return True
+        return False
+
+    def steps(self, dist: DistanceMatrix, p: AnytimeParams) -> Iterator[Tuple[int, Tour, float]]:
+        if isinstance(p, (SAParams, ACOParams)) and (p.profile or p.trace_path):
+            self.prof = Profiler()
+        if isinstance(p, SAParams):
+            return anneal_stages(dist, p, self.interrupted, self.prof)
+        if isinstance(p, ACOParams):
+            return colony_iterations(dist, p, self.interrupted, self.prof)
+        if isinstance(p, LKParams):
+            return kick_iterations(dist, p, self.interrupted, self.deadline)
+        raise TypeError(f"no anytime solver for parameters of type {type(p).__name__}")
+
+    def incumbents(self, dist: DistanceMatrix, p: AnytimeParams) -> Iterator[Incumbent]:
+        if self.stop.max_gap is not None and self.lower_bound is None:
+            budget = self.deadline - time.time() if self.deadline is not None else None
+            self.lower_bound = held_karp_bound(dist, max_seconds=budget).value
+        steps = self.steps(dist, p)
+        best = math.inf
+        try:
+            for it, tour, cost in steps:
+                self.iterations = it
+                if cost < best:
+                    best = cost
+                    yield Incumbent(tour=list(tour), cost=cost, iteration=it, elapsed=time.time() - self.t0)
+                if self.done(best):
+                    break
+        finally:
+            steps.close()
+
+
+def solve_anytime(
+    dist: DistanceMatrix,
+    p: AnytimeParams,
+    stop: StopCriteria = StopCriteria(),
+    cancel: Optional[CancelToken] = None,
+) -> Iterator[Incumbent]:
+    """Run SA, ACO or chained LK (chosen by the type of ``p``) and yield every improved incumbent.
+
+    SA reports after each temperature stage, ACO after each iteration and LK after the
+    first descent and every improving kick. Deadline and cancellation are also checked
+    inside a stage (every 1024 SA moves) or between ACO iterations and LK kicks, so the
+    last incumbent is at most that much work old; the deadline also bounds LK descents. With
+    ``stop.max_gap`` and no ``stop.lower_bound`` a Held-Karp bound is computed first
+    (within the time budget). The caller may stop consuming at any time; the solver is
+    closed with the generator.
+    """
+    yield from _Run(stop, cancel).incumbents(dist, p)
+
+
+def run_anytime(
+    dist: DistanceMatrix,
+    p: AnytimeParams,
+    stop: StopCriteria = StopCriteria(),
+    cancel: Optional[CancelToken] = None,
+    on_improve: Optional[Callable[[Incumbent], None]] = None,
+) -> AnytimeResult:
+    """Callback form of :func:`solve_anytime`; returns the best incumbent and why it stopped."""
+    run = _Run(stop, cancel)
+    last: Optional[Incumbent] = None
+    for inc in run.incumbents(dist, p):
+        last = inc
+        if on_improve is not None:
+            on_improve(inc)
+    if last is None:
+        raise RuntimeError("the solver produced no tour")
+    meta: Dict[str, float] = {}
+    if run.prof is not None:
+        meta = run.prof.meta()
+        if p.trace_path:
+            run.prof.write_trace(p.trace_path)
+    return AnytimeResult(
+        best_tour=last.tour,
+        best_cost=last.cost,
+        iterations=run.iterations,
+        elapsed=time.time() - run.t0,
+        stopped=run.stopped,
+        lower_bound=run.lower_bound,
+        meta=meta,
+    )
@@ -0,0 +1,232 @@
+"""Simulated annealing for many small instances at once.
+
+Instances are sorted by size and packed into blocks: a padded (B, N, N) distance
+array plus (B, N) tour arrays. Every step proposes one random 2-opt move per instance
+and evaluates, accepts and applies all of them with array operations, so the Python
+overhead of a step is shared by the whole block. Each instance follows its own SA
+schedule (stages of ``iters_per_temp`` moves, default 20 * n) and draws from its own
+random stream seeded with ``p.seed + index``, so results do not depend on how the
+instances are grouped into blocks or sharded over processes.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from neurocourier.tsp.distance import DistanceMatrix, as_distance_array
+from neurocourier.solvers.sa import SAParams, SAResult
+
+# Steps between refills of the per-instance uniform buffers (and deadline checks).
+_CHUNK = 1024
+
+
+@dataclass(frozen=True)
+class BatchParams:
+    workers: int = 1                 # processes; blocks are spread over them
+    max_batch: int = 1024            # instances per block
+    max_bytes: int = 256 * 1024 ** 2  # cap on a block's padded distance array
+
+
+def _pack(mats: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack matrices of different sizes into a zero-padded (B, N, N) array plus sizes."""
+    n = np.array([len(m) for m in mats], dtype=np.int64)
+    N = int(n.max()) if len(n) else 0
+    D = np.zeros((len(mats), N, N), dtype=np.float64)
+    for b, m in enumerate(mats):
+        D[b, : len(m), : len(m)] = m
+    return D, n
+
+
+def _tour_costs(D: np.ndarray, tours: np.ndarray, n: np.ndarray) -> np.ndarray:
+    B, N = tours.shape
+    pos = np.arange(N)
+    nxt = np.take_along_axis(tours, (pos[None, :] + 1) % n[:, None], axis=1)
+    w = D[np.arange(B)[:, None], tours, nxt]
+    return np.where(pos[None, :] < n[:, None], w, 0.0).sum(axis=1)
+
+
+def _nearest_neighbor(D: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Nearest-neighbour tours from city 0, built for the whole block in lock-step."""
+    B, N = D.shape[:2]
+    rows = np.arange(B)
+    tours = np.zeros((B, N), dtype=np.int64)
+    visited = np.arange(N)[None, :] >= n[:, None]   # padding counts as visited
+    visited[:, 0] = True
+    cur = np.zeros(B, dtype=np.int64)
+    for s in range(1, N):
+        live = s < n
+        d = np.where(visited, np.inf, D[rows, cur])
+        nxt = np.where(live, d.argmin(axis=1), 0)
+        tours[live, s] = nxt[live]
+        visited[rows[live], nxt[live]] = True
+        cur = np.where(live, nxt, cur)
+    return tours
+
+
+def _reverse(tours: np.ndarray, rows: np.ndarray, i: np.ndarray, k: np.ndarray) -> None:
+    """Reverse positions i..k (inclusive, i < k) of the given rows in place."""
+    pos = np.arange(tours.shape[1])[None, :]
+    inside = (pos >= i[:, None]) & (pos <= k[:, None])
+    src = np.where(inside, i[:, None] + k[:, None] - pos, pos)
+    tours[rows] = np.take_along_axis(tours[rows], src, axis=1)
+
+
+def _two_opt_delta(D, rows, tours, n, i, k):
+    """Length change of reversing positions i..k (i < k) in each row."""
+    a = tours[rows, (i - 1) % n]
+    b = tours[rows, i]
+    c = tours[rows, k]
+    d = tours[rows, (k + 1) % n]
+    return D[rows, a, c] + D[rows, b, d] - D[rows, a, b] - D[rows, c, d]
+
+
+def _stage_count(p: SAParams) -> int:
+    """Temperature stages of the schedule, as in :func:`simulated_annealing_tsp`."""
+    if p.T0 > p.Tmin and p.alpha >= 1.0:
+        raise ValueError("SAParams.alpha must be < 1 for batch solving")
+    stages, T = 0, p.T0
+    while T > p.Tmin:
+        stages += 1
+        T *= p.alpha
+    return stages
+
+
+def _anneal_block(D, n, seeds, p, deadline):
+    B = len(n)
+    tours = _nearest_neighbor(D, n)
+    cost = _tour_costs(D, tours, n)
+    best_tours, best_cost = tours.copy(), cost.copy()
+    L = np.full(B, p.iters_per_temp, dtype=np.int64) if p.iters_per_temp else 20 * n
+    stages = _stage_count(p)
+    total = L * stages
+    rngs = [np.random.default_rng(int(s)) for s in seeds]
+    active = (total > 0) & (n >= 4)
+    step = 0
+    U = None
+    while active.any():
+        if step % _CHUNK == 0:
+            if deadline is not None and time.time() >= deadline:
+                break
+            U = np.stack([g.random((_CHUNK, 3)) for g in rngs], axis=1)
+        u = U[step % _CHUNK]
+        rows = np.flatnonzero(active)
+        nb = n[rows]
+        # Two distinct positions, ordered; reversing the whole tour is not a move.
+        i = (u[rows, 0] * nb).astype(np.int64)
+        k = (u[rows, 1] * (nb - 1)).astype(np.int64)
+        k += k >= i
+        i, k = np.minimum(i, k), np.maximum(i, k)
+        valid = ~((i == 0) & (k == nb - 1))
+        dE = _two_opt_delta(D, rows, tours, nb, i, k)
+        T = p.T0 * p.alpha ** (step // L[rows])
+        with np.errstate(over="ignore"):
+            acc = valid & ((dE <= 0) | (u[rows, 2] < np.exp(-np.maximum(dE, 0.0) / T)))
+        if acc.any():
+            moved = rows[acc]
+            _reverse(tours, moved, i[acc], k[acc])
+            cost[moved] += dE[acc]
+            better = moved[cost[moved] < best_cost[moved]]
+            best_cost[better] = cost[better]
+            best_tours[better] = tours[better]
+        step += 1
+        active &= step < total
+    done_stages = np.minimum(step // np.maximum(L, 1), stages)
+    return best_tours, done_stages
+
+
+def _two_opt_block(D, tours, n, max_pairs: int = 1 << 22) -> None:
+    """Best-improvement 2-opt on every row until none improves (in place)."""
+    N = tours.shape[1]
+    ii, kk = np.triu_indices(N, 1)
+    active = n >= 4
+    per = max(1, max_pairs // max(len(ii), 1))
+    while active.any():
+        idx = np.flatnonzero(active)
+        for c0 in range(0, len(idx), per):
+            rows = idx[c0 : c0 + per]
+            nb = n[rows][:, None]
+            r = rows[:, None]
+            t = tours[rows]
+            I, K = ii[None, :], kk[None, :]
+            a = np.take_along_axis(t, (I - 1) % nb, axis=1)
+            b = t[:, ii]
+            c = t[:, kk]
+            d = np.take_along_axis(t, (K + 1) % nb, axis=1)
+            dE = D[r, a, c] + D[r, b, d] - D[r, a, b] - D[r, c, d]
+            dE[(K >= nb) | ((I == 0) & (K == nb - 1))] = np.inf
+            j = dE.argmin(axis=1)
+            imp = dE[np.arange(len(rows)), j] < -1e-10
+            active[rows[~imp]] = False
+            if imp.any():
+                _reverse(tours, rows[imp], ii[j[imp]], kk[j[imp]])
+
+
+def _solve_block(args) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    D, n, seeds, p, deadline = args
+    tours, stages = _anneal_block(D, n, seeds, p, deadline)
+    if p.polish:
+        _two_opt_block(D, tours, n)
+    return tours, _tour_costs(D, tours, n), stages
+
+
+def solve_batch(
+    instances: Sequence[DistanceMatrix],
+    p: SAParams = SAParams(),
+    bp: BatchParams = BatchParams(),
+) -> List[SAResult]:
+    """Simulated annealing on many (small) instances; one :class:`SAResult` per instance.
+
+    Uses the SA schedule of ``p`` (``T0``, ``alpha``, ``Tmin``, ``iters_per_temp``) with
+    random 2-opt moves from a nearest-neighbour start; ``p.polish`` adds a batched
+    best-improvement 2-opt descent, and ``p.max_seconds`` bounds the whole call.
+    Instance ``i`` is seeded with ``p.seed + i``. Candidate lists, other move types, the adaptive
+    schedule, ``initial_tour`` and other constructions are not supported here.
+    """
+    if any(name != "2opt" for name, w in p.moves if w > 0):
+        raise ValueError("solve_batch supports 2-opt moves only")
+    if p.initial_tour is not None:
+        raise ValueError("solve_batch does not take an initial tour")
+    if p.construction != "nearest":
+        raise ValueError("solve_batch starts from nearest-neighbour tours only")
+    if p.schedule != "geometric":
+        raise ValueError("solve_batch supports the geometric schedule only")
+    mats = [as_distance_array(d, dtype=np.float64) for d in instances]
+    if not mats:
+        return []
+    deadline = time.time() + p.max_seconds if p.max_seconds else None
+
+    # Similar sizes share a block, so little of the padded array is wasted.
+    order = sorted(range(len(mats)), key=lambda b: len(mats[b]))
+    blocks: List[List[int]] = []
+    for b in order:
+        N = len(mats[b])
+        cap = max(1, min(bp.max_batch, bp.max_bytes // max(1, 8 * N * N)))
+        if blocks and len(blocks[-1]) < cap:
+            blocks[-1].append(b)
+        else:
+            blocks.append([b])
+    jobs = []
+    for block in blocks:
+        D, n = _pack([mats[b] for b in block])
+        jobs.append((D, n, np.array([p.seed + b for b in block], dtype=np.int64), p, deadline))
+
+    if bp.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=bp.workers) as pool:
+            outs = list(pool.map(_solve_block, jobs))
+    else:
+        outs = [_solve_block(job) for job in jobs]
+
+    results: List[Optional[SAResult]] = [None] * len(mats)
+    for block, (tours, costs, stages) in zip(blocks, outs):
+        for row, b in enumerate(block):
+            m = len(mats[b])
+            results[b] = SAResult(
+                best_tour=tours[row, :m].tolist(),
+                best_cost=float(costs[row]),
+                meta={"stages": float(stages[row])},
+            )
+    return results
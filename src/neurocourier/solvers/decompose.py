@@ -0,0 +1,243 @@
+"""Partition, solve and stitch: tours for instances far beyond a dense n x n matrix.
+
+Cities are split into spatially compact clusters of about ``cluster_size`` cities (k-means
+restricted to neighbouring centroids, or a uniform grid; oversized clusters are bisected
+at the median). The clusters are visited in the order of a tour over their centroids, and
+consecutive clusters are joined through their closest pair of cities. Every cluster is then
+solved on its own small dense matrix by SA, ACO or LK (optionally in a process pool) as a
+path between its two portal cities, and the paths are concatenated. Finally a
+Lin-Kernighan (or 2-opt) descent on the k-nearest candidate graph, started from the cities
+with a candidate in another cluster, repairs the seams.
+
+Every step works on O(n) data (the global distances come from a :class:`DistanceOracle`
+above ``DENSE_LIMIT`` cities), so time and memory grow roughly linearly with n.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from neurocourier.evaluation.bounds import DENSE_LIMIT
+from neurocourier.tsp.distance import DistanceMatrix, euclidean_distance_array, points_array
+from neurocourier.tsp.neighbors import GridIndex, candidate_lists
+from neurocourier.tsp.oracle import DistanceOracle
+from neurocourier.tsp.tour import tour_length
+from neurocourier.tsp.types import Point, Tour
+from neurocourier.solvers.lk import LKParams, chained_lin_kernighan, lin_kernighan
+from neurocourier.solvers.local_search import TwoOptParams, two_opt
+from neurocourier.solvers.parallel import SolverParams, _solver_for
+
+
+@dataclass(frozen=True)
+class DecomposeParams:
+    cluster_size: int = 200          # target cities per cluster; larger ones are bisected above 2x
+    method: str = "kmeans"           # "kmeans" (seeded by median bisection) or "grid"
+    kmeans_iterations: int = 10
+    workers: int = 1                 # processes solving clusters
+    max_seconds: Optional[float] = None   # budget of the cluster solves, shared out by cluster size
+    repair: str = "lk"               # seam repair from the boundary cities: "lk", "2opt" or "none"
+    repair_neighbors: int = 8        # candidate list size for the repair
+    seed: int = 0
+
+
+@dataclass
+class DecomposeResult:
+    best_tour: Tour
+    best_cost: float
+    clusters: int
+    meta: Dict[str, float]
+
+
+def _bisect(xy: np.ndarray, idx: np.ndarray, cap: int) -> List[np.ndarray]:
+    """Split ``idx`` at the median of its longer axis until every part has at most ``cap`` cities."""
+    parts, out = [idx], []
+    while parts:
+        part = parts.pop()
+        if len(part) <= cap:
+            out.append(part)
+            continue
+        pts = xy[part]
+        axis = int(np.ptp(pts, axis=0).argmax())
+        order = np.argsort(pts[:, axis], kind="stable")
+        half = len(part) // 2
+        parts.extend((part[order[:half]], part[order[half:]]))
+    return out
+
+
+def _labels(parts: Sequence[np.ndarray], n: int) -> np.ndarray:
+    labels = np.empty(n, dtype=np.intp)
+    for c, part in enumerate(parts):
+        labels[part] = c
+    return labels
+
+
+def _kmeans(xy: np.ndarray, labels: np.ndarray, iterations: int, near: int = 8) -> np.ndarray:
+    """Lloyd iterations in which a city may only move to a centroid near its current one."""
+    for _ in range(iterations):
+        _, labels = np.unique(labels, return_inverse=True)
+        k = int(labels.max()) + 1
+        if k < 2:
+            break
+        counts = np.bincount(labels, minlength=k)
+        cent = np.stack(
+            (np.bincount(labels, xy[:, 0], k) / counts, np.bincount(labels, xy[:, 1], k) / counts), axis=1
+        )
+        options = np.concatenate((np.arange(k)[:, None], GridIndex(cent).knn(min(near, k - 1))), axis=1)[labels]
+        d = np.hypot(xy[:, None, 0] - cent[options, 0], xy[:, None, 1] - cent[options, 1])
+        moved = options[np.arange(len(xy)), d.argmin(axis=1)]
+        if (moved == labels).all():
+            break
+        labels = moved
+    return labels
+
+
+def partition(xy: np.ndarray, dp: DecomposeParams) -> List[np.ndarray]:
+    """Spatial clusters of the cities as index arrays, none larger than ``2 * cluster_size``."""
+    n = len(xy)
+    size = max(dp.cluster_size, 1)
+    if dp.method == "kmeans":
+        labels = _labels(_bisect(xy, np.arange(n), size), n)
+        labels = _kmeans(xy, labels, dp.kmeans_iterations)
+    elif dp.method == "grid":
+        lo, span = xy.min(axis=0), np.ptp(xy, axis=0)
+        cell = max(float(np.sqrt(max(float(span[0] * span[1]), 1e-12) * size / n)), float(span.max()) / 4096, 1e-12)
+        g = ((xy - lo) // cell).astype(np.int64)
+        labels = g[:, 0] * (int(g[:, 1].max()) + 1) + g[:, 1]
+    else:
+        raise ValueError(f"unknown partition method: {dp.method!r}")
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    parts: List[np.ndarray] = []
+    for part in np.split(order, bounds):
+        parts.extend(_bisect(xy, part, 2 * size))
+    return parts
+
+
+def _cluster_order(cent: np.ndarray, seed: int) -> List[int]:
+    k = len(cent)
+    if k <= 3:
+        return list(range(k))
+    dist = euclidean_distance_array(cent) if k <= DENSE_LIMIT else DistanceOracle(cent)
+    return chained_lin_kernighan(dist, LKParams(seed=seed)).best_tour
+
+
+def _portals(xy: np.ndarray, parts: Sequence[np.ndarray], order: Sequence[int]) -> Tuple[List[int], List[int]]:
+    """Entry and exit city of every cluster: the closest pair between consecutive clusters.
+
+    A cluster of two or more cities never enters and leaves through the same city.
+    """
+    k = len(parts)
+    entry, exit_ = [-1] * k, [-1] * k
+    for at, a in enumerate(order):
+        b = order[(at + 1) % k]
+        A, B = parts[a], parts[b]
+        d = np.hypot(xy[A, None, 0] - xy[None, B, 0], xy[A, None, 1] - xy[None, B, 1])
+        if len(A) > 1:
+            d[A == entry[a], :] = np.inf
+        if len(B) > 1:
+            d[:, B == exit_[b]] = np.inf
+        i, j = np.unravel_index(int(d.argmin()), d.shape)
+        exit_[a], entry[b] = int(A[i]), int(B[j])
+    return entry, exit_
+
+
+def _solve_cluster(args: Tuple[np.ndarray, int, int, SolverParams]) -> List[int]:
+    """Path through one cluster from city ``s`` to city ``e`` (positions into its points).
+
+    The solver sees the edge (s, e) with length 0, so its tour almost always contains it
+    and cutting it there leaves the shortest path it found; otherwise the tour is opened
+    just before ``s`` and the path ends wherever that leads.
+    """
+    pts, s, e, p = args
+    m = len(pts)
+    if m <= 3:
+        return [s] + [c for c in range(m) if c not in (s, e)] + ([e] if e != s else [])
+    d = euclidean_distance_array(pts)
+    d[s, e] = d[e, s] = 0.0
+    cyc = list(_solver_for(p)(d, p).best_tour)
+    i = cyc.index(s)
+    if cyc[(i + 1) % m] == e:
+        cyc.reverse()
+        i = m - 1 - i
+    return cyc[i:] + cyc[:i]
+
+
+def _lap(meta: Dict[str, float], name: str, since: float) -> float:
+    now = time.perf_counter()
+    meta[f"time.{name}"] = now - since
+    return now
+
+
+def solve_decomposed(
+    points: Union[Sequence[Point], np.ndarray, DistanceOracle],
+    p: SolverParams = LKParams(),
+    dp: DecomposeParams = DecomposeParams(),
+) -> DecomposeResult:
+    """Tour of a large Euclidean instance by spatial decomposition (see module docstring).
+
+    ``points`` are coordinates (or an oracle over them). ``p`` selects the cluster solver
+    (SA, ACO or LK params; chained LK by default, the fastest per cluster); cluster ``c``
+    is solved with seed ``p.seed + c``. With
+    ``dp.max_seconds`` every cluster gets a share of the budget proportional to its size
+    (times ``dp.workers``) as its ``max_seconds``.
+    """
+    if dp.repair not in ("lk", "2opt", "none"):
+        raise ValueError(f"unknown seam repair: {dp.repair!r}")
+    xy = points.points if isinstance(points, DistanceOracle) else points_array(points)
+    n = len(xy)
+    meta: Dict[str, float] = {}
+    t = time.perf_counter()
+    if n <= 3:
+        tour = list(range(n))
+        return DecomposeResult(best_tour=tour, best_cost=tour_length(tour, euclidean_distance_array(xy)), clusters=1, meta=meta)
+
+    parts = partition(xy, dp)
+    t = _lap(meta, "partition", t)
+
+    cent = np.stack([xy[part].mean(axis=0) for part in parts])
+    order = _cluster_order(cent, dp.seed)
+    if len(parts) > 1:
+        entry, exit_ = _portals(xy, parts, order)
+    else:
+        entry, exit_ = [int(parts[0][0])], [int(parts[0][-1])]
+    t = _lap(meta, "order", t)
+
+    tasks = []
+    for c, part in enumerate(parts):
+        q = replace(p, seed=p.seed + c)
+        if dp.max_seconds:
+            q = replace(q, max_seconds=dp.max_seconds * max(dp.workers, 1) * len(part) / n)
+        index = {city: at for at, city in enumerate(part.tolist())}
+        tasks.append((xy[part], index[entry[c]], index[exit_[c]], q))
+    if dp.workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=dp.workers) as pool:
+            local = list(pool.map(_solve_cluster, tasks, chunksize=max(1, len(tasks) // (4 * dp.workers))))
+    else:
+        local = [_solve_cluster(task) for task in tasks]
+    t = _lap(meta, "solve", t)
+
+    tour = np.concatenate([parts[c][np.asarray(local[c], dtype=np.intp)] for c in order]).tolist()
+    # The repair reads each oracle row only a few times, so rows are never admitted into
+    # the cache (materializing O(n) rows would dominate its run time).
+    dist: DistanceMatrix = euclidean_distance_array(xy) if n <= DENSE_LIMIT else DistanceOracle(xy, admit_after=1 << 62)
+    cost = tour_length(tour, dist)
+    meta["stitched_cost"] = cost
+    t = _lap(meta, "stitch", t)
+
+    if dp.repair != "none" and len(parts) > 1:
+        # Boundary cities: a candidate neighbour lies in another cluster.
+        cand = candidate_lists(dist, dp.repair_neighbors)
+        labels = _labels(parts, n)
+        boundary = np.flatnonzero((labels[cand] != labels[:, None]).any(axis=1)).tolist()
+        if dp.repair == "lk":
+            res = lin_kernighan(dist, tour, LKParams(neighbors=dp.repair_neighbors), cand=cand.tolist(), active=boundary)
+        else:
+            res = two_opt(dist, tour, TwoOptParams(neighbors=dp.repair_neighbors), cand=cand.tolist(), active=boundary)
+        tour, cost = res.best_tour, res.best_cost
+        meta["boundary"] = float(len(boundary))
+        _lap(meta, "repair", t)
+    return DecomposeResult(best_tour=tour, best_cost=cost, clusters=len(parts), meta=meta)
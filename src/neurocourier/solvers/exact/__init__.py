@@ -0,0 +1,5 @@
+from .result import ExactResult
+from .held_karp import held_karp, HeldKarpParams
+from .branch_bound import branch_and_bound, BranchBoundParams
+
+__all__ = ["ExactResult", "held_karp", "HeldKarpParams", "branch_and_bound", "BranchBoundParams"]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from neurocourier.tsp.distance import DistanceMatrix, as_distance_array
+from neurocourier.tsp.tour import tour_length
+from neurocourier.evaluation.bounds import held_karp_bound, prim_mst
+from neurocourier.solvers.lk import LKParams, chained_lin_kernighan
+from neurocourier.solvers.local_search import solve_2opt
+
+from .result import ExactResult
+
+
+@dataclass(frozen=True)
+class BranchBoundParams:
+    max_seconds: Optional[float] = None
+    ascent_iterations: int = 100     # subgradient steps for the root 1-tree bound
+    upper_bound_kicks: int = 0       # LK kicks for the initial tour; if 0 -> 10 * n
+    seed: int = 0
+
+
+class _Search:
+    """Depth-first search over tours starting at city 0, on penalised distances."""
+
+    def __init__(self, d: np.ndarray, pi: np.ndarray, tour: List[int], cost: float, deadline: Optional[float]):
+        self.n = len(d)
+        self.d = d
+        self.dp = d + pi[:, None] + pi[None, :]   # every tour costs 2 * sum(pi) more here
+        self.shift = 2.0 * float(pi.sum())
+        self.best_tour = tour
+        self.best = cost
+        self.eps = 1e-9 * max(abs(cost), 1.0)
+        self.deadline = deadline
+        self.nodes = 0
+        self.timed_out = False
+
+    def bound(self, last: int, rest: np.ndarray) -> float:
+        dp = self.dp
+        return prim_mst(dp, rest)[0] + dp[last, rest].min() + dp[rest, 0].min()
+
+    def run(self) -> None:
+        self._visit([0], np.arange(1, self.n), 0.0)
+
+    def _visit(self, path: List[int], rest: np.ndarray, length: float) -> None:
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % 256 == 0 and time.time() >= self.deadline:
+            self.timed_out = True
+        if self.timed_out:
+            return
+        last = path[-1]
+        dp = self.dp
+        if len(rest) == 0:
+            total = length + dp[last, 0] - self.shift
+            if total < self.best - self.eps:
+                self.best, self.best_tour = float(total), list(path)
+            return
+        # Nearest children first: good tours are found early and prune more.
+        for c in rest[np.argsort(dp[last, rest])].tolist():
+            step = length + dp[last, c]
+            left = rest[rest != c]
+            lb = step + (self.bound(c, left) if len(left) else dp[c, 0]) - self.shift
+            if lb >= self.best - self.eps:
+                continue
+            path.append(c)
+            self._visit(path, left, step)
+            path.pop()
+
+
+def branch_and_bound(dist: DistanceMatrix, p: BranchBoundParams = BranchBoundParams()) -> ExactResult:
+    """Exact TSP by depth-first branch and bound.
+
+    The incumbent starts from chained LK (2-opt for n < 8). Distances are then penalised
+    with the node potentials of a Held-Karp 1-tree subgradient ascent, which leaves the
+    optimal tour unchanged but tightens every bound. A partial path from city 0 is
+    pruned when its length plus the MST of the unvisited cities and the cheapest edges
+    joining them to both path ends cannot beat the incumbent. If ``max_seconds`` runs out,
+    the incumbent is returned with ``optimal=False`` and the root bound.
+    """
+    t0 = time.time()
+    d = as_distance_array(dist, dtype=np.float64)
+    n = len(d)
+    if n <= 3:
+        tour = list(range(n))
+        cost = tour_length(tour, d)
+        return ExactResult(best_tour=tour, best_cost=cost, optimal=True, lower_bound=cost)
+    deadline = t0 + p.max_seconds if p.max_seconds else None
+
+    if n >= 8:
+        kicks = p.upper_bound_kicks or 10 * n
+        ub = chained_lin_kernighan(d, LKParams(seed=p.seed, kicks=kicks, max_seconds=p.max_seconds))
+    else:
+        ub = solve_2opt(d)
+    tour, cost = list(ub.best_tour), float(ub.best_cost)
+
+    root = held_karp_bound(d, upper=cost, iterations=p.ascent_iterations)
+    lower = min(root.value, cost)
+    search = _Search(d, root.pi, tour, cost, deadline)
+    if cost - root.value > search.eps:
+        search.run()
+    if search.timed_out:
+        return ExactResult(best_tour=search.best_tour, best_cost=tour_length(search.best_tour, d), optimal=False, lower_bound=lower)
+    best = tour_length(search.best_tour, d)
+    return ExactResult(best_tour=search.best_tour, best_cost=best, optimal=True, lower_bound=best)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from neurocourier.tsp.types import Tour
+
+
+@dataclass
+class ExactResult:
+    best_tour: Tour
+    best_cost: float
+    optimal: bool                    # False if the time budget ran out first
+    lower_bound: float               # proven bound; equals best_cost when optimal
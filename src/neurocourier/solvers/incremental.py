@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from neurocourier.tsp.distance import DistanceMatrix, euclidean_distance_array, patch_distance_array
+from neurocourier.tsp.oracle import DistanceOracle
+from neurocourier.tsp.tour import tour_length
+from neurocourier.tsp.types import Point, Tour
+from neurocourier.solvers.local_search import TwoOptParams, two_opt
+from neurocourier.solvers.sa import SAParams, simulated_annealing_tsp
+
+
+@dataclass(frozen=True)
+class IncrementalParams:
+    method: str = "2opt"             # "2opt" from the changed cities, or "sa" warm-started from the patched tour
+    neighbors: int = 10              # candidate list size for 2-opt / SA moves
+    max_seconds: Optional[float] = None
+    # "sa": start temperature as a fraction of the mean edge length, and the number of
+    # temperature stages (cooling to 1/1000 of the start)
+    temperature: float = 0.05
+    stages: int = 10
+    seed: int = 0
+
+
+@dataclass
+class IncrementalResult:
+    points: List[Point]              # kept points (in their old order) followed by the inserted ones
+    best_tour: Tour
+    best_cost: float
+    dist: DistanceMatrix             # distances of ``points``; pass back in on the next update
+    index_map: List[int]             # old index -> new index, -1 for deleted points
+
+
+def _row(dist: DistanceMatrix, c: int) -> np.ndarray:
+    return dist.row(c) if isinstance(dist, DistanceOracle) else np.asarray(dist[c], dtype=np.float64)
+
+
+def _edge_lengths(dist: DistanceMatrix, us: np.ndarray, vs: np.ndarray) -> np.ndarray:
+    if isinstance(dist, np.ndarray):
+        return dist[us, vs].astype(np.float64)
+    if isinstance(dist, DistanceOracle):
+        return dist.pair_distances(us, vs)
+    return np.array([dist[a][b] for a, b in zip(us.tolist(), vs.tolist())], dtype=np.float64)
+
+
+def cheapest_insertion(dist: DistanceMatrix, tour: Tour, cities: Sequence[int]) -> Tour:
+    """Insert ``cities`` one by one where they lengthen the tour least (O(n) each)."""
+    tour = list(tour)
+    for c in cities:
+        if len(tour) < 2:
+            tour.append(c)
+            continue
+        t = np.asarray(tour, dtype=np.intp)
+        nxt = np.roll(t, -1)
+        row = _row(dist, c)
+        i = int((row[t] + row[nxt] - _edge_lengths(dist, t, nxt)).argmin())
+        tour.insert(i + 1, c)
+    return tour
+
+
+def reoptimize(
+    points: Sequence[Point],
+    tour: Tour,
+    inserted: Sequence[Point] = (),
+    deleted: Sequence[int] = (),
+    dist: Optional[DistanceMatrix] = None,
+    p: IncrementalParams = IncrementalParams(),
+) -> IncrementalResult:
+    """Update a solved route after stops were added and/or removed.
+
+    ``tour`` visits ``points``; ``deleted`` are indices into ``points``. The distance data
+    is patched instead of rebuilt: for a dense ``dist`` kept pairs are copied and only
+    rows of the inserted points are computed; an oracle is simply re-created over the new
+    points. Deleted stops are cut out of the tour, new ones are placed by cheapest
+    insertion, then the tour is repaired by 2-opt started from the changed cities only
+    (``method="2opt"``) or by a short low-temperature SA run from the patched tour.
+    """
+    if p.method not in ("2opt", "sa"):
+        raise ValueError(f"unknown re-optimization method: {p.method!r}")
+    n = len(points)
+    gone = np.zeros(n, dtype=bool)
+    gone[np.asarray(deleted, dtype=np.intp)] = True
+    keep = np.flatnonzero(~gone)
+    index_map = np.full(n, -1, dtype=np.intp)
+    index_map[keep] = np.arange(len(keep))
+    new_points = [tuple(map(float, q)) for q in inserted]
+    all_points = [tuple(points[i]) for i in keep.tolist()] + new_points
+
+    if isinstance(dist, DistanceOracle):
+        max_bytes = dist.max_rows * len(dist) * dist.dtype.itemsize
+        dist = DistanceOracle(all_points, max_bytes=max_bytes, dtype=dist.dtype, admit_after=dist.admit_after)
+    elif dist is not None:
+        dist = patch_distance_array(dist, points, keep, new_points)
+    else:
+        dist = euclidean_distance_array(all_points)
+
+    # Tour neighbours of deleted stops get a new edge; they seed the local search.
+    touched = set()
+    m = len(tour)
+    for idx, c in enumerate(tour):
+        if gone[c]:
+            for nb in (tour[idx - 1], tour[(idx + 1) % m]):
+                if not gone[nb]:
+                    touched.add(int(index_map[nb]))
+    patched = [int(index_map[c]) for c in tour if not gone[c]]
+    fresh = list(range(len(keep), len(all_points)))
+    patched = cheapest_insertion(dist, patched, fresh)
+    touched.update(fresh)
+
+    if len(patched) < 4:
+        return IncrementalResult(all_points, patched, tour_length(patched, dist), dist, index_map.tolist())
+
+    if p.method == "2opt":
+        # Inserted cities and their new tour neighbours.
+        pos = {c: i for i, c in enumerate(patched)}
+        for c in fresh:
+            i = pos[c]
+            touched.update((patched[i - 1], patched[(i + 1) % len(patched)]))
+        ls = two_opt(dist, patched, TwoOptParams(neighbors=p.neighbors, max_seconds=p.max_seconds), active=sorted(touched))
+        best_tour, best_cost = ls.best_tour, ls.best_cost
+    else:
+        cost = tour_length(patched, dist)
+        T0 = p.temperature * cost / len(patched)
+        sa = SAParams(
+            seed=p.seed,
+            T0=T0,
+            Tmin=T0 * 1e-3,
+            alpha=1e-3 ** (1.0 / max(p.stages, 1)),
+            max_seconds=p.max_seconds,
+            neighbors=p.neighbors,
+            polish=True,
+            moves=(("2opt", 1.0), ("oropt", 1.0)),
+            initial_tour=tuple(patched),
+        )
+        res = simulated_annealing_tsp(dist, sa)
+        best_tour, best_cost = res.best_tour, res.best_cost
+
+    return IncrementalResult(all_points, best_tour, best_cost, dist, index_map.tolist())
@@ -0,0 +1,3 @@
+from .lk_solver import chained_lin_kernighan, lin_kernighan, LKParams, LKResult
+
+__all__ = ["chained_lin_kernighan", "lin_kernighan", "LKParams", "LKResult"]
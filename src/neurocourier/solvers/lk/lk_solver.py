@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from neurocourier.tsp.construct import construct
+from neurocourier.tsp.distance import DistanceMatrix, row_view
+from neurocourier.tsp.moves import apply_or3opt
+from neurocourier.tsp.neighbors import candidate_rows
+from neurocourier.tsp.tour import reverse_segment, tour_length
+from neurocourier.tsp.types import Tour
+from neurocourier.solvers.local_search import TwoOptParams, two_opt
+
+
+@dataclass(frozen=True)
+class LKParams:
+    seed: int = 0
+    max_seconds: Optional[float] = None
+    kicks: int = 0                   # if 0 -> n kicks, or unlimited when max_seconds is set
+    neighbors: int = 8               # candidate list size for t3 choices
+    max_depth: int = 6               # 2-opt steps per LK move
+    breadth: int = 5                 # alternatives tried for the first step
+    kick_span: int = 50              # double-bridge cut points lie within this many positions (>= 2)
+    initial_tour: Optional[Tuple[int, ...]] = None   # if None -> built by `construction`
+    construction: str = "nearest"    # start tour heuristic (neurocourier.tsp.construct)
+
+
+@dataclass
+class LKResult:
+    best_tour: Tour
+    best_cost: float
+
+
+class _LK:
+    """Array tour with a position index plus the LK move and an undo log."""
+
+    def __init__(self, tour: Tour, d: DistanceMatrix, cand: List[List[int]], p: LKParams):
+        self.n = len(tour)
+        self.tour = list(tour)
+        self.pos = [0] * self.n
+        for idx, c in enumerate(self.tour):
+            self.pos[c] = idx
+        self.d = d
+        self.cand = cand
+        self.p = p
+        self.log: List[Tuple[int, ...]] = []
+
+    def _reverse(self, i: int, j: int) -> None:
+        reverse_segment(self.tour, self.pos, i, j)
+        self.log.append((i, j))
+
+    def undo(self, mark: int) -> None:
+        """Roll the tour back to the state when ``len(self.log)`` was ``mark``."""
+        tour, pos, log = self.tour, self.pos, self.log
+        while len(log) > mark:
+            op = log.pop()
+            if len(op) == 2:
+                reverse_segment(tour, pos, op[0], op[1])
+            else:
+                i, j, k = op
+                for idx in apply_or3opt(tour, i, i + k - j, k):
+                    pos[tour[idx]] = idx
+
+    def _step(self, t1: int, fwd: bool, t2: int, t3: int) -> Tuple[int, bool]:
+        """2-opt replacing (t1, t2), (t4, t3) by (t2, t3), (t4, t1); returns (t4, new fwd)."""
+        n, tour, pos = self.n, self.tour, self.pos
+        t4 = tour[pos[t3] - 1] if fwd else tour[pos[t3] + 1 - n]
+        if fwd:
+            self._reverse(pos[t2], pos[t4])
+        else:
+            self._reverse(pos[t4], pos[t2])
+        # Reversing the shorter side may flip the array orientation relative to t1.
+        return t4, tour[pos[t1] + 1 - n] == t4
+
+    def improve_from(self, t1: int) -> Optional[Tuple[float, List[int]]]:
+        """Best LK move starting at t1; applied if improving, returns (gain, touched)."""
+        n, tour, pos, d, cand = self.n, self.tour, self.pos, self.d, self.cand
+        for fwd0 in (True, False):
+            t2_first = tour[pos[t1] + 1 - n] if fwd0 else tour[pos[t1] - 1]
+            g0 = d[t1][t2_first]
+            alternatives = 0
+            for t3_first in cand[t2_first]:
+                if alternatives >= self.p.breadth:
+                    break
+                if g0 - d[t2_first][t3_first] <= 0:
+                    break
+                if not self._valid_t3(t1, fwd0, t2_first, t3_first):
+                    continue
+                alternatives += 1
+                mark = len(self.log)
+                fwd, t2, t3, g = fwd0, t2_first, t3_first, g0
+                added = set()
+                touched = [t1, t2]
+                best_gain, best_mark = 1e-10, mark
+                for depth in range(self.p.max_depth):
+                    g1 = g - d[t2][t3]
+                    t4, fwd = self._step(t1, fwd, t2, t3)
+                    added.add((t2, t3) if t2 < t3 else (t3, t2))
+                    touched += (t3, t4)
+                    g = g1 + d[t3][t4]
+                    closed = g - d[t4][t1]
+                    if closed > best_gain:
+                        best_gain, best_mark = closed, len(self.log)
+                    if depth + 1 == self.p.max_depth:
+                        break
+                    # Next step: greedy choice maximizing g1 + |t3 t4| for the new t2 = t4.
+                    t2 = t4
+                    nxt, nxt_score = -1, 0.0
+                    for c in cand[t2]:
+                        gc = g - d[t2][c]
+                        if gc <= 0:
+                            break
+                        if not self._valid_t3(t1, fwd, t2, c):
+                            continue
+                        c4 = tour[pos[c] - 1] if fwd else tour[pos[c] + 1 - n]
+                        if ((c, c4) if c < c4 else (c4, c)) in added:
+                            continue
+                        score = gc + d[c][c4]
+                        if score > nxt_score:
+                            nxt, nxt_score = c, score
+                    if nxt < 0:
+                        break
+                    t3 = nxt
+                self.undo(best_mark)
+                if best_mark > mark:
+                    return best_gain, touched
+        return None
+
+    def _valid_t3(self, t1: int, fwd: bool, t2: int, t3: int) -> bool:
+        if t3 == t1 or t3 == t2:
+            return False
+        n, tour, pos = self.n, self.tour, self.pos
+        # t4 = pred(t3) must differ from t2, i.e. t3 is not the successor of t2.
+        return (tour[pos[t2] + 1 - n] if fwd else tour[pos[t2] - 1]) != t3
+
+    def optimize(self, active: Iterable[int], deadline: Optional[float]) -> float:
+        """LK local search over a don't-look-bit queue; returns the total gain."""
+        queue = deque(active)
+        queued = [False] * self.n
+        for a in queue:
+            queued[a] = True
+        total = 0.0
+        steps = 0
+        while queue:
+            steps += 1
+            if deadline is not None and steps & 127 == 0 and time.time() >= deadline:
+                break
+            a = queue.popleft()
+            queued[a] = False
+            res = self.improve_from(a)
+            if res is None:
+                continue
+            gain, touched = res
+            total += gain
+            for x in touched:
+                if not queued[x]:
+                    queued[x] = True
+                    queue.append(x)
+        return total
+
+    def double_bridge(self, rng: random.Random) -> Tuple[float, List[int]]:
+        """Segment-local double bridge (exchange of two adjacent segments)."""
+        n, tour, pos, d = self.n, self.tour, self.pos, self.d
+        span = max(2, min(self.p.kick_span, n - 1))   # two cut points after i at least
+        i = rng.randrange(n - 3)
+        hi = min(i + span, n - 1)
+        j, k = sorted(rng.sample(range(i + 1, hi + 1), 2))
+        a, b, c, e, f = tour[i], tour[i + 1], tour[j], tour[j + 1], tour[k]
+        g = tour[0] if k == n - 1 else tour[k + 1]
+        delta = (d[a][e] + d[f][b] + d[c][g]) - (d[a][b] + d[c][e] + d[f][g])
+        for idx in apply_or3opt(tour, i, j, k):
+            pos[tour[idx]] = idx
+        self.log.append((i, j, k))
+        return delta, [a, b, c, e, f, g]
+
+
+def chained_lin_kernighan(dist: DistanceMatrix, p: LKParams) -> LKResult:
+    """Chained Lin-Kernighan: depth-limited LK moves plus double-bridge kicks.
+
+    An LK move keeps t1 fixed and chains up to ``max_depth`` sequential 2-opt steps,
+    each adding an edge from the current t2 to a candidate neighbour while the
+    partial gain stays positive; the best closing point of the chain is kept. After
+    the tour is LK-optimal, local double-bridge kicks are applied and re-optimized
+    from their endpoints only; a kick that does not improve the tour is undone.
+    """
+    best_tour: Tour = []
+    for _, best_tour, _ in kick_iterations(dist, p):
+        pass
+    return LKResult(best_tour=best_tour, best_cost=tour_length(best_tour, dist))
+
+
+def kick_iterations(
+    dist: DistanceMatrix,
+    p: LKParams,
+    stop: Optional[Callable[[], bool]] = None,
+    deadline: Optional[float] = None,
+) -> Iterator[Tuple[int, Tour, float]]:
+    """Chained LK as a generator of ``(kicks done, best tour, best cost)``.
+
+    Yields once the start tour is LK-optimal, after every improving kick and once more
+    at the end if kicks followed the last improvement. The tour
+    is the solver's working list (it changes with the next kick; copy it to keep it)
+    and the cost is tracked incrementally. ``stop`` is polled between kicks; ``deadline``
+    (a ``time.time()`` value, e.g. the caller's own budget) also bounds the LK descents
+    and, like ``p.max_seconds``, makes the kicks unlimited when ``p.kicks`` is 0.
+    """
+    n = len(dist)
+    tour = construct(dist, p.construction) if p.initial_tour is None else list(p.initial_tour)
+    if n < 8:
+        ls = two_opt(dist, tour, TwoOptParams(neighbors=0))
+        yield 0, ls.best_tour, ls.best_cost
+        return
+
+    rng = random.Random(p.seed)
+    cand = candidate_rows(dist, p.neighbors)
+    if p.max_seconds:
+        own = time.time() + p.max_seconds
+        deadline = own if deadline is None else min(deadline, own)
+    lk = _LK(tour, row_view(dist), cand, p)
+
+    lk.optimize(lk.tour, deadline)
+    lk.log.clear()
+    best = tour_length(lk.tour, dist)
+    yield 0, lk.tour, best
+
+    kicks = p.kicks or (None if deadline is not None else n)
+    done = 0
+    while kicks is None or done < kicks:
+        if stop is not None and stop():
+            break
+        if deadline is not None and time.time() >= deadline:
+            break
+        done += 1
+        delta, ends = lk.double_bridge(rng)
+        gain = lk.optimize(ends, deadline)
+        improved_last = False
+        if delta - gain < -1e-9:
+            best += delta - gain
+            lk.log.clear()
+            improved_last = True
+            yield done, lk.tour, best
+        else:
+            lk.undo(0)
+            lk.log.clear()
+    if done and not improved_last:
+        yield done, lk.tour, best
+
+
+def lin_kernighan(
+    dist: DistanceMatrix,
+    tour: Tour,
+    p: LKParams = LKParams(),
+    cand: Optional[List[List[int]]] = None,
+    active: Optional[Iterable[int]] = None,
+) -> LKResult:
+    """One LK descent from ``tour``, without kicks (the LK counterpart of ``two_opt``).
+
+    ``active`` restricts the initial don't-look-bit queue, e.g. to the cities around the
+    seams of a stitched tour; ``p.max_seconds`` bounds the descent.
+    """
+    if len(tour) < 8:
+        ls = two_opt(dist, tour, TwoOptParams(neighbors=0))
+        return LKResult(best_tour=ls.best_tour, best_cost=ls.best_cost)
+    if cand is None:
+        cand = candidate_rows(dist, p.neighbors)
+    deadline = time.time() + p.max_seconds if p.max_seconds else None
+    lk = _LK(tour, row_view(dist), cand, p)
+    lk.optimize(lk.tour if active is None else active, deadline)
+    return LKResult(best_tour=lk.tour, best_cost=tour_length(lk.tour, dist))
@@ -0,0 +1,3 @@
+from .two_opt import LocalSearchResult, TwoOptParams, solve_2opt, solve_greedy_2opt, two_opt
+
+__all__ = ["LocalSearchResult", "TwoOptParams", "solve_2opt", "solve_greedy_2opt", "two_opt"]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from neurocourier.tsp.distance import DistanceMatrix, row_view
+from neurocourier.tsp.construct import construct
+from neurocourier.tsp.neighbors import candidate_rows
+from neurocourier.tsp.tour import reverse_segment, tour_length
+from neurocourier.tsp.types import Tour
+
+
+@dataclass(frozen=True)
+class TwoOptParams:
+    neighbors: int = 10              # candidate list size; if 0 -> every city
+    mode: str = "first"              # "first" or "best" improvement per city
+    max_seconds: Optional[float] = None
+    construction: str = "nearest"    # start tour of solve_2opt (neurocourier.tsp.construct)
+
+
+@dataclass
+class LocalSearchResult:
+    best_tour: Tour
+    best_cost: float
+    moves: int = 0
+
+
+def two_opt(
+    dist: DistanceMatrix,
+    tour: Tour,
+    p: TwoOptParams = TwoOptParams(),
+    cand: Optional[List[List[int]]] = None,
+    active: Optional[Iterable[int]] = None,
+) -> LocalSearchResult:
+    """2-opt local search with neighbour lists and don't-look bits.
+
+    Moves are evaluated in O(1) from the four edge lengths involved. For a city ``a``
+    only candidates ``c`` closer than its current tour neighbour are tried (the new
+    edge (a, c) must be shorter than the removed one), in both tour directions.
+    Cities whose neighbourhood yields no improvement are switched off until an
+    applied move touches them again. ``active`` restricts the initial work queue,
+    e.g. to the endpoints of a perturbation.
+    """
+    if p.mode not in ("first", "best"):
+        raise ValueError(f"unknown improvement mode: {p.mode!r}")
+    n = len(tour)
+    tour = list(tour)
+    if n < 4:
+        return LocalSearchResult(best_tour=tour, best_cost=tour_length(tour, dist))
+    if cand is None:
+        cand = candidate_rows(dist, p.neighbors or n - 1)
+    d = row_view(dist)
+    pos = [0] * n
+    for idx, c in enumerate(tour):
+        pos[c] = idx
+
+    queue = deque(tour if active is None else active)
+    queued = [False] * n
+    for a in queue:
+        queued[a] = True
+    best_only = p.mode == "best"
+    deadline = time.time() + p.max_seconds if p.max_seconds else None
+    moves = 0
+    steps = 0
+
+    while queue:
+        steps += 1
+        if deadline is not None and steps & 255 == 0 and time.time() >= deadline:
+            break
+        a = queue.popleft()
+        queued[a] = False
+        da = d[a]
+        i = pos[a]
+        best_delta = -1e-10
+        best_move = None
+        for succ in (True, False):
+            b = tour[i + 1 - n] if succ else tour[i - 1]
+            d_ab = da[b]
+            for c in cand[a]:
+                d_ac = da[c]
+                if d_ac >= d_ab:
+                    break
+                k = pos[c]
+                e = tour[k + 1 - n] if succ else tour[k - 1]
+                if e == a or c == b:
+                    continue
+                delta = d_ac + d[b][e] - d_ab - d[c][e]
+                if delta < best_delta:
+                    best_delta = delta
+                    best_move = (succ, b, c, e)
+                    if not best_only:
+                        break
+            if best_move is not None and not best_only:
+                break
+        if best_move is None:
+            continue
+
+        succ, b, c, e = best_move
+        # succ: remove (a, b), (c, e), add (a, c), (b, e) -> reverse b..c
+        # pred: remove (b, a), (e, c), add (c, a), (e, b) -> reverse a..e
+        if succ:
+            reverse_segment(tour, pos, pos[b], pos[c])
+        else:
+            reverse_segment(tour, pos, pos[a], pos[e])
+        moves += 1
+        for x in (a, b, c, e):
+            if not queued[x]:
+                queued[x] = True
+                queue.append(x)
+
+    return LocalSearchResult(best_tour=tour, best_cost=tour_length(tour, dist), moves=moves)
+
+
+def solve_2opt(dist: DistanceMatrix, p: TwoOptParams = TwoOptParams()) -> LocalSearchResult:
+    """Construction heuristic ``p.construction`` followed by :func:`two_opt`."""
+    return two_opt(dist, construct(dist, p.construction), p)
+
+
+def solve_greedy_2opt(dist_matrix: DistanceMatrix) -> Tour:
+    """Greedy (nearest neighbour) start improved by 2-opt until no improving move is left."""
+    return solve_2opt(dist_matrix).best_tour
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from neurocourier.tsp.distance import DistanceMatrix, as_distance_array
+from neurocourier.tsp.oracle import DistanceOracle
+from neurocourier.tsp.shared import SharedArray
+from neurocourier.tsp.types import Tour
+from neurocourier.solvers.aco import ACOParams, ant_colony_optimize
+from neurocourier.solvers.lk import LKParams, chained_lin_kernighan
+from neurocourier.solvers.sa import SAParams, simulated_annealing_tsp
+
+SolverParams = Union[SAParams, ACOParams, LKParams]
+
+
+@dataclass(frozen=True)
+class ParallelParams:
+    workers: int = 0                 # worker processes; if 0 -> os.cpu_count()
+    runs: int = 0                    # independent runs (islands); if 0 -> workers
+    epochs: int = 0                  # if > 1 -> island model, migrating best tours between epochs
+
+
+@dataclass
+class WorkerStats:
+    run: int
+    seed: int                        # seed of the run's first epoch
+    best_cost: float
+    seconds: float
+    pid: int
+    migrations: int = 0              # epochs that started from a neighbour's tour
+
+
+@dataclass
+class ParallelResult:
+    best_tour: Tour
+    best_cost: float
+    best_run: int
+    runs: List[WorkerStats]
+
+
+def _solver_for(p: SolverParams) -> Callable[[DistanceMatrix, Any], Any]:
+    if isinstance(p, SAParams):
+        return simulated_annealing_tsp
+    if isinstance(p, ACOParams):
+        return ant_colony_optimize
+    if isinstance(p, LKParams):
+        return chained_lin_kernighan
+    raise TypeError(f"no solver for parameters of type {type(p).__name__}")
+
+
+# Distance data of a worker process, set once by the pool initializer.
+_DIST: Optional[DistanceMatrix] = None
+_SHARED: Optional[SharedArray] = None
+
+
+def _share(dist: DistanceMatrix) -> Tuple[SharedArray, tuple]:
+    """Shared-memory copy of the distance data plus the recipe to rebuild it in a worker."""
+    if isinstance(dist, DistanceOracle):
+        # An oracle is rebuilt from its points; each worker keeps its own row cache.
+        shared = SharedArray.copy_of(dist.points)
+        max_bytes = dist.max_rows * len(dist) * dist.dtype.itemsize
+        return shared, ("oracle", shared.spec, max_bytes, dist.dtype.str, dist.admit_after)
+    shared = SharedArray.copy_of(as_distance_array(dist))
+    return shared, ("array", shared.spec)
+
+
+def _attach(recipe: tuple) -> None:
+    global _DIST, _SHARED
+    _SHARED = SharedArray.attach(recipe[1])
+    if recipe[0] == "oracle":
+        _, _, max_bytes, dtype, admit_after = recipe
+        _DIST = DistanceOracle(_SHARED.array, max_bytes=max_bytes, dtype=dtype, admit_after=admit_after)
+    else:
+        _DIST = _SHARED.array
+
+
+def _run(p: SolverParams) -> Tuple[Tour, float, float, int]:
+    t0 = time.time()
+    res = _solver_for(p)(_DIST, p)
+    return list(res.best_tour), float(res.best_cost), time.time() - t0, os.getpid()
+
+
+def _epoch_params(p: SolverParams, epochs: int, e: int, n: int) -> SolverParams:
+    """Slice ``e`` of ``epochs`` of the run described by ``p``."""
+    seconds = p.max_seconds / epochs if p.max_seconds else p.max_seconds
+    if isinstance(p, SAParams):
+        # Split the cooling schedule into epochs of whole temperature stages.
+        stages = max(1, math.ceil(math.log(p.Tmin / p.T0) / math.log(p.alpha))) if p.T0 > p.Tmin else 1
+        s0, s1 = e * stages // epochs, (e + 1) * stages // epochs
+        T0 = p.T0 * p.alpha ** s0
+        # Half a stage above the last stage's temperature, so rounding cannot add a stage.
+        Tmin = p.Tmin if e == epochs - 1 else p.T0 * p.alpha ** (s1 - 0.5)
+        return replace(p, T0=T0, Tmin=Tmin, max_seconds=seconds)
+    kicks = p.kicks or (0 if p.max_seconds else n)
+    if kicks:
+        kicks = max(1, (e + 1) * kicks // epochs - e * kicks // epochs)
+    return replace(p, kicks=kicks, max_seconds=seconds)
+
+
+def parallel_solve(
+    dist: DistanceMatrix,
+    p: SolverParams,
+    pp: ParallelParams = ParallelParams(),
+) -> ParallelResult:
+    """Run ``pp.runs`` seeded copies of the solver selected by ``p`` in a process pool.
+
+    Run ``r`` uses seed ``p.seed + r`` (run 0 reproduces the sequential solve). The
+    distance matrix is copied once into shared memory and attached by every worker
+    instead of being pickled per task. With ``pp.epochs > 1`` the runs form an island
+    model on a ring: each run's budget (SA cooling schedule, LK kicks, ``max_seconds``)
+    is split into epochs, and after every epoch an island continues from its left
+    neighbour's tour when that one is better. Islands need a solver that accepts an
+    ``initial_tour`` (SA with the geometric schedule, or LK).
+    """
+    workers = pp.workers or os.cpu_count() or 1
+    runs = pp.runs or workers
+    epochs = max(pp.epochs, 1)
+    if epochs > 1 and isinstance(p, ACOParams):
+        raise ValueError("the island model needs a solver that accepts an initial tour (SA or LK)")
+    if epochs > 1 and isinstance(p, SAParams) and p.schedule != "geometric":
+        # Epochs slice the geometric schedule; an adaptive run would recalibrate T0 on
+        # every migrated tour and run to its own stall in each epoch.
+        raise ValueError("the island model splits the geometric SA schedule only")
+    n = len(dist)
+
+    shared, recipe = _share(dist)
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, runs), initializer=_attach, initargs=(recipe,)) as pool:
+            tours: List[Optional[Tour]] = [None] * runs
+            costs = [math.inf] * runs
+            seconds = [0.0] * runs
+            pids = [0] * runs
+            migrations = [0] * runs
+            for e in range(epochs):
+                tasks = []
+                for r in range(runs):
+                    q = replace(p, seed=p.seed + r + e * runs)
+                    if epochs > 1:
+                        q = _epoch_params(q, epochs, e, n)
+                        if tours[r] is not None:
+                            q = replace(q, initial_tour=tuple(tours[r]))
+                    tasks.append(pool.submit(_run, q))
+                for r, fut in enumerate(tasks):
+                    tour, cost, secs, pids[r] = fut.result()
+                    seconds[r] += secs
+                    if cost < costs[r]:
+                        tours[r], costs[r] = tour, cost
+                if e + 1 < epochs:
+                    # Ring migration, decided on the costs before any island is replaced.
+                    incoming = [(r - 1) % runs for r in range(runs)]
+                    snapshot = list(zip(tours, costs))
+                    for r, src in enumerate(incoming):
+                        if snapshot[src][1] < costs[r]:
+                            tours[r], costs[r] = snapshot[src]
+                            migrations[r] += 1
+    finally:
+        shared.close()
+
+    stats = [
+        WorkerStats(run=r, seed=p.seed + r, best_cost=costs[r], seconds=seconds[r], pid=pids[r], migrations=migrations[r])
+        for r in range(runs)
+    ]
+    best = int(np.argmin(costs))
+    return ParallelResult(best_tour=tours[best], best_cost=costs[best], best_run=best, runs=stats)
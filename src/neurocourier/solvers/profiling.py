@@ -0,0 +1,95 @@
+"""Opt-in instrumentation for solver runs.
+
+A :class:`Profiler` is created by a solver when its params set ``profile=True`` (or a
+``trace_path``); otherwise the solver holds ``None`` and skips every hook. Coarse
+phases (setup, one ACO colony build, a 2-opt polish) are timed directly. Inside the SA
+move loop only every ``sample_every``-th move is timed phase by phase and the totals
+are scaled up, which keeps the overhead of an enabled profiler to a few percent.
+
+Stats come back as flat ``meta`` entries (``time.<phase>``, ``calls.<phase>``, plain
+counters, and the last per-stage values); :meth:`Profiler.write_trace` writes stages and
+iterations as a Chrome trace-event file that chrome://tracing or Perfetto can open.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import numpy as np
+
+
+class Profiler:
+    def __init__(self, sample_every: int = 64):
+        self.sample_every = sample_every        # power of two: moves are sampled with a bit mask
+        self.times: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, float] = {}
+        self.records: List[Dict[str, float]] = []   # one per SA stage / ACO iteration
+        self._events: List[Dict[str, Any]] = []
+        self._t0 = time.perf_counter()
+        self._pid = os.getpid()
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        self.times[name] = self.times.get(name, 0.0) + seconds
+        self.calls[name] = self.calls.get(name, 0) + calls
+
+    def lap(self, name: str, since: float) -> float:
+        """Charge the time since ``since`` to ``name``; returns now, for the next lap."""
+        now = time.perf_counter()
+        self.add(name, now - since)
+        return now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.add(name, end - t)
+            self.span(name, t, end)
+
+    def count(self, name: str, k: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + k
+
+    def span(self, name: str, start: float, end: float, **args: float) -> None:
+        """Trace event covering [start, end] (``time.perf_counter`` values)."""
+        self._events.append(
+            {"name": name, "ph": "X", "ts": 1e6 * (start - self._t0), "dur": 1e6 * (end - start), "pid": self._pid, "tid": 0, "args": args}
+        )
+
+    def record(self, kind: str, start: float, end: float, **values: float) -> None:
+        """Per-stage / per-iteration values: kept in ``records``, traced as a span plus counters."""
+        self.records.append(dict(values))
+        self.span(kind, start, end, **values)
+        ts = 1e6 * (end - self._t0)
+        for name, value in values.items():
+            self._events.append({"name": name, "ph": "C", "ts": ts, "pid": self._pid, "tid": 0, "args": {name: value}})
+
+    def meta(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for name, t in self.times.items():
+            out[f"time.{name}"] = t
+            out[f"calls.{name}"] = float(self.calls[name])
+        out.update({k: float(v) for k, v in self.counters.items()})
+        if self.records:
+            out.update({f"last.{k}": float(v) for k, v in self.records[-1].items()})
+        return out
+
+    def write_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self._events, "displayTimeUnit": "ms", "otherData": self.meta()}, f)
+
+
+def edge_diversity(tours: np.ndarray) -> float:
+    """Share of distinct undirected edges in a colony: 0 when every ant built the same
+    tour, 1 when no two ants share an edge."""
+    ants, n = tours.shape
+    if ants < 2 or n < 3:
+        return 0.0
+    u, v = tours, np.roll(tours, -1, axis=1)
+    keys = np.unique(np.minimum(u, v).astype(np.int64) * n + np.maximum(u, v))
+    return (len(keys) - n) / (n * (ants - 1))
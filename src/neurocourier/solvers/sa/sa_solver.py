@@ -2,11 +2,22 @@ from __future__ import annotations
 
 import math
 import random
-from dataclasses import dataclass
-from typing import List, Optional
+from bisect import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from neurocourier.tsp.tour import tour_length, nearest_neighbor_tour
+from neurocourier.tsp.distance import DistanceMatrix, row_view
+from neurocourier.tsp.moves import MOVES, delta_2opt as _delta_2opt, delta_or3opt, delta_or_opt, delta_swap
+from neurocourier.tsp.construct import CONSTRUCTIONS, construct
+from neurocourier.tsp.neighbors import candidate_rows
+from neurocourier.tsp.tour import ArrayTour, tour_length
 from neurocourier.tsp.types import Tour
+from neurocourier.solvers.local_search import two_opt
+from neurocourier.solvers.profiling import Profiler
+
+
+SCHEDULES = ("geometric", "adaptive")
 
 
 @dataclass(frozen=True)
@@ -17,52 +28,386 @@ class SAParams:
     Tmin: float = 1e-6
     iters_per_temp: int = 0          # if 0 -> 20*n
     max_seconds: Optional[float] = None
+    neighbors: int = 0               # if > 0 -> 2-opt moves join a city to one of its k nearest
+    polish: bool = False             # run 2-opt local search on the final best tour
+    # Move mix as (name, weight) pairs; names from neurocourier.tsp.moves.MOVES
+    # ("2opt", "oropt" segments of 1-3 cities, "swap", "or3opt" reversal-free 3-opt)
+    moves: Tuple[Tuple[str, float], ...] = (("2opt", 1.0),)
+    initial_tour: Optional[Tuple[int, ...]] = None   # if None -> built by `construction`
+    construction: str = "nearest"    # start tour heuristic, from neurocourier.tsp.construct.CONSTRUCTIONS
+    profile: bool = False            # collect phase timers and move counters into SAResult.meta
+    trace_path: Optional[str] = None  # also write a Chrome trace-event file here (implies profile)
+    # "geometric": T0 * alpha^k with fixed stages. "adaptive": T0 calibrated from sampled
+    # 2-opt deltas, stages end after stage_accepts * n accepted moves (or L moves), and
+    # stall_stages frozen stages (uphill moves accepted at most at frozen_acceptance, the
+    # current cost within calm_gap of the best) with no new best restart from the best
+    # tour at a higher T, at most reheats times; then the run ends. With max_seconds,
+    # stages cool faster than alpha when needed to reach budget_freeze * T0 by the deadline.
+    schedule: str = "geometric"
+    target_acceptance: float = 0.1   # adaptive: uphill acceptance rate at the calibrated T0
+    T0_edge_cap: float = 1.0         # adaptive: T0 at most this times the start tour's mean edge
+    stage_accepts: float = 2.0
+    frozen_acceptance: float = 0.005
+    calm_gap: float = 0.01
+    stall_stages: int = 20
+    reheat: float = 2.0              # adaptive: restart at reheat * T of the last improving stage
+    reheats: int = 3
+    budget_freeze: float = 0.03      # adaptive with max_seconds: T reached by the deadline, times T0
 
 
 @dataclass
 class SAResult:
     best_tour: Tour
     best_cost: float
+    meta: Dict[str, float] = field(default_factory=dict)
+
+
+def _move_mix(moves: Tuple[Tuple[str, float], ...]) -> Tuple[List[str], List[float]]:
+    kinds: List[str] = []
+    cum: List[float] = []
+    total = 0.0
+    for name, weight in moves:
+        if name not in MOVES:
+            raise ValueError(f"unknown move {name!r}; expected one of {MOVES}")
+        if weight > 0:
+            total += weight
+            kinds.append(name)
+            cum.append(total)
+    if not kinds:
+        raise ValueError("SAParams.moves needs at least one move with positive weight")
+    return kinds, cum
+
+
+def check_params(p: SAParams) -> None:
+    """Raise ValueError for move, schedule or construction names SA does not know."""
+    _move_mix(p.moves)
+    if p.schedule not in SCHEDULES:
+        raise ValueError(f"unknown SA schedule: {p.schedule!r}")
+    if p.schedule == "adaptive" and not 0.0 < p.target_acceptance < 1.0:
+        raise ValueError("SAParams.target_acceptance must be in (0, 1)")
+    if p.construction not in CONSTRUCTIONS:
+        raise ValueError(f"unknown construction {p.construction!r}; expected one of {CONSTRUCTIONS}")
+
+
+def _calibrate_T0(tour, pos, n: int, dist, cand, rng: random.Random, target: float, samples: int = 2000) -> float:
+    """Temperature at which uphill moves are accepted with mean probability ``target``.
+
+    Samples 2-opt moves the way the chain proposes them and solves
+    mean(exp(-dE / T)) = target over the uphill deltas by bisection on log T.
+    Returns 0 if no sampled move goes uphill.
+    """
+    ups = []
+    for _ in range(samples):
+        if cand is None:
+            i, k = sorted(rng.sample(range(n), 2))
+        else:
+            i = rng.randrange(n)
+            row = cand[tour[i]]
+            k = pos[row[rng.randrange(len(row))]]
+            if k < i:
+                i, k = k, i
+        if i == k or k == i + 1 or (i == 0 and k == n - 1):
+            continue
+        dE = _delta_2opt(tour, i, k, dist)
+        if dE > 0:
+            ups.append(dE)
+    if not ups:
+        return 0.0
+    lo, hi = math.log(min(ups)) - 10.0, math.log(max(ups)) + 10.0
+    for _ in range(50):
+        mid = 0.5 * (lo + hi)
+        T = math.exp(mid)
+        if sum(math.exp(-d / T) for d in ups) / len(ups) < target:
+            lo = mid
+        else:
+            hi = mid
+    return math.exp(0.5 * (lo + hi))
 
 
-def _delta_2opt(t: Tour, i: int, k: int, d: List[List[float]]) -> float:
-    n = len(t)
-    a, b = t[i], t[i + 1]
-    c = t[k]
-    dn = t[0] if k == n - 1 else t[k + 1]
-    return (d[a][c] + d[b][dn]) - (d[a][b] + d[c][dn])
+def simulated_annealing_tsp(dist: DistanceMatrix, p: SAParams) -> SAResult:
+    prof = Profiler() if p.profile or p.trace_path else None
+    best_tour: Tour = []
+    best = math.inf
+    stages = 0
+    for stages, best_tour, best in anneal_stages(dist, p, prof=prof):
+        pass
+    meta = {"stages": float(stages)}
+    if prof is not None:
+        meta.update(prof.meta())
+        if p.trace_path:
+            prof.write_trace(p.trace_path)
+    return SAResult(best_tour=best_tour, best_cost=best, meta=meta)
 
 
-def simulated_annealing_tsp(dist: List[List[float]], p: SAParams) -> SAResult:
-    import time
+def anneal_stages(
+    dist: DistanceMatrix,
+    p: SAParams,
+    stop: Optional[Callable[[], bool]] = None,
+    prof: Optional[Profiler] = None,
+) -> Iterator[Tuple[int, Tour, float]]:
+    """Simulated annealing as a generator of ``(stages done, best tour, best cost)``.
+
+    Yields after every temperature stage (the initial tour if no stage runs) and once
+    more after the optional polish. ``stop`` is polled every 1024 moves; when it
+    returns True the run ends with a final yield and the polish is skipped.
+
+    ``p.schedule`` selects the cooling schedule (see :class:`SAParams`); with
+    "adaptive" the stage count depends on progress, and the run may end well before
+    ``Tmin`` once the reheats are used up.
+
+    With a ``prof``, every ``prof.sample_every``-th move is timed phase by phase
+    (sample, delta, accept test, apply, best bookkeeping) and each stage records its
+    temperature and acceptance rate.
+    """
+    t_setup = time.perf_counter()
+    check_params(p)
     rng = random.Random(p.seed)
     n = len(dist)
+    full_dist = dist
 
-    tour = nearest_neighbor_tour(dist)
-    cur = tour_length(tour, dist)
-    best_tour, best = tour[:], cur
+    at = ArrayTour(construct(dist, p.construction) if p.initial_tour is None else p.initial_tour)
+    cur = tour_length(at.order, dist)
+    cand = candidate_rows(dist, p.neighbors) if p.neighbors else None
+    dist = row_view(dist)
+    tour, pos = at.o, at.p
+    best_order, best = at.order.copy(), cur
 
+    # The best tour is recorded lazily: on a new best only the cost is kept and later
+    # moves are logged; the tour itself is rebuilt from the log at the end of the stage
+    # (or once the log holds n elements: or-opt and or-3opt tokens carry a copy of the
+    # moved segment, so entries are weighted by their size).
+    log: List[tuple] = []
+    logged = 0
+    dirty = False
+
+    kinds, cum = _move_mix(p.moves)
+    single = len(kinds) == 1
     T = p.T0
     L = p.iters_per_temp or (20 * n)
+    adaptive = p.schedule == "adaptive"
+    quota = L + 1                    # accepted moves that end a stage early
+    if adaptive:
+        if n >= 4:
+            T = _calibrate_T0(tour, pos, n, dist, cand, rng, p.target_acceptance) or p.T0
+            # Random-pair 2-opt deltas are long-range, so accepting them at the
+            # target_acceptance rate would melt a constructed tour; the cap keeps T0 at
+            # the scale of its edges.
+            T = min(T, p.T0_edge_cap * cur / n)
+        T_start = T
+        quota = max(1, int(p.stage_accepts * n))
+        stage_best, calm, T_gain, reheats_left = best, 0, T, p.reheats
     t0 = time.time()
 
+    stage = 0
+    stopped = False
+    best_list: Optional[Tour] = None
+
+    # Instrumentation: moves with ``it & gate == 0`` take the slow path (stop polling,
+    # and sampling when profiling), so a disabled profiler costs one bit test per move.
+    gate = 1023
+    sampled = False
+    if prof is not None:
+        prof.add("setup", time.perf_counter() - t_setup)
+        gate = min(gate, prof.sample_every - 1)
+        perf = time.perf_counter
+        ta = tb = tc = td = te = 0.0
+        phase_sums = dict.fromkeys(("sample", "delta", "accept", "apply", "best"), 0.0)
+        by_kind = {k: [0, 0] for k in kinds}   # sampled moves: [proposed, accepted]
+
     while T > p.Tmin:
         if p.max_seconds and (time.time() - t0) >= p.max_seconds:
             break
+        t_stage = time.perf_counter()
+        accepted = uphill = skipped = n_sampled = 0
 
-        for _ in range(L):
-            i, k = sorted(rng.sample(range(n), 2))
-            if i == k or k == i + 1 or (i == 0 and k == n - 1):
-                continue
+        it = -1
+        for it in range(L):
+            if not (it & gate):
+                if stop is not None and not (it & 1023) and stop():
+                    stopped = True
+                    break
+                if prof is not None:
+                    sampled = True
+                    ta = perf()
+            kind = kinds[0] if single else kinds[bisect(cum, rng.random() * cum[-1])]
+            if kind == "2opt":
+                if cand is None:
+                    i, k = sorted(rng.sample(range(n), 2))
+                else:
+                    # New edge (t[i], t[k]) joins a city to one of its nearest neighbours.
+                    i = rng.randrange(n)
+                    row = cand[tour[i]]
+                    k = pos[row[rng.randrange(len(row))]]
+                    if k < i:
+                        i, k = k, i
+                if i == k or k == i + 1 or (i == 0 and k == n - 1):
+                    skipped += 1
+                    sampled = False
+                    continue
+                if sampled:
+                    tb = perf()
+                dE = _delta_2opt(tour, i, k, dist)
+            elif kind == "oropt":
+                seg = 1 + rng.randrange(3)
+                if n < seg + 3:
+                    skipped += 1
+                    sampled = False
+                    continue
+                i = rng.randrange(n - seg + 1)
+                if cand is None:
+                    j = rng.randrange(n)
+                else:
+                    # Reinsert the segment next to a near neighbour of its first city.
+                    row = cand[tour[i]]
+                    j = pos[row[rng.randrange(len(row))]]
+                if i - 1 <= j < i + seg or (i == 0 and j == n - 1):
+                    skipped += 1
+                    sampled = False
+                    continue
+                rev = rng.random() < 0.5
+                if sampled:
+                    tb = perf()
+                dE = delta_or_opt(tour, i, seg, j, rev, dist)
+            elif kind == "swap":
+                if n < 3:
+                    skipped += 1
+                    sampled = False
+                    continue
+                i, k = sorted(rng.sample(range(n), 2))
+                if sampled:
+                    tb = perf()
+                dE = delta_swap(tour, i, k, dist)
+            else:
+                if n < 4:
+                    skipped += 1
+                    sampled = False
+                    continue
+                i, j, k = sorted(rng.sample(range(n), 3))
+                if sampled:
+                    tb = perf()
+                dE = delta_or3opt(tour, i, j, k, dist)
+            if sampled:
+                tc = perf()
 
-            dE = _delta_2opt(tour, i, k, dist)
             if dE <= 0 or rng.random() < math.exp(-dE / T):
-                tour[i + 1 : k + 1] = reversed(tour[i + 1 : k + 1])
+                if sampled:
+                    td = perf()
+                if kind == "2opt":
+                    tok = at.two_opt(i, k)
+                elif kind == "oropt":
+                    tok = at.or_opt(i, seg, j, rev)
+                elif kind == "swap":
+                    tok = at.swap(i, k)
+                else:
+                    tok = at.or3opt(i, j, k)
+                if sampled:
+                    te = perf()
+                accepted += 1
+                if dE > 0:
+                    uphill += 1
                 cur += dE
                 if cur < best:
                     best = cur
-                    best_tour = tour[:]
+                    dirty = True
+                    log.clear()
+                    logged = 0
+                    best_list = None
+                elif dirty:
+                    log.append(tok)
+                    logged += len(tok[2]) if tok[0] == "s" else 1
+                    if logged >= n:
+                        best_order, dirty = at.rewind(log), False
+                        log.clear()
+                        logged = 0
+                if sampled:
+                    phase_sums["apply"] += te - td
+                    phase_sums["best"] += perf() - te
+                    by_kind[kind][1] += 1
+                if accepted >= quota:
+                    sampled = False
+                    break
+            elif sampled:
+                td = perf()
+            if sampled:
+                sampled = False
+                n_sampled += 1
+                phase_sums["sample"] += tb - ta
+                phase_sums["delta"] += tc - tb
+                phase_sums["accept"] += td - tc
+                by_kind[kind][0] += 1
 
+        moves = it + 1 - (1 if stopped else 0)
+        if dirty:
+            best_order, dirty = at.rewind(log), False
+            log.clear()
+            logged = 0
+        if best_list is None:
+            best_list = best_order.tolist()
+        stage += 1
+        if prof is not None:
+            proposed = moves - skipped
+            prof.count("moves", moves)
+            prof.count("proposed", proposed)
+            prof.count("accepted", accepted)
+            prof.count("rejected", proposed - accepted)
+            prof.count("skipped", skipped)
+            # Skipped proposals are never sampled, so only proposed moves are extrapolated.
+            scale = proposed / n_sampled if n_sampled else 0.0
+            for name, t in phase_sums.items():
+                prof.add(name, t * scale, calls=accepted if name in ("apply", "best") else proposed)
+                phase_sums[name] = 0.0
+            prof.record(
+                "stage",
+                t_stage,
+                time.perf_counter(),
+                temperature=T,
+                acceptance=accepted / proposed if proposed else 0.0,
+                cost=cur,
+                best=best,
+            )
+        yield stage, best_list, best
+        if stopped:
+            break
+        if adaptive:
+            if best < stage_best:
+                stage_best, calm, T_gain = best, 0, T
+            elif uphill <= p.frozen_acceptance * (moves - skipped) and cur <= best * (1.0 + p.calm_gap):
+                calm += 1                # only nearly frozen stages at the best count as stalled
+            if calm >= p.stall_stages:
+                if reheats_left <= 0:
+                    break
+                # Restart from the best tour, above the temperature that last paid off.
+                reheats_left -= 1
+                calm = 0
+                at = ArrayTour(best_list)
+                tour, pos = at.o, at.p
+                cur = best
+                T = min(T_start, T_gain * p.reheat)
+                if prof is not None:
+                    prof.count("reheats")
+                continue
+            if p.max_seconds:
+                # Fit the rest of the cooling into the time left, at the last stage's pace.
+                stages_left = (p.max_seconds - (time.time() - t0)) / max(time.perf_counter() - t_stage, 1e-9)
+                T_end = p.budget_freeze * T_start
+                if T > T_end:
+                    T *= min(p.alpha, (T_end / T) ** (1.0 / max(stages_left, 1.0)))
+                    continue
         T *= p.alpha
 
-    return SAResult(best_tour=best_tour, best_cost=best)
+    if prof is not None:
+        for kind, (proposed, acc) in by_kind.items():
+            prof.count(f"sampled.proposed.{kind}", proposed)
+            prof.count(f"sampled.accepted.{kind}", acc)
+    if stopped:
+        return
+    if best_list is None:
+        best_list = best_order.tolist()
+        yield stage, best_list, best
+    if p.polish:
+        t_polish = time.perf_counter()
+        ls = two_opt(full_dist, best_list, cand=cand)
+        if prof is not None:
+            prof.add("polish", time.perf_counter() - t_polish)
+        if ls.best_cost < best:
+            yield stage, ls.best_tour, ls.best_cost
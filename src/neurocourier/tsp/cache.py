@@ -0,0 +1,152 @@
+"""Content-addressed on-disk cache of distance matrices.
+
+Entries are plain ``.npy`` files named after a hash of the point coordinates, so any
+process computing the same point set finds the same file. They are opened with
+``mmap_mode="r"``: concurrent solver processes share one page-cache copy and a matrix
+is never parsed or copied on load. Writes go through a temporary file and an atomic
+rename, so readers never see a partial entry.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from .distance import euclidean_distance_array, points_array
+from .types import Point
+
+# Bump when the file layout changes so stale entries are never mistaken for new ones.
+_FORMAT = b"neurocourier-dist-v1"
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get("NEUROCOURIER_CACHE")
+    if env:
+        return Path(env)
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "neurocourier"
+
+
+def point_set_key(points: Sequence[Point]) -> str:
+    """Stable hash of the coordinates (as float64, in order)."""
+    xy = points_array(points)
+    h = hashlib.sha256(_FORMAT)
+    h.update(np.int64(len(xy)).tobytes())
+    h.update(xy.tobytes())
+    return h.hexdigest()[:40]
+
+
+@dataclass
+class CacheEntry:
+    path: Path
+    size: int
+    mtime: float                     # last write or hit
+
+
+class DistanceCache:
+    """Memory-mapped distance matrices keyed by point set, bounded by size and age.
+
+    ``max_bytes`` caps the total size of all entries; ``max_age`` (seconds) drops entries
+    not used for that long. Hits refresh an entry's mtime, so size eviction removes the
+    least recently used files first.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path, None] = None,
+        max_bytes: int = 4 * 1024 ** 3,
+        max_age: Optional[float] = None,
+    ):
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def path_for(self, key: str, dtype: DTypeLike = np.float32) -> Path:
+        return self.root / f"{key}-{np.dtype(dtype).name}.npy"
+
+    def get(self, points: Sequence[Point], dtype: DTypeLike = np.float32) -> Optional[np.ndarray]:
+        """Read-only memory map of the cached matrix, or None."""
+        path = self.path_for(point_set_key(points), dtype)
+        try:
+            arr = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return arr
+
+    def put(self, points: Sequence[Point], dist: np.ndarray) -> Path:
+        """Store ``dist`` (the matrix of ``points``) and return its path."""
+        dist = np.ascontiguousarray(dist)
+        path = self.path_for(point_set_key(points), dist.dtype)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, dist)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def distance_array(self, points: Sequence[Point], dtype: DTypeLike = np.float32) -> np.ndarray:
+        """Cached Euclidean matrix of ``points``, computed and stored on a miss."""
+        arr = self.get(points, dtype)
+        if arr is None:
+            path = self.put(points, euclidean_distance_array(points, dtype=dtype, upper_only=True))
+            arr = np.load(path, mmap_mode="r")
+        return arr
+
+    def entries(self) -> List[CacheEntry]:
+        out = []
+        for path in self.root.glob("*.npy"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:  # evicted by another process meanwhile
+                continue
+            out.append(CacheEntry(path=path, size=st.st_size, mtime=st.st_mtime))
+        return out
+
+    def total_bytes(self) -> int:
+        return sum(e.size for e in self.entries())
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Apply the age and size limits; returns the number of removed entries.
+
+        Mapped files stay readable by processes that already opened them.
+        """
+        entries = sorted(self.entries(), key=lambda e: e.mtime)
+        now = time.time()
+        total = sum(e.size for e in entries)
+        removed = 0
+        for e in entries:
+            expired = self.max_age is not None and now - e.mtime > self.max_age
+            if not expired and total <= self.max_bytes:
+                continue
+            if e.path == keep:
+                continue
+            try:
+                e.path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= e.size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for e in self.entries():
+            try:
+                e.path.unlink()
+            except FileNotFoundError:
+                pass
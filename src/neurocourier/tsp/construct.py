@@ -0,0 +1,362 @@
+"""Construction heuristics: start tours for the solvers, selected by name.
+
+``construct(dist, method)`` builds a tour with one of ``CONSTRUCTIONS``:
+
+- "nearest": nearest neighbour, one vectorized row scan per step (O(n^2))
+- "spacefill": cities sorted along a Hilbert curve (O(n log n)); coordinates come from a
+  :class:`DistanceOracle`, or from a classical-MDS embedding of a dense matrix
+- "greedy": greedy edge matching over k-nearest candidate edges with union-find,
+  fragments joined nearest end first (about 15-20% above optimal on Euclidean inputs)
+- "christofides": Christofides-lite, MST plus a greedy (not minimum) matching of the
+  odd-degree cities, Euler tour, shortcuts
+- "farthest" / "cheapest": farthest and cheapest insertion (O(n) rows of memory;
+  farthest is O(n^2) time, cheapest up to O(n^3) as every insertion rescores the cities
+  whose best edge it split, about n^2.5 on uniform points)
+
+All of them accept dense matrices (arrays or nested lists) and oracles.
+"""
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+from .distance import DistanceMatrix, as_distance_array
+from .neighbors import GridIndex, candidate_lists
+from .oracle import DistanceOracle
+from .tour import nearest_neighbor_tour
+from .types import Tour
+
+CONSTRUCTIONS = ("nearest", "spacefill", "greedy", "christofides", "farthest", "cheapest")
+
+# Bits per axis of the Hilbert curve grid.
+_HILBERT_BITS = 16
+# Distances computed at once when cheapest insertion rescores cities.
+_BLOCK = 1 << 20
+
+
+def _rows(dist: DistanceMatrix, idx: Sequence[int]) -> np.ndarray:
+    """Distance rows of ``idx`` as a (len(idx), n) float64 array."""
+    idx = np.asarray(idx, dtype=np.intp)
+    if isinstance(dist, np.ndarray):
+        return dist[idx].astype(np.float64)
+    if isinstance(dist, DistanceOracle):
+        pts = dist.points
+        return np.hypot(pts[idx, None, 0] - pts[None, :, 0], pts[idx, None, 1] - pts[None, :, 1])
+    return np.array([dist[i] for i in idx.tolist()], dtype=np.float64).reshape(len(idx), len(dist))
+
+
+def _between(dist: DistanceMatrix, c: int, idx: np.ndarray) -> np.ndarray:
+    """Distances from city ``c`` to the cities ``idx``."""
+    if isinstance(dist, np.ndarray):
+        return dist[c, idx].astype(np.float64)
+    if isinstance(dist, DistanceOracle):
+        return dist.pair_distances(np.full(len(idx), c), idx)
+    return np.asarray(dist[c], dtype=np.float64)[idx]
+
+
+def _lengths(dist: DistanceMatrix, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    if isinstance(dist, np.ndarray):
+        return dist[u, v].astype(np.float64)
+    if isinstance(dist, DistanceOracle):
+        return dist.pair_distances(u, v)
+    return np.array([dist[a][b] for a, b in zip(u.tolist(), v.tolist())], dtype=np.float64)
+
+
+def _block(dist: DistanceMatrix, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Distances between the cities ``a`` and ``b`` as a (len(a), len(b)) float64 array."""
+    if isinstance(dist, np.ndarray):
+        return dist[np.ix_(a, b)].astype(np.float64)
+    if isinstance(dist, DistanceOracle):
+        pts = dist.points
+        return np.hypot(pts[a, None, 0] - pts[None, b, 0], pts[a, None, 1] - pts[None, b, 1])
+    return np.array([np.asarray(dist[i], dtype=np.float64)[b] for i in a.tolist()]).reshape(len(a), len(b))
+
+
+def _walk(nxt: np.ndarray, start: int) -> Tour:
+    tour = [start]
+    c = int(nxt[start])
+    while c != start:
+        tour.append(c)
+        c = int(nxt[c])
+    return tour
+
+
+def coordinates(dist: DistanceMatrix) -> np.ndarray:
+    """(n, 2) coordinates of the cities: an oracle's points, else a classical-MDS embedding.
+
+    The embedding takes the top two eigenvectors of the double-centred squared distances
+    (by subspace iteration, O(n^2) per step); it reproduces a 2-D Euclidean instance up
+    to rotation and reflection.
+    """
+    if isinstance(dist, DistanceOracle):
+        return dist.points
+    d = as_distance_array(dist, dtype=np.float64)
+    n = len(d)
+    if n < 3:
+        return np.zeros((n, 2))
+    b = -0.5 * d * d
+    b -= b.mean(axis=0)
+    b -= b.mean(axis=1)[:, None]
+    x = np.random.default_rng(0).standard_normal((n, 2))
+    for _ in range(20):
+        x, _ = np.linalg.qr(b @ x)
+    # Rayleigh-Ritz: rotate the basis of the dominant subspace onto the eigenvectors.
+    vals, vecs = np.linalg.eigh(x.T @ b @ x)
+    return (x @ vecs) * np.sqrt(np.maximum(vals, 0.0))
+
+
+def _hilbert_keys(xy: np.ndarray, bits: int = _HILBERT_BITS) -> np.ndarray:
+    """Position of every point along a Hilbert curve over its bounding box."""
+    side = 1 << bits
+    lo = xy.min(axis=0)
+    span = max(float(np.ptp(xy, axis=0).max()), 1e-12)
+    q = ((xy - lo) * ((side - 1) / span)).astype(np.int64)
+    x, y = q[:, 0], q[:, 1]
+    key = np.zeros(len(xy), dtype=np.int64)
+    s = side >> 1
+    while s:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        key += s * s * ((3 * rx.astype(np.int64)) ^ ry)
+        # Rotate the quadrant so the sub-curve has the standard orientation.
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        x, y = np.where(ry, x, y), np.where(ry, y, x)
+        s >>= 1
+    return key
+
+
+def space_filling_curve_tour(dist: DistanceMatrix) -> Tour:
+    """Cities in Hilbert-curve order (about 40% above optimal on uniform points)."""
+    if len(dist) < 3:
+        return list(range(len(dist)))
+    return np.argsort(_hilbert_keys(coordinates(dist)), kind="stable").tolist()
+
+
+def _find(root: List[int], a: int) -> int:
+    while root[a] != a:
+        root[a] = root[root[a]]
+        a = root[a]
+    return a
+
+
+def _join_fragments(dist: DistanceMatrix, adj: List[List[int]]) -> Tour:
+    """Chain the paths of a degree <= 2 forest (no cycles) into a tour, nearest free end first."""
+    n = len(adj)
+    seen = [False] * n
+    frags: List[List[int]] = []
+    for c in range(n):
+        if seen[c] or len(adj[c]) == 2:
+            continue
+        path, prev = [c], -1
+        seen[c] = True
+        while True:
+            nxt = [x for x in adj[path[-1]] if x != prev]
+            if not nxt:
+                break
+            prev = path[-1]
+            path.append(nxt[0])
+            seen[nxt[0]] = True
+        frags.append(path)
+
+    ends = np.array([[f[0], f[-1]] for f in frags], dtype=np.intp).ravel()
+    alive = np.ones(len(ends), dtype=bool)
+    tour = list(frags[0])
+    alive[:2] = False
+    for _ in range(len(frags) - 1):
+        d = _between(dist, tour[-1], ends)
+        d[~alive] = np.inf
+        e = int(d.argmin())
+        f = frags[e // 2]
+        tour.extend(f if e % 2 == 0 else reversed(f))
+        alive[e - e % 2 : e - e % 2 + 2] = False
+    return tour
+
+
+def greedy_edge_tour(dist: DistanceMatrix, neighbors: int = 10) -> Tour:
+    """Greedy matching: shortest candidate edges first, keeping degrees <= 2 and no cycles."""
+    n = len(dist)
+    if n < 4:
+        return list(range(n))
+    cand = candidate_lists(dist, neighbors)
+    u = np.repeat(np.arange(n, dtype=np.intp), cand.shape[1])
+    v = cand.ravel().astype(np.intp)
+    key = np.unique(np.minimum(u, v) * n + np.maximum(u, v))
+    u, v = key // n, key % n
+    order = np.argsort(_lengths(dist, u, v), kind="stable")
+    adj: List[List[int]] = [[] for _ in range(n)]
+    root = list(range(n))
+    added = 0
+    for a, b in zip(u[order].tolist(), v[order].tolist()):
+        if len(adj[a]) == 2 or len(adj[b]) == 2:
+            continue
+        ra, rb = _find(root, a), _find(root, b)
+        if ra == rb:
+            continue
+        root[ra] = rb
+        adj[a].append(b)
+        adj[b].append(a)
+        added += 1
+        if added == n - 1:
+            break
+    return _join_fragments(dist, adj)
+
+
+def _greedy_matching(dist: DistanceMatrix, odd: np.ndarray, neighbors: int = 10) -> List[tuple]:
+    """Pairs of ``odd`` cities: greedy over near pairs, the rest by nearest free partner."""
+    m = len(odd)
+    if isinstance(dist, DistanceOracle):
+        cand = GridIndex(dist.points[odd]).knn(neighbors)
+    else:
+        cand = candidate_lists(as_distance_array(dist)[np.ix_(odd, odd)], neighbors)
+    u = np.repeat(np.arange(m, dtype=np.intp), cand.shape[1])
+    v = cand.ravel().astype(np.intp)
+    keep = u < v
+    u, v = u[keep], v[keep]
+    order = np.argsort(_lengths(dist, odd[u], odd[v]), kind="stable")
+    free = np.ones(m, dtype=bool)
+    pairs = []
+    for a, b in zip(u[order].tolist(), v[order].tolist()):
+        if free[a] and free[b]:
+            free[a] = free[b] = False
+            pairs.append((int(odd[a]), int(odd[b])))
+    rest = np.flatnonzero(free)
+    while len(rest):
+        a, others = rest[0], rest[1:]
+        b = others[int(_between(dist, int(odd[a]), odd[others]).argmin())]
+        pairs.append((int(odd[a]), int(odd[b])))
+        rest = others[others != b]
+    return pairs
+
+
+def christofides_tour(dist: DistanceMatrix) -> Tour:
+    """Christofides-lite: MST + greedy matching of odd-degree cities, Euler tour, shortcuts."""
+    from neurocourier.evaluation.bounds import minimum_spanning_tree
+
+    n = len(dist)
+    if n < 4:
+        return list(range(n))
+    _, u, v = minimum_spanning_tree(dist)
+    edges = list(zip(u.tolist(), v.tolist()))
+    deg = np.bincount(np.concatenate((u, v)), minlength=n)
+    odd = np.flatnonzero(deg % 2).astype(np.intp)
+    edges.extend(_greedy_matching(dist, odd))
+
+    adj: List[List[int]] = [[] for _ in range(n)]
+    for e, (a, b) in enumerate(edges):
+        adj[a].append(e)
+        adj[b].append(e)
+    used = [False] * len(edges)
+    # Hierholzer's algorithm; the shortcut keeps the first visit of every city.
+    stack, tour = [0], []
+    seen = [False] * n
+    while stack:
+        c = stack[-1]
+        while adj[c] and used[adj[c][-1]]:
+            adj[c].pop()
+        if adj[c]:
+            e = adj[c].pop()
+            used[e] = True
+            a, b = edges[e]
+            stack.append(b if a == c else a)
+        else:
+            stack.pop()
+            if not seen[c]:
+                seen[c] = True
+                tour.append(c)
+    return tour
+
+
+def _insertion(dist: DistanceMatrix, start: int, cheapest: bool) -> Tour:
+    n = len(dist)
+    if n < 4:
+        return list(range(n))
+    first = _rows(dist, [start])[0]
+    first[start] = np.inf
+    b = int(first.argmin()) if cheapest else int(np.where(np.isinf(first), -np.inf, first).argmax())
+    first[start] = 0.0
+    rb = _rows(dist, [b])[0]
+    nxt = np.full(n, -1, dtype=np.intp)
+    elen = np.zeros(n)                   # elen[u] = d(u, nxt[u])
+    nxt[start], nxt[b] = b, start
+    elen[start] = elen[b] = first[b]
+    out = np.ones(n, dtype=bool)
+    out[[start, b]] = False
+    if cheapest:
+        # Best insertion of every outside city: its cost and the tour city u it follows.
+        best = first + rb - first[b]
+        best_u = np.full(n, start, dtype=np.intp)
+        col = np.zeros(n, dtype=np.intp)    # column of each tour city in the rescoring block
+    else:
+        near = np.minimum(first, rb)     # distance to the tour
+    for _ in range(n - 2):
+        if cheapest:
+            c = int(np.where(out, best, np.inf).argmin())
+            u = int(best_u[c])
+            rc = _rows(dist, [c])[0]
+        else:
+            c = int(np.where(out, near, -np.inf).argmax())
+            rc = _rows(dist, [c])[0]
+            us = np.flatnonzero(~out)
+            u = int(us[(rc[us] + rc[nxt[us]] - elen[us]).argmin()])
+        w = int(nxt[u])
+        nxt[c], elen[c] = w, rc[w]
+        nxt[u], elen[u] = c, rc[u]
+        out[c] = False
+        if cheapest:
+            # Cities whose best edge (u, w) was just split are rescored on every edge.
+            stale = np.flatnonzero(out & (best_u == u))
+            best[stale] = np.inf
+            ru, rw = _rows(dist, [u, w])
+            via_uc = ru + rc - rc[u]
+            via_cw = rc + rw - rc[w]
+            better = via_uc < best
+            best[better], best_u[better] = via_uc[better], u
+            better = via_cw < best
+            best[better], best_u[better] = via_cw[better], c
+            if len(stale):
+                # Only the tour columns (the successors nxt[us] are tour cities again),
+                # in chunks of about _BLOCK entries.
+                us = np.flatnonzero(~out)
+                col[us] = np.arange(len(us))
+                succ = col[nxt[us]]
+                step = max(1, _BLOCK // len(us))
+                for lo in range(0, len(stale), step):
+                    part = stale[lo:lo + step]
+                    r = _block(dist, part, us)
+                    cost = r + r[:, succ] - elen[us]
+                    j = cost.argmin(axis=1)
+                    best[part] = cost[np.arange(len(part)), j]
+                    best_u[part] = us[j]
+        else:
+            np.minimum(near, rc, out=near)
+    return _walk(nxt, start)
+
+
+def farthest_insertion_tour(dist: DistanceMatrix, start: int = 0) -> Tour:
+    """Farthest insertion: add the city farthest from the tour where it costs least."""
+    return _insertion(dist, start, cheapest=False)
+
+
+def cheapest_insertion_tour(dist: DistanceMatrix, start: int = 0) -> Tour:
+    """Cheapest insertion: add the (city, position) pair that lengthens the tour least."""
+    return _insertion(dist, start, cheapest=True)
+
+
+def construct(dist: DistanceMatrix, method: str = "nearest", start: int = 0) -> Tour:
+    """Start tour by the construction heuristic ``method`` (one of ``CONSTRUCTIONS``)."""
+    if method == "nearest":
+        return nearest_neighbor_tour(dist, start) if len(dist) else []
+    if method == "spacefill":
+        return space_filling_curve_tour(dist)
+    if method == "greedy":
+        return greedy_edge_tour(dist)
+    if method == "christofides":
+        return christofides_tour(dist)
+    if method == "farthest":
+        return farthest_insertion_tour(dist, start)
+    if method == "cheapest":
+        return cheapest_insertion_tour(dist, start)
+    raise ValueError(f"unknown construction {method!r}; expected one of {CONSTRUCTIONS}")
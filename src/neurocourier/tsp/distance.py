@@ -1,8 +1,20 @@
 from __future__ import annotations
 import math
-from typing import List
+from typing import List, Sequence, Union
+
+import numpy as np
+from numpy.typing import DTypeLike
+
 from .types import Point
 
+# Anything indexable as dist[i][j] with len(dist) == n. Dense matrices are either the
+# legacy nested lists or a contiguous float32/float64 NumPy array.
+DistanceMatrix = Union[List[List[float]], np.ndarray]
+
+# Rows per broadcasting block; keeps the (block, n) temporaries small for large n.
+_BLOCK_ROWS = 512
+
+
 def euclidean_distance_matrix(points: List[Point]) -> List[List[float]]:
     n = len(points)
     d = [[0.0] * n for _ in range(n)]
@@ -14,3 +26,84 @@ def euclidean_distance_matrix(points: List[Point]) -> List[List[float]]:
             d[i][j] = dist
             d[j][i] = dist
     return d
+
+
+def points_array(points: Sequence[Point]) -> np.ndarray:
+    """Return the points as a contiguous (n, 2) float64 array."""
+    return np.ascontiguousarray(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+
+
+def euclidean_distance_array(
+    points: Sequence[Point],
+    dtype: DTypeLike = np.float64,
+    upper_only: bool = False,
+) -> np.ndarray:
+    """Dense Euclidean distance matrix as a contiguous NumPy array.
+
+    Rows are filled in broadcast blocks so temporaries stay O(block * n). With
+    ``upper_only=True`` only the upper triangle is computed and mirrored into the lower
+    one, halving the arithmetic.
+    """
+    xy = points_array(points)
+    n = len(xy)
+    x, y = xy[:, 0], xy[:, 1]
+    d = np.empty((n, n), dtype=dtype)
+    for r0 in range(0, n, _BLOCK_ROWS):
+        r1 = min(r0 + _BLOCK_ROWS, n)
+        c0 = r0 if upper_only else 0
+        block = np.hypot(x[r0:r1, None] - x[None, c0:], y[r0:r1, None] - y[None, c0:])
+        d[r0:r1, c0:] = block
+        if upper_only:
+            d[r1:, r0:r1] = block[:, r1 - c0 :].T
+    np.fill_diagonal(d, 0.0)
+    return d
+
+
+def patch_distance_array(
+    dist: DistanceMatrix,
+    points: Sequence[Point],
+    keep: Sequence[int],
+    new_points: Sequence[Point] = (),
+) -> np.ndarray:
+    """Distance matrix after dropping cities and appending ``new_points``.
+
+    ``points`` are the coordinates behind ``dist`` and ``keep`` the (sorted) indices of
+    the cities that stay; they become 0..len(keep)-1 and the new points follow. Kept
+    pairs are copied from ``dist``; only rows of the new points are computed.
+    """
+    old = as_distance_array(dist)
+    keep = np.asarray(keep, dtype=np.intp)
+    xy = np.concatenate((points_array(points)[keep], points_array(new_points)))
+    k, m = len(keep), len(xy)
+    out = np.empty((m, m), dtype=old.dtype)
+    if k == len(old):
+        out[:k, :k] = old
+    else:
+        out[:k, :k] = old[np.ix_(keep, keep)]
+    for r0 in range(k, m, _BLOCK_ROWS):
+        r1 = min(r0 + _BLOCK_ROWS, m)
+        block = np.hypot(xy[r0:r1, None, 0] - xy[None, :, 0], xy[r0:r1, None, 1] - xy[None, :, 1])
+        block[np.arange(r1 - r0), np.arange(r0, r1)] = 0.0
+        out[r0:r1, :] = block
+        out[:, r0:r1] = block.T
+    return out
+
+
+def as_distance_array(dist: DistanceMatrix, dtype: DTypeLike = None) -> np.ndarray:
+    """Adapter from any dense distance matrix (nested lists included) to a 2-D array."""
+    arr = np.asarray(dist, dtype=dtype)
+    if arr.ndim != 2 or arr.shape[0] != arr.shape[1]:
+        raise ValueError(f"expected a square distance matrix, got shape {arr.shape}")
+    return np.ascontiguousarray(arr)
+
+
+def row_view(dist: DistanceMatrix) -> DistanceMatrix:
+    """Return a ``dist[i][j]`` view tuned for scalar Python loops.
+
+    NumPy scalar indexing is several times slower than list indexing, so arrays are
+    exposed as a list of per-row memoryviews (zero-copy, yields plain floats). Other
+    inputs are returned unchanged.
+    """
+    if isinstance(dist, np.ndarray):
+        return [memoryview(row) for row in dist]
+    return dist
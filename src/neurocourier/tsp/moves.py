@@ -0,0 +1,93 @@
+"""Tour moves with O(1) delta evaluation.
+
+Positions are tour indices; the tour is cyclic, so ``t[n]`` means ``t[0]``. Each
+``delta_*`` returns the change in tour length and never modifies the tour; the matching
+``apply_*`` performs the move in place and returns the positions whose city changed,
+so callers can keep a position index in sync.
+"""
+from __future__ import annotations
+from typing import Iterable
+
+from .distance import DistanceMatrix
+from .types import Tour
+
+MOVES = ("2opt", "oropt", "swap", "or3opt")
+
+
+def delta_2opt(t: Tour, i: int, k: int, d: DistanceMatrix) -> float:
+    """Reverse t[i+1..k] (i < k): replaces (t[i], t[i+1]), (t[k], t[k+1])."""
+    n = len(t)
+    a, b = t[i], t[i + 1]
+    c = t[k]
+    dn = t[0] if k == n - 1 else t[k + 1]
+    return (d[a][c] + d[b][dn]) - (d[a][b] + d[c][dn])
+
+
+def apply_2opt(t: Tour, i: int, k: int) -> Iterable[int]:
+    t[i + 1 : k + 1] = reversed(t[i + 1 : k + 1])
+    return range(i + 1, k + 1)
+
+
+def delta_or_opt(t: Tour, i: int, length: int, j: int, reverse: bool, d: DistanceMatrix) -> float:
+    """Move the segment t[i..i+length-1] between t[j] and t[j+1], optionally reversed.
+
+    The segment must not wrap (i + length <= n) and j must lie outside it and differ
+    from i - 1 (that would put the segment back where it was).
+    """
+    n = len(t)
+    p, s0, s1 = t[i - 1], t[i], t[i + length - 1]
+    nx = t[(i + length) % n]
+    a, b = t[j], t[(j + 1) % n]
+    if reverse:
+        s0, s1 = s1, s0
+    return (d[p][nx] + d[a][s0] + d[s1][b]) - (d[p][t[i]] + d[t[i + length - 1]][nx] + d[a][b])
+
+
+def apply_or_opt(t: Tour, i: int, length: int, j: int, reverse: bool) -> Iterable[int]:
+    seg = t[i : i + length]
+    if reverse:
+        seg.reverse()
+    del t[i : i + length]
+    at = (j if j < i else j - length) + 1
+    t[at:at] = seg
+    if j < i:
+        return range(j + 1, i + length)
+    return range(i, j + 1)
+
+
+def delta_swap(t: Tour, i: int, j: int, d: DistanceMatrix) -> float:
+    """Exchange the cities at positions i < j."""
+    n = len(t)
+    if n < 3:
+        return 0.0                   # both orders are the same cycle
+    a, b = t[i], t[j]
+    pa, na = t[i - 1], t[(i + 1) % n]
+    pb, nb = t[j - 1], t[(j + 1) % n]
+    if j == i + 1:
+        return (d[pa][b] + d[a][nb]) - (d[pa][a] + d[b][nb])
+    if i == 0 and j == n - 1:
+        return (d[pb][a] + d[b][na]) - (d[pb][b] + d[a][na])
+    return (d[pa][b] + d[b][na] + d[pb][a] + d[a][nb]) - (d[pa][a] + d[a][na] + d[pb][b] + d[b][nb])
+
+
+def apply_swap(t: Tour, i: int, j: int) -> Iterable[int]:
+    t[i], t[j] = t[j], t[i]
+    return (i, j)
+
+
+def delta_or3opt(t: Tour, i: int, j: int, k: int, d: DistanceMatrix) -> float:
+    """Reversal-free 3-opt: exchange segments t[i+1..j] and t[j+1..k] (i < j < k).
+
+    Or-opt is the special case where one of the two segments is short.
+    """
+    n = len(t)
+    a, b = t[i], t[i + 1]
+    c, e = t[j], t[j + 1]
+    f = t[k]
+    g = t[0] if k == n - 1 else t[k + 1]
+    return (d[a][e] + d[f][b] + d[c][g]) - (d[a][b] + d[c][e] + d[f][g])
+
+
+def apply_or3opt(t: Tour, i: int, j: int, k: int) -> Iterable[int]:
+    t[i + 1 : k + 1] = t[j + 1 : k + 1] + t[i + 1 : j + 1]
+    return range(i + 1, k + 1)
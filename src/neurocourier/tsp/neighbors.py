@@ -0,0 +1,132 @@
+from __future__ import annotations
+import math
+from typing import List, Sequence
+
+import numpy as np
+
+from .distance import DistanceMatrix, as_distance_array, points_array
+from .oracle import DistanceOracle
+from .types import Point
+
+# Rows per argpartition block when candidate lists are taken from a dense matrix.
+_BLOCK_ROWS = 512
+
+
+class GridIndex:
+    """Uniform-grid spatial index over 2-D points.
+
+    Points are bucketed into square cells holding ``per_cell`` points on average and
+    stored cell by cell, so the cells of one grid column form a contiguous slice.
+    Nearest-neighbour queries grow a ring of cells around the query cell until the
+    k-th candidate is provably closer than anything outside the ring, which makes the
+    results exact.
+    """
+
+    def __init__(self, points: Sequence[Point], per_cell: float = 4.0):
+        self.points = points_array(points)
+        n = len(self.points)
+        self._lo = self.points.min(axis=0) if n else np.zeros(2)
+        span = (self.points.max(axis=0) - self._lo) if n else np.ones(2)
+        area = max(float(span[0]) * float(span[1]), 1e-12)
+        cell = math.sqrt(area * per_cell / max(n, 1))
+        self.cell_size = max(cell, float(span.max()) / 4096, 1e-12)
+        self.nx = int(span[0] // self.cell_size) + 1
+        self.ny = int(span[1] // self.cell_size) + 1
+        gx, gy = self._cell_of(self.points)
+        cell_id = gx * self.ny + gy
+        self._order = np.argsort(cell_id, kind="stable")
+        counts = np.bincount(cell_id, minlength=self.nx * self.ny)
+        self._start = np.concatenate(([0], np.cumsum(counts)))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _cell_of(self, xy: np.ndarray):
+        g = ((xy - self._lo) // self.cell_size).astype(np.int64)
+        return np.clip(g[:, 0], 0, self.nx - 1), np.clip(g[:, 1], 0, self.ny - 1)
+
+    def _ring(self, gx: int, gy: int, r: int) -> np.ndarray:
+        """Indices of the points in the (2r + 1)^2 cells centred on (gx, gy)."""
+        y0 = max(gy - r, 0)
+        y1 = min(gy + r, self.ny - 1)
+        parts = []
+        for x in range(max(gx - r, 0), min(gx + r, self.nx - 1) + 1):
+            base = x * self.ny
+            parts.append(self._order[self._start[base + y0] : self._start[base + y1 + 1]])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.intp)
+
+    def _covers_grid(self, gx: int, gy: int, r: int) -> bool:
+        return gx - r <= 0 and gy - r <= 0 and gx + r >= self.nx - 1 and gy + r >= self.ny - 1
+
+    def knn(self, k: int) -> np.ndarray:
+        """k nearest neighbours of every point, as an (n, k) int32 array sorted by distance."""
+        n = len(self.points)
+        k = min(k, n - 1)
+        out = np.empty((n, max(k, 0)), dtype=np.int32)
+        if k <= 0:
+            return out
+        for cell in np.flatnonzero(np.diff(self._start)):
+            members = self._order[self._start[cell] : self._start[cell + 1]]
+            gx, gy = divmod(int(cell), self.ny)
+            r = 1
+            while True:
+                cand = self._ring(gx, gy, r)
+                if len(cand) > k:
+                    diff = self.points[members, None, :] - self.points[None, cand, :]
+                    d = np.hypot(diff[..., 0], diff[..., 1])
+                    d[members[:, None] == cand[None, :]] = np.inf
+                    part = np.argpartition(d, k - 1, axis=1)[:, :k]
+                    pd = np.take_along_axis(d, part, axis=1)
+                    if pd.max() <= r * self.cell_size or self._covers_grid(gx, gy, r):
+                        order = np.argsort(pd, axis=1, kind="stable")
+                        out[members] = cand[np.take_along_axis(part, order, axis=1)]
+                        break
+                r += 1
+        return out
+
+    def query(self, x: float, y: float, k: int) -> np.ndarray:
+        """Indices of the k points nearest to the location (x, y), sorted by distance."""
+        n = len(self.points)
+        k = min(k, n)
+        if k <= 0:
+            return np.empty(0, dtype=np.int32)
+        gx, gy = (int(v[0]) for v in self._cell_of(np.array([[x, y]], dtype=np.float64)))
+        r = 1
+        while True:
+            cand = self._ring(gx, gy, r)
+            if len(cand) >= k:
+                d = np.hypot(self.points[cand, 0] - x, self.points[cand, 1] - y)
+                best = np.argsort(d, kind="stable")[:k]
+                if d[best[-1]] <= r * self.cell_size or self._covers_grid(gx, gy, r):
+                    return cand[best].astype(np.int32)
+            r += 1
+
+
+def candidate_lists(dist: DistanceMatrix, k: int) -> np.ndarray:
+    """k-nearest candidate lists for every city as an (n, k) int32 array.
+
+    An oracle is served from a :class:`GridIndex` over its points (O(n k) memory);
+    dense matrices are reduced row block by row block with ``argpartition``.
+    """
+    if isinstance(dist, DistanceOracle):
+        return GridIndex(dist.points).knn(k)
+    d = as_distance_array(dist)
+    n = len(d)
+    k = min(k, n - 1)
+    out = np.empty((n, max(k, 0)), dtype=np.int32)
+    if k <= 0:
+        return out
+    for r0 in range(0, n, _BLOCK_ROWS):
+        r1 = min(r0 + _BLOCK_ROWS, n)
+        block = np.array(d[r0:r1], dtype=np.float64)
+        block[np.arange(r1 - r0), np.arange(r0, r1)] = np.inf
+        part = np.argpartition(block, k - 1, axis=1)[:, :k]
+        pd = np.take_along_axis(block, part, axis=1)
+        order = np.argsort(pd, axis=1, kind="stable")
+        out[r0:r1] = np.take_along_axis(part, order, axis=1)
+    return out
+
+
+def candidate_rows(dist: DistanceMatrix, k: int) -> List[List[int]]:
+    """:func:`candidate_lists` as nested Python lists, for scalar solver loops."""
+    return candidate_lists(dist, k).tolist()
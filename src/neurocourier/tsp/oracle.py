@@ -0,0 +1,152 @@
+from __future__ import annotations
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Sequence, Union
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from .distance import points_array
+from .types import Point
+
+
+@dataclass
+class OracleStats:
+    """Row-cache counters of a :class:`DistanceOracle`."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    admissions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _LazyRow:
+    """An uncached oracle row; entries are computed on access."""
+
+    __slots__ = ("_x", "_y", "_xs", "_ys", "_oracle", "_i")
+
+    def __init__(self, oracle: "DistanceOracle", i: int):
+        self._oracle = oracle
+        self._i = i
+        self._xs = oracle._xs
+        self._ys = oracle._ys
+        self._x = self._xs[i]
+        self._y = self._ys[i]
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def __getitem__(self, j: int) -> float:
+        return math.hypot(self._x - self._xs[j], self._y - self._ys[j])
+
+    def __array__(self, dtype=None, copy=None):
+        row = self._oracle.row(self._i)
+        return row if dtype is None else row.astype(dtype)
+
+
+class DistanceOracle:
+    """Euclidean distances computed on demand, with a memory-bounded LRU row cache.
+
+    Works for instances where no dense n x n matrix fits in memory. ``oracle[i][j]``
+    behaves like a dense matrix: a cached row is returned as a memoryview (hit);
+    otherwise a lazy row computes single entries on access (miss). A row is admitted
+    into the cache once it has missed ``admit_after`` times within the current
+    frequency window (counts are halved every ``n`` misses), so uniformly random
+    access does not thrash the cache with O(n) row materializations. Least recently
+    used rows are evicted once ``max_bytes`` would be exceeded.
+    """
+
+    def __init__(
+        self,
+        points: Sequence[Point],
+        max_bytes: int = 256 * 1024 * 1024,
+        dtype: DTypeLike = np.float64,
+        admit_after: int = 4,
+    ):
+        self.points = points_array(points)
+        self.dtype = np.dtype(dtype)
+        n = len(self.points)
+        self._xs = self.points[:, 0].tolist()
+        self._ys = self.points[:, 1].tolist()
+        self.max_rows = max(1, max_bytes // max(1, n * self.dtype.itemsize))
+        self.admit_after = max(1, admit_after)
+        self._rows: "OrderedDict[int, memoryview]" = OrderedDict()
+        self._miss_counts = [0] * n
+        self._misses_in_window = 0
+        self.stats = OracleStats()
+
+    def __len__(self) -> int:
+        return len(self._xs)
+
+    def __getitem__(self, i: int) -> Union[memoryview, _LazyRow]:
+        row = self._rows.get(i)
+        if row is not None:
+            self.stats.hits += 1
+            self._rows.move_to_end(i)
+            return row
+        self.stats.misses += 1
+        if self.admit_after > 1:
+            self._misses_in_window += 1
+            if self._misses_in_window >= len(self._xs):
+                self._miss_counts = [c >> 1 for c in self._miss_counts]
+                self._misses_in_window = 0
+            count = self._miss_counts[i] + 1
+            if count < self.admit_after:
+                self._miss_counts[i] = count
+                return _LazyRow(self, i)
+        return self._admit(i)
+
+    def _admit(self, i: int) -> memoryview:
+        if len(self._rows) >= self.max_rows:
+            evicted, _ = self._rows.popitem(last=False)
+            self._miss_counts[evicted] = 0
+            self.stats.evictions += 1
+        row = memoryview(self.row(i).astype(self.dtype, copy=False))
+        self._rows[i] = row
+        self._miss_counts[i] = 0
+        self.stats.admissions += 1
+        return row
+
+    def row(self, i: int) -> np.ndarray:
+        """Distances from ``i`` to every point as a float64 array, without admitting the row."""
+        cached = self._rows.get(i)
+        if cached is not None:
+            return np.asarray(cached, dtype=np.float64)
+        x, y = self.points[i]
+        return np.hypot(self.points[:, 0] - x, self.points[:, 1] - y)
+
+    def distance(self, i: int, j: int) -> float:
+        return math.hypot(self._xs[i] - self._xs[j], self._ys[i] - self._ys[j])
+
+    def pair_distances(self, us: Sequence[int], vs: Sequence[int]) -> np.ndarray:
+        """Vectorized distances between ``us[k]`` and ``vs[k]``."""
+        a = self.points[np.asarray(us, dtype=np.intp)]
+        b = self.points[np.asarray(vs, dtype=np.intp)]
+        return np.hypot(a[:, 0] - b[:, 0], a[:, 1] - b[:, 1])
+
+    def prefetch(self, rows: Iterable[int]) -> None:
+        """Admit ``rows`` into the cache, e.g. the rows of a candidate neighbourhood."""
+        for i in rows:
+            if i in self._rows:
+                self._rows.move_to_end(i)
+            else:
+                self._admit(int(i))
+
+    @property
+    def cached_rows(self) -> int:
+        return len(self._rows)
+
+    @property
+    def cached_bytes(self) -> int:
+        return len(self._rows) * len(self._xs) * self.dtype.itemsize
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._miss_counts = [0] * len(self._xs)
+        self._misses_in_window = 0
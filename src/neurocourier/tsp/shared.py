@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+# (segment name, shape, dtype string): enough to re-attach in another process.
+SharedSpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedArray:
+    """NumPy array backed by a named ``multiprocessing.shared_memory`` segment.
+
+    The creating process owns the segment and unlinks it on :meth:`close`; worker
+    processes :meth:`attach` by :attr:`spec` and read the same pages without a copy.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, ...], dtype: np.dtype, owner: bool):
+        self._shm: Optional[shared_memory.SharedMemory] = shm
+        self.owner = owner
+        self.array: Optional[np.ndarray] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    @classmethod
+    def copy_of(cls, arr: np.ndarray) -> "SharedArray":
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        out = cls(shm, arr.shape, arr.dtype, owner=True)
+        out.array[...] = arr
+        return out
+
+    @classmethod
+    def attach(cls, spec: SharedSpec) -> "SharedArray":
+        name, shape, dtype = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, tuple(shape), np.dtype(dtype), owner=False)
+
+    @property
+    def spec(self) -> SharedSpec:
+        return (self._shm.name, self.array.shape, self.array.dtype.str)
+
+    def close(self) -> None:
+        """Drop this process's mapping; the owner also removes the segment."""
+        if self._shm is None:
+            return
+        self.array = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self) -> "SharedArray":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,8 +1,19 @@
 from __future__ import annotations
-from typing import List
+from typing import Callable, List
+
+import numpy as np
+
+from .distance import DistanceMatrix
+from .oracle import DistanceOracle
 from .types import Tour
 
-def tour_length(tour: Tour, dist: List[List[float]]) -> float:
+def tour_length(tour: Tour, dist: DistanceMatrix) -> float:
+    if isinstance(dist, np.ndarray):
+        t = np.asarray(tour, dtype=np.intp)
+        return float(dist[t, np.roll(t, -1)].sum(dtype=np.float64))
+    if isinstance(dist, DistanceOracle):
+        t = np.asarray(tour, dtype=np.intp)
+        return float(dist.pair_distances(t, np.roll(t, -1)).sum())
     n = len(tour)
     total = 0.0
     prev = tour[-1]
@@ -11,15 +22,209 @@ def tour_length(tour: Tour, dist: List[List[float]]) -> float:
         prev = cur
     return total
 
-def nearest_neighbor_tour(dist: List[List[float]], start: int = 0) -> Tour:
-    n = len(dist)
-    unvisited = set(range(n))
-    unvisited.remove(start)
+def nearest_neighbor_tour(dist: DistanceMatrix, start: int = 0) -> Tour:
+    if isinstance(dist, np.ndarray):
+        return _nearest_neighbor_rows(dist.__getitem__, len(dist), start)
+    if isinstance(dist, DistanceOracle):
+        return _nearest_neighbor_points(dist.points, start)
+    return _nearest_neighbor_rows(dist.__getitem__, len(dist), start)
+
+def _nearest_neighbor_rows(row_of: Callable[[int], np.ndarray], n: int, start: int) -> Tour:
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    row = np.empty(n, dtype=np.float64)
     tour: Tour = [start]
     cur = start
-    while unvisited:
-        nxt = min(unvisited, key=lambda j: dist[cur][j])
-        unvisited.remove(nxt)
-        tour.append(nxt)
-        cur = nxt
+    for _ in range(n - 1):
+        row[:] = row_of(cur)
+        row[visited] = np.inf
+        cur = int(row.argmin())
+        visited[cur] = True
+        tour.append(cur)
+    return tour
+
+def _nearest_neighbor_points(points: np.ndarray, start: int) -> Tour:
+    # Unvisited points are kept compacted at the front of the arrays (swap-remove),
+    # so step k only scans n - k candidates and no distance rows are materialized.
+    n = len(points)
+    idx = np.arange(n)
+    xs = points[:, 0].copy()
+    ys = points[:, 1].copy()
+    m = n - 1
+    idx[start], idx[m] = idx[m], idx[start]
+    xs[start], xs[m] = xs[m], xs[start]
+    ys[start], ys[m] = ys[m], ys[start]
+    tour: Tour = [start]
+    cx, cy = points[start]
+    while m:
+        dx = xs[:m] - cx
+        dy = ys[:m] - cy
+        k = int((dx * dx + dy * dy).argmin())
+        cx, cy = xs[k], ys[k]
+        tour.append(int(idx[k]))
+        m -= 1
+        idx[k], xs[k], ys[k] = idx[m], xs[m], ys[m]
     return tour
+
+def reverse_segment(tour: Tour, pos: List[int], i: int, j: int) -> None:
+    """Reverse the cyclic segment tour[i..j] in place, keeping ``pos`` (city -> index) in sync.
+
+    When the segment covers more than half the tour its complement is reversed instead,
+    which yields the same cycle (in opposite orientation) for at most n/2 work.
+    """
+    n = len(tour)
+    inner = (j - i) % n + 1
+    if 2 * inner > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        inner = n - inner
+    if inner < 2:
+        return
+    if i <= j:
+        tour[i : j + 1] = tour[i : j + 1][::-1]
+        for idx in range(i, j + 1):
+            pos[tour[idx]] = idx
+        return
+    for _ in range(inner // 2):
+        a, b = tour[i], tour[j]
+        tour[i] = b
+        pos[b] = i
+        tour[j] = a
+        pos[a] = j
+        i = i + 1 if i + 1 < n else 0
+        j = j - 1 if j else n - 1
+
+# Segments up to this length are moved with scalar loops; longer ones with NumPy slices.
+_SHORT = 24
+
+
+class ArrayTour:
+    """Tour stored as a city array plus a city -> position index.
+
+    ``o`` and ``p`` are memoryviews over ``order`` and ``pos`` for fast scalar access
+    (``o`` can be passed wherever a position-indexed tour is read, e.g. the
+    ``neurocourier.tsp.moves`` delta functions); long segments are moved with NumPy.
+    Every move returns an undo token; :meth:`rewind` replays tokens backwards on a
+    copy of the order, which lets a caller reconstruct an earlier tour lazily.
+    """
+
+    def __init__(self, tour: Tour):
+        self.order = np.array(tour, dtype=np.intp)
+        self.n = len(self.order)
+        self.pos = np.empty(self.n, dtype=np.intp)
+        self.pos[self.order] = np.arange(self.n)
+        self.o = memoryview(self.order)
+        self.p = memoryview(self.pos)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> int:
+        return self.o[i]
+
+    def to_list(self) -> Tour:
+        return self.order.tolist()
+
+    def next(self, c: int) -> int:
+        return self.o[self.p[c] + 1 - self.n]
+
+    def prev(self, c: int) -> int:
+        return self.o[self.p[c] - 1]
+
+    def between(self, a: int, b: int, c: int) -> bool:
+        """True if b lies on the forward path from a to c (both inclusive)."""
+        pa, pb, pc = self.p[a], self.p[b], self.p[c]
+        if pa <= pc:
+            return pa <= pb <= pc
+        return pb >= pa or pb <= pc
+
+    def _reindex(self, lo: int, hi: int) -> None:
+        if hi - lo < _SHORT:
+            o, p = self.o, self.p
+            for idx in range(lo, hi + 1):
+                p[o[idx]] = idx
+        else:
+            self.pos[self.order[lo : hi + 1]] = np.arange(lo, hi + 1)
+
+    def reverse(self, i: int, j: int) -> tuple:
+        """Reverse the cyclic segment of positions i..j (or its complement, if shorter)."""
+        n = self.n
+        inner = (j - i) % n + 1
+        if 2 * inner > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            inner = n - inner
+        if inner < _SHORT:
+            o, p = self.o, self.p
+            a, b = i, j
+            for _ in range(inner // 2):
+                x, y = o[a], o[b]
+                o[a] = y
+                p[y] = a
+                o[b] = x
+                p[x] = b
+                a = a + 1 if a + 1 < n else 0
+                b = b - 1 if b else n - 1
+        else:
+            _reverse_range(self.order, i, j, inner)
+            if i <= j:
+                self._reindex(i, j)
+            else:
+                self._reindex(i, n - 1)
+                self._reindex(0, j)
+        return ("r", i, j, inner)
+
+    def two_opt(self, i: int, k: int) -> tuple:
+        """2-opt at positions i < k: the cycle of reversing order[i+1..k]."""
+        return self.reverse(i + 1, k)
+
+    def or_opt(self, i: int, length: int, j: int, reverse: bool) -> tuple:
+        """Move order[i..i+length-1] between order[j] and order[j+1]; see moves.delta_or_opt."""
+        order = self.order
+        seg = order[i : i + length][::-1] if reverse else order[i : i + length]
+        if j > i:
+            lo, hi = i, j
+            new = np.concatenate((order[i + length : j + 1], seg))
+        else:
+            lo, hi = j + 1, i + length - 1
+            new = np.concatenate((seg, order[j + 1 : i]))
+        old = order[lo : hi + 1].copy()
+        order[lo : hi + 1] = new
+        self._reindex(lo, hi)
+        return ("s", lo, old)
+
+    def swap(self, i: int, j: int) -> tuple:
+        o, p = self.o, self.p
+        a, b = o[i], o[j]
+        o[i], o[j] = b, a
+        p[b], p[a] = i, j
+        return ("x", i, j)
+
+    def or3opt(self, i: int, j: int, k: int) -> tuple:
+        """Exchange segments order[i+1..j] and order[j+1..k]; see moves.delta_or3opt."""
+        order = self.order
+        old = order[i + 1 : k + 1].copy()
+        order[i + 1 : k + 1] = np.concatenate((old[j - i :], old[: j - i]))
+        self._reindex(i + 1, k)
+        return ("s", i + 1, old)
+
+    def rewind(self, tokens: List[tuple]) -> np.ndarray:
+        """Copy of the order with ``tokens`` (oldest first) undone, newest first."""
+        order = self.order.copy()
+        for tok in reversed(tokens):
+            kind = tok[0]
+            if kind == "r":
+                _reverse_range(order, tok[1], tok[2], tok[3])
+            elif kind == "s":
+                order[tok[1] : tok[1] + len(tok[2])] = tok[2]
+            else:
+                order[tok[1]], order[tok[2]] = order[tok[2]], order[tok[1]]
+        return order
+
+
+def _reverse_range(order: np.ndarray, i: int, j: int, inner: int) -> None:
+    if inner < 2:
+        return
+    if i <= j:
+        order[i : j + 1] = order[i : j + 1][::-1].copy()
+    else:
+        idx = np.r_[i : len(order), 0 : j + 1]
+        order[idx] = order[idx[::-1]]
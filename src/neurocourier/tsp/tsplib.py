@@ -0,0 +1,271 @@
+"""TSPLIB ``.tsp`` / ``.tour`` reader and writer.
+
+Files are read in one piece; the header is parsed line by line (it is short) and each
+data section is converted in bulk with ``np.fromstring``, so no Python object is made
+per node. Distances follow the TSPLIB definitions (rounded EUC_2D, CEIL_2D, ATT
+pseudo-Euclidean, GEO great-circle), which is what published optima refer to.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Dict, Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from .distance import _BLOCK_ROWS, DistanceMatrix, points_array
+from .oracle import DistanceOracle
+from .types import Instance, Point, Tour
+
+PathOrFile = Union[str, Path, IO[bytes]]
+
+COORD_TYPES = ("EUC_2D", "CEIL_2D", "ATT", "GEO")
+MATRIX_FORMATS = ("FULL_MATRIX", "UPPER_ROW", "LOWER_ROW", "UPPER_DIAG_ROW", "LOWER_DIAG_ROW")
+
+# Optimal tour lengths of common TSPLIB instances, for computing gaps.
+KNOWN_OPTIMA: Dict[str, int] = {
+    "burma14": 3323, "ulysses16": 6859, "gr17": 2085, "ulysses22": 7013, "gr24": 1272,
+    "fri26": 937, "bayg29": 1610, "bays29": 2020, "dantzig42": 699, "swiss42": 1273,
+    "att48": 10628, "eil51": 426, "berlin52": 7542, "st70": 675, "eil76": 538,
+    "pr76": 108159, "gr96": 55209, "rat99": 1211, "kroA100": 21282, "kroB100": 22141,
+    "kroC100": 20749, "kroD100": 21294, "kroE100": 22068, "rd100": 7910, "eil101": 629,
+    "lin105": 14379, "ch130": 6110, "ch150": 6528, "d198": 15780, "a280": 2579,
+    "lin318": 42029, "pcb442": 50778, "rat783": 8806, "pr1002": 259045, "pr2392": 378032,
+}
+
+_SECTION = re.compile(rb"^[ \t]*([A-Z_]+_SECTION)[ \t]*:?[ \t]*$", re.M)
+_KEYWORD_LINE = re.compile(rb"^[ \t]*[A-Za-z]", re.M)
+
+
+@dataclass
+class TSPLIBProblem:
+    name: str
+    dimension: int
+    edge_weight_type: str
+    type: str = "TSP"
+    comment: str = ""
+    edge_weight_format: str = ""
+    coords: Optional[np.ndarray] = None          # (n, 2) float64, for coordinate types
+    matrix: Optional[np.ndarray] = None          # (n, n), for EXPLICIT weights
+    header: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def optimum(self) -> Optional[int]:
+        return KNOWN_OPTIMA.get(self.name)
+
+    def gap(self, cost: float) -> Optional[float]:
+        """Relative excess of ``cost`` over the known optimum, if there is one."""
+        opt = self.optimum
+        return None if opt is None else (cost - opt) / opt
+
+    def distance_array(self, dtype: DTypeLike = np.float64) -> np.ndarray:
+        """Dense matrix with the instance's own (TSPLIB-rounded) metric."""
+        if self.matrix is not None:
+            return np.ascontiguousarray(self.matrix, dtype=dtype)
+        if self.coords is None:
+            raise ValueError(f"{self.name}: no coordinates or explicit weights")
+        n = len(self.coords)
+        d = np.empty((n, n), dtype=dtype)
+        for r0 in range(0, n, _BLOCK_ROWS):
+            r1 = min(r0 + _BLOCK_ROWS, n)
+            d[r0:r1] = _weights(self.edge_weight_type, self.coords[r0:r1], self.coords)
+        np.fill_diagonal(d, 0)
+        return d
+
+    def distances(self, dense_limit: int = 20000) -> DistanceMatrix:
+        """Distance backend: the exact dense matrix up to ``dense_limit`` cities, beyond
+        that a :class:`DistanceOracle` for EUC_2D/CEIL_2D instances (unrounded Euclidean,
+        so tour costs should be re-evaluated with :meth:`tour_cost`)."""
+        if self.dimension > dense_limit and self.matrix is None and self.edge_weight_type in ("EUC_2D", "CEIL_2D"):
+            return DistanceOracle(self.coords)
+        return self.distance_array()
+
+    def tour_cost(self, tour: Tour) -> float:
+        """Tour length in the instance's metric without building a matrix."""
+        t = np.asarray(tour, dtype=np.intp)
+        nxt = np.roll(t, -1)
+        if self.matrix is not None:
+            return float(self.matrix[t, nxt].sum(dtype=np.float64))
+        a, b = self.coords[t], self.coords[nxt]
+        return float(_pair_weights(self.edge_weight_type, a[:, 0], a[:, 1], b[:, 0], b[:, 1]).sum())
+
+    def to_instance(self, seed: int = 0) -> Instance:
+        if self.coords is None:
+            raise ValueError(f"{self.name}: explicit-weight instances have no points")
+        span = float(np.ptp(self.coords, axis=0).max()) if len(self.coords) else 0.0
+        return Instance(name=self.name, points=[tuple(p) for p in self.coords.tolist()], seed=seed, mode="tsplib", square_size=span)
+
+
+def _geo_radians(c: np.ndarray) -> np.ndarray:
+    # TSPLIB GEO: DDD.MM (degrees, minutes), with the TSPLIB value of pi.
+    deg = np.trunc(c)
+    return 3.141592 * (deg + 5.0 * (c - deg) / 3.0) / 180.0
+
+
+def _pair_weights(kind: str, ax, ay, bx, by) -> np.ndarray:
+    """TSPLIB weights between points (ax, ay) and (bx, by); arguments broadcast."""
+    if kind == "GEO":
+        lat_a, lon_a = _geo_radians(ax), _geo_radians(ay)
+        lat_b, lon_b = _geo_radians(bx), _geo_radians(by)
+        q1 = np.cos(lon_a - lon_b)
+        q2 = np.cos(lat_a - lat_b)
+        q3 = np.cos(lat_a + lat_b)
+        arg = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        w = np.floor(6378.388 * np.arccos(arg) + 1.0)
+        return np.where((ax == bx) & (ay == by), 0.0, w)
+    dx = ax - bx
+    dy = ay - by
+    if kind == "ATT":
+        r = np.sqrt((dx * dx + dy * dy) / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1.0, t)
+    d = np.hypot(dx, dy)
+    if kind == "CEIL_2D":
+        return np.ceil(d)
+    if kind == "EUC_2D":
+        return np.floor(d + 0.5)
+    raise ValueError(f"unsupported EDGE_WEIGHT_TYPE {kind!r}")
+
+
+def _weights(kind: str, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """(len(rows), len(cols)) block of TSPLIB weights."""
+    return _pair_weights(kind, rows[:, 0, None], rows[:, 1, None], cols[None, :, 0], cols[None, :, 1])
+
+
+def _read_bytes(src: PathOrFile) -> bytes:
+    if isinstance(src, (str, Path)):
+        return Path(src).read_bytes()
+    data = src.read()
+    return data.encode() if isinstance(data, str) else data
+
+
+def _numbers(data: bytes, start: int) -> np.ndarray:
+    """All numbers from ``start`` up to the next keyword line, parsed in one call."""
+    m = _KEYWORD_LINE.search(data, start)
+    body = data[start : m.start() if m else len(data)]
+    return np.fromstring(body, sep=" ") if body.strip() else np.empty(0)
+
+
+def _header(data: bytes, end: int) -> Dict[str, str]:
+    header: Dict[str, str] = {}
+    for raw in data[:end].decode("latin-1").splitlines():
+        if ":" in raw:
+            key, value = raw.split(":", 1)
+            header[key.strip().upper()] = value.strip()
+    return header
+
+
+def _explicit(values: np.ndarray, n: int, fmt: str) -> np.ndarray:
+    m = np.zeros((n, n), dtype=np.float64)
+    if fmt == "FULL_MATRIX":
+        if len(values) < n * n:
+            raise ValueError(f"FULL_MATRIX needs {n * n} weights, got {len(values)}")
+        return values[: n * n].reshape(n, n).copy()
+    # Triangles are listed row by row, the order of NumPy's triu/tril indices.
+    diag = fmt.endswith("DIAG_ROW")
+    if fmt.startswith("UPPER"):
+        iu = np.triu_indices(n, 0 if diag else 1)
+    else:
+        iu = np.tril_indices(n, 0 if diag else -1)
+    need = len(iu[0])
+    if len(values) < need:
+        raise ValueError(f"{fmt} needs {need} weights, got {len(values)}")
+    m[iu] = values[:need]
+    m[iu[1], iu[0]] = values[:need]
+    return m
+
+
+def read_tsplib(src: PathOrFile) -> TSPLIBProblem:
+    """Parse a TSPLIB ``.tsp`` file (path or binary file object)."""
+    data = _read_bytes(src)
+    sections = list(_SECTION.finditer(data))
+    header = _header(data, sections[0].start() if sections else len(data))
+    n = int(header.get("DIMENSION", "0"))
+    kind = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    fmt = header.get("EDGE_WEIGHT_FORMAT", "").upper()
+    prob = TSPLIBProblem(
+        name=header.get("NAME", ""),
+        dimension=n,
+        edge_weight_type=kind,
+        type=header.get("TYPE", "TSP"),
+        comment=header.get("COMMENT", ""),
+        edge_weight_format=fmt,
+        header=header,
+    )
+    if kind not in COORD_TYPES and kind != "EXPLICIT":
+        raise ValueError(f"unsupported EDGE_WEIGHT_TYPE {kind!r}")
+    for sec in sections:
+        name = sec.group(1).decode()
+        if name == "NODE_COORD_SECTION":
+            values = _numbers(data, sec.end())
+            if len(values) < 3 * n or len(values) % 3:
+                raise ValueError(f"NODE_COORD_SECTION: expected {n} 'id x y' rows, got {len(values)} numbers")
+            rows = values.reshape(-1, 3)[:n]
+            coords = np.empty((n, 2), dtype=np.float64)
+            coords[rows[:, 0].astype(np.intp) - 1] = rows[:, 1:]
+            prob.coords = coords
+        elif name == "EDGE_WEIGHT_SECTION":
+            if fmt not in MATRIX_FORMATS:
+                raise ValueError(f"unsupported EDGE_WEIGHT_FORMAT {fmt!r}")
+            prob.matrix = _explicit(_numbers(data, sec.end()), n, fmt)
+    if kind == "EXPLICIT" and prob.matrix is None:
+        raise ValueError("EXPLICIT instance without EDGE_WEIGHT_SECTION")
+    if kind != "EXPLICIT" and prob.coords is None:
+        raise ValueError(f"{kind} instance without NODE_COORD_SECTION")
+    return prob
+
+
+def read_tour(src: PathOrFile) -> Tour:
+    """Parse a TSPLIB ``.tour`` file into a 0-based tour."""
+    data = _read_bytes(src)
+    m = _SECTION.search(data)
+    if m is None or m.group(1) != b"TOUR_SECTION":
+        raise ValueError("no TOUR_SECTION")
+    values = _numbers(data, m.end()).astype(np.int64)
+    end = np.flatnonzero(values == -1)
+    if len(end):
+        values = values[: end[0]]
+    return (values - 1).tolist()
+
+
+def write_tsplib(
+    dst: Union[str, Path],
+    points: Union[Sequence[Point], np.ndarray, None] = None,
+    name: str = "",
+    comment: str = "",
+    edge_weight_type: str = "EUC_2D",
+    matrix: Optional[np.ndarray] = None,
+) -> None:
+    """Write a TSPLIB file with NODE_COORD_SECTION, or FULL_MATRIX weights when
+    ``matrix`` is given instead of ``points``."""
+    lines = [f"NAME : {name or Path(dst).stem}", "TYPE : TSP"]
+    if comment:
+        lines.append(f"COMMENT : {comment}")
+    if matrix is not None:
+        m = np.asarray(matrix)
+        lines += [f"DIMENSION : {len(m)}", "EDGE_WEIGHT_TYPE : EXPLICIT", "EDGE_WEIGHT_FORMAT : FULL_MATRIX", "EDGE_WEIGHT_SECTION"]
+        with open(dst, "w") as f:
+            f.write("\n".join(lines) + "\n")
+            np.savetxt(f, m, fmt="%.17g")
+            f.write("EOF\n")
+        return
+    xy = points_array(points)
+    lines += [f"DIMENSION : {len(xy)}", f"EDGE_WEIGHT_TYPE : {edge_weight_type}", "NODE_COORD_SECTION"]
+    rows = np.column_stack((np.arange(1, len(xy) + 1), xy))
+    with open(dst, "w") as f:
+        f.write("\n".join(lines) + "\n")
+        np.savetxt(f, rows, fmt=("%d", "%.17g", "%.17g"))
+        f.write("EOF\n")
+
+
+def write_tour(dst: Union[str, Path], tour: Tour, name: str = "", length: Optional[float] = None) -> None:
+    lines = [f"NAME : {name or Path(dst).stem}", "TYPE : TOUR"]
+    if length is not None:
+        lines.append(f"COMMENT : Length {length:g}")
+    lines += [f"DIMENSION : {len(tour)}", "TOUR_SECTION"]
+    with open(dst, "w") as f:
+        f.write("\n".join(lines) + "\n")
+        np.savetxt(f, np.asarray(tour, dtype=np.int64) + 1, fmt="%d")
+        f.write("-1\nEOF\n")
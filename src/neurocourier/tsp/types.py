@@ -1,6 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+    from .cache import DistanceCache
 
 Point = Tuple[float, float]
 Tour = List[int]
@@ -12,3 +16,15 @@ class Instance:
     seed: int
     mode: str  # uniform or clustered
     square_size: float
+
+    def cache_key(self) -> str:
+        """Content hash of the points; names the instance's entries in a DistanceCache."""
+        from .cache import point_set_key
+        return point_set_key(self.points)
+
+    def distance_array(self, cache: Optional["DistanceCache"] = None, dtype: str = "float32") -> "np.ndarray":
+        """Dense distance matrix; memory-mapped from ``cache`` (and stored there on a miss)."""
+        if cache is None:
+            from .distance import euclidean_distance_array
+            return euclidean_distance_array(self.points, dtype=dtype, upper_only=True)
+        return cache.distance_array(self.points, dtype)